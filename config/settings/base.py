@@ -112,6 +112,8 @@ LOCAL_APPS = [
     "heymatch.apps.group.apps.GroupAppConfig",
     "heymatch.apps.match.apps.MatchAppConfig",
     "heymatch.apps.payment.apps.PaymentAppConfig",
+    "heymatch.apps.notification.apps.NotificationAppConfig",
+    "heymatch.apps.report.apps.ReportAppConfig",
     "heymatch.apps.celery.apps.CeleryAppConfig",
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -307,10 +309,16 @@ CELERY_TASK_SOFT_TIME_LIMIT = 3 * 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_BEAT_SCHEDULE = {
-    # Verify main UserProfileImages
+    # Sweep main UserProfileImages not verified by ETA task (verify_main_profile_image)
     "verify-main-profile-images": {
         "task": "heymatch.apps.celery.tasks.verify_main_profile_images",
-        "schedule": timedelta(seconds=15),  # execute every 15 sec
+        "schedule": timedelta(minutes=5),  # execute every 5 mins
+        "args": (),
+    },
+    # Deliver push notifications left in outbox
+    "flush-push-notification-outbox": {
+        "task": "heymatch.apps.celery.tasks.flush_push_notification_outbox",
+        "schedule": timedelta(minutes=1),  # execute every 1 min
         "args": (),
     },
     # Process DeleteScheduledUsers
@@ -319,32 +327,17 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(minute=0, hour="*/1"),  # execute every hour
         "args": (),
     },
-    # Aggregate recent 24 hours Top Ranked group addresses
+    # Snapshot recent 24 hours Top Ranked group addresses & prune old hourly buckets
     "top-ranked-group-addresses-24hrs": {
         "task": "heymatch.apps.celery.tasks.aggregate_recent_24hr_top_ranked_group_address",
-        "schedule": crontab(minute=0, hour=3),  # execute 3 a.m
-        "args": (),
-    },
-    "fill-up-available-ads-point-for-all-users": {
-        "task": "heymatch.apps.celery.tasks.fill_up_available_ads_point_for_all_users",
-        "schedule": crontab(minute=0, hour=1),  # execute 1 a.m
+        "schedule": crontab(minute=5),  # execute every hour
         "args": (),
     },
     # Notification
-    "send-notification-to-group-not-made-users": {
-        "task": "heymatch.apps.celery.tasks.send_notification_to_group_not_made_users",
+    "dispatch-scheduled-notifications": {
+        "task": "heymatch.apps.celery.tasks.dispatch_scheduled_notifications",
         "schedule": timedelta(seconds=30),  # execute every 30 sec
         "args": (),
-    },
-    "send-notification-to-group-with-past-meetup-date": {
-        "task": "heymatch.apps.celery.tasks.send_notification_to_group_with_past_meetup_date",
-        "schedule": crontab(minute=0, hour=22),  # execute 10 p.m
-        "args": (),
-    },
-    "send-notification-to-group-to-send-match-request": {
-        "task": "heymatch.apps.celery.tasks.send_notification_to_group_to_send_match_request",
-        "schedule": timedelta(minutes=30),  # execute every 30 mins
-        "args": (),
     }
     # "update-school-company-database": {
     #     "task": "heymatch.apps.celery.tasks.update_school_company_database",
@@ -532,6 +525,10 @@ ONE_SIGNAL_CLIENT = OneSignalClient(
     app_id=env("ONE_SIGNAL_APP_ID"),
     rest_api_key=env("ONE_SIGNAL_REST_API_KEY"),
 )
+# Push notifications enqueued within this period are coalesced (heymatch.apps.notification)
+PUSH_NOTIFICATION_COALESCE_SECONDS = 2
+# Claimed but not sent (e.g. worker killed) notifications are claimed again after this
+PUSH_NOTIFICATION_CLAIM_TIMEOUT = timedelta(minutes=5)
 
 # Backdoor information
 BACKDOOR_PHONE_NUMBER = "00000000000"
@@ -553,13 +550,60 @@ SLACK_BUSINESS_REPORT_BOT = WebhookClient(
 # Naver API
 NAVER_CLIENT_ID = env("NAVER_API_CLIENT_ID")
 NAVER_CLIENT_SECRET = env("NAVER_API_CLIENT_SECRET")
+NAVER_GEO_API_TIMEOUT = (1, 3)  # (connect, read) seconds
+
+# Profile image verification (verify_main_profile_images)
+FACE_DETECTION_BACKEND = "heymatch.utils.util.RekognitionFaceDetector"
+PROFILE_IMAGE_VERIFICATION_MAX_WORKERS = 8
+PROFILE_IMAGE_VERIFICATION_LOCK_TIMEOUT = 60 * 10
+# Sweeper only picks up images not verified by ETA task within this grace period
+PROFILE_IMAGE_VERIFICATION_SWEEP_GRACE = timedelta(minutes=2)
+# NOTE: Detection result is recorded but every image is accepted for now
+PROFILE_IMAGE_FACE_DETECTION_ENFORCED = env.bool(
+    "DJANGO_PROFILE_IMAGE_FACE_DETECTION_ENFORCED", default=False
+)
+# Profile image renditions (heymatch.shared.image_variants), in addition to JPEG variants.
+# "avif" needs `pillow-avif-plugin`, skipped if not installed
+PROFILE_IMAGE_RENDITION_FORMATS = env.list(
+    "DJANGO_PROFILE_IMAGE_RENDITION_FORMATS", default=["webp"]
+)
+# Threads per process uploading files concurrently (heymatch.shared.uploads).
+# Keep below botocore max_pool_connections (10)
+STORAGE_UPLOAD_WORKERS = env.int("DJANGO_STORAGE_UPLOAD_WORKERS", default=8)
+# Profile images uploaded directly to S3 with presigned url (user.api.views)
+PROFILE_IMAGE_UPLOAD_URL_EXPIRES = 60 * 10  # in seconds
+PROFILE_IMAGE_UPLOAD_MAX_SIZE = 20 * 1024 * 1024  # in bytes
+# Uploaded here first, moved to AWS_S3_USER_PROFILE_PHOTO_FOLDER when confirmed.
+# Never confirmed uploads are removed by S3 lifecycle rule (expire after 1 day) of this prefix
+PROFILE_IMAGE_UPLOAD_PENDING_FOLDER = "uploads_pending"
+PROFILE_IMAGE_UPLOAD_VERIFY_BYTES = 64 * 1024  # head of upload checked on confirm
+
+# Reverse geocoding (heymatch.shared.geocoding)
+GEOCODING_BACKEND = "heymatch.utils.util.NaverGeoAPI"
+GEOCODING_GRID_PRECISION = 3  # decimal places, ~100m
+GEOCODING_CACHE_TIMEOUT = 60 * 60 * 24 * 30  # 30 days
+GEOCODING_LOCAL_CACHE_SIZE = 4096
+# Save group with pending gps_address and resolve it in celery task
+GEOCODING_DEFERRED = env.bool("DJANGO_GEOCODING_DEFERRED", default=False)
 
 # Google Admob
 ADMOB_SSV_KEY_SERVER_URL = ("https://www.gstatic.com/admob/reward/verifier-keys.json",)
 ADMOB_SSV_KEYS_CACHE_TIMEOUT = timedelta(days=1)
 ADMOB_SSV_KEYS_CACHE_KEY = "admob_ssv.public_keys"
 
+# Query stats (heymatch.shared.middleware.QueryStatsMiddleware)
+QUERY_STATS_RESPONSE_HEADERS = True
+QUERY_STATS_LOGGING = False
+QUERY_STATS_LOG_MIN_QUERIES = 20
+QUERY_STATS_LOG_MIN_DB_TIME_MS = 200
+
 # Purchase Related
 WELCOME_BONUS_POINT = 15
 POINT_NEEDED_FOR_PHOTO = 2
 POINT_NEEDED_FOR_MATCH = 4
+DAILY_ADS_QUOTA = 3  # photo purchases by ads per user per day
+
+# User deletion (heymatch.apps.celery.tasks.delete_scheduled_users)
+DELETE_SCHEDULED_USERS_BATCH_SIZE = 100
+STREAM_QUERY_CHANNELS_PAGE_SIZE = 30  # max `limit` of `query_channels`
+STREAM_DELETE_CHANNELS_BATCH_SIZE = 100  # cids per `delete_channels` call
@@ -18,6 +18,7 @@ ALLOWED_HOSTS += env.list("DJANGO_ALLOWED_HOSTS")
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "heymatch.shared.middleware.QueryStatsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
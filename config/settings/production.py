@@ -49,6 +49,7 @@ CACHES = {
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "heymatch.shared.middleware.QueryStatsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -64,6 +65,13 @@ MIDDLEWARE = [
     "drf_api_logger.middleware.api_logger_middleware.APILoggerMiddleware",
 ]
 
+# Query stats
+# ------------------------------------------------------------------------------
+QUERY_STATS_RESPONSE_HEADERS = False
+QUERY_STATS_LOGGING = env.bool("DJANGO_QUERY_STATS_LOGGING", default=True)
+QUERY_STATS_LOG_MIN_QUERIES = env.int("DJANGO_QUERY_STATS_LOG_MIN_QUERIES", 20)
+QUERY_STATS_LOG_MIN_DB_TIME_MS = env.int("DJANGO_QUERY_STATS_LOG_MIN_DB_TIME_MS", 200)
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -27,3 +27,10 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+GEOCODING_BACKEND = "heymatch.shared.geocoding.FakeGeoAPI"
+FACE_DETECTION_BACKEND = "heymatch.utils.util.StubFaceDetector"
+ONE_SIGNAL_CLIENT = OneSignalClient(  # noqa: F405
+    app_id="test-app-id",
+    rest_api_key="test-rest-api-key",
+    is_local=True,
+)
@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from .models import TaskRunHourlyStat
+
+
+@admin.register(TaskRunHourlyStat)
+class TaskRunHourlyStatAdmin(admin.ModelAdmin):
+    list_display = [
+        "bucket",
+        "task_name",
+        "runs",
+        "failures",
+        "soft_time_limit_hits",
+        "overlaps",
+        "total_ms",
+        "max_ms",
+        "query_count",
+        "rows",
+        "max_lag_ms",
+    ]
+    list_filter = ["task_name"]
+    ordering = ["-bucket"]
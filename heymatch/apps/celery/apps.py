@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CeleryAppConfig(AppConfig):
     name = "heymatch.apps.celery"
     verbose_name = "Celery App"
+
+    def ready(self):
+        try:
+            import heymatch.apps.celery.telemetry  # noqa F401
+        except ImportError:
+            pass
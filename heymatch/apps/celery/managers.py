@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+
+class TaskRunHourlyStatManager(models.Manager):
+    @staticmethod
+    def bucket_of(dt: datetime) -> datetime:
+        return dt.replace(minute=0, second=0, microsecond=0)
+
+    def record(
+        self,
+        task_name: str,
+        started_at: datetime,
+        duration_ms: int,
+        query_count: int,
+        rows: int,
+        lag_ms: int or None,
+        failed: bool = False,
+        soft_time_limit_exceeded: bool = False,
+        overlapped: bool = False,
+    ) -> None:
+        bucket = self.bucket_of(started_at)
+        self.bulk_create(
+            [self.model(bucket=bucket, task_name=task_name)], ignore_conflicts=True
+        )
+        self.get_queryset().filter(bucket=bucket, task_name=task_name).update(
+            runs=F("runs") + 1,
+            failures=F("failures") + int(failed),
+            soft_time_limit_hits=F("soft_time_limit_hits")
+            + int(soft_time_limit_exceeded),
+            overlaps=F("overlaps") + int(overlapped),
+            total_ms=F("total_ms") + duration_ms,
+            max_ms=Greatest("max_ms", Value(duration_ms)),
+            query_count=F("query_count") + query_count,
+            rows=F("rows") + rows,
+            max_lag_ms=Greatest("max_lag_ms", Value(lag_ms or 0)),
+        )
+
+    def prune(self, before: datetime) -> int:
+        deleted, _ = self.get_queryset().filter(bucket__lt=before).delete()
+        return deleted
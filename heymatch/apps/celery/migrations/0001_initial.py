@@ -0,0 +1,35 @@
+# Generated by Django 3.2.13 on 2023-12-16 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRunHourlyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('task_name', models.CharField(max_length=255)),
+                ('runs', models.IntegerField(default=0)),
+                ('failures', models.IntegerField(default=0)),
+                ('soft_time_limit_hits', models.IntegerField(default=0)),
+                ('overlaps', models.IntegerField(default=0)),
+                ('total_ms', models.BigIntegerField(default=0)),
+                ('max_ms', models.IntegerField(default=0)),
+                ('query_count', models.BigIntegerField(default=0)),
+                ('rows', models.BigIntegerField(default=0)),
+                ('max_lag_ms', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskrunhourlystat',
+            constraint=models.UniqueConstraint(fields=('bucket', 'task_name'), name='task_run_hourly_stat_unique'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import models
+
+from .managers import TaskRunHourlyStatManager
+
+
+class TaskRunHourlyStat(models.Model):
+    """
+    Runs of each celery task aggregated per hour. Written by telemetry.py,
+    read by `celery_task_stats` command.
+    """
+
+    bucket = models.DateTimeField(blank=False, null=False)  # truncated to hour
+    task_name = models.CharField(blank=False, null=False, max_length=255)
+    runs = models.IntegerField(default=0)
+    failures = models.IntegerField(default=0)
+    soft_time_limit_hits = models.IntegerField(default=0)
+    overlaps = models.IntegerField(default=0)  # started while previous run is running
+    total_ms = models.BigIntegerField(default=0)
+    max_ms = models.IntegerField(default=0)
+    query_count = models.BigIntegerField(default=0)
+    rows = models.BigIntegerField(default=0)  # reported by task via `record_rows`
+    max_lag_ms = models.IntegerField(default=0)  # scheduled(published/eta) -> started
+
+    objects = TaskRunHourlyStatManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "task_name"],
+                name="task_run_hourly_stat_unique",
+            )
+        ]
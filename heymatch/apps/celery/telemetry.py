@@ -0,0 +1,215 @@
+"""
+Celery task telemetry, hooked into task signals (every task is instrumented).
+
+Per run: wall time, DB query count, rows processed (reported by task via `record_rows`),
+queue lag (published or ETA -> started) and soft time limit hits.
+    - structured(JSON) log per run, "task_overlap" warning as soon as it is detected
+    - aggregated per hour into TaskRunHourlyStat (`celery_task_stats` command)
+
+Overlap is either
+    - concurrent: run started while another run of the same task is still running
+    - overran: run took longer than its beat interval (next tick is queued up behind it,
+      or dropped by Singleton)
+"""
+import datetime
+import json
+import logging
+import threading
+import time
+
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from heymatch.shared.middleware import QueryStats
+
+from .models import TaskRunHourlyStat
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED_AT_HEADER = "heymatch_published_at"
+RUNNING_CACHE_KEY = "celery_telemetry:running:{task_name}"  # {task_id: expires_at}
+RUNNING_CACHE_TIMEOUT = 60 * 60  # per task id, in case of worker killed before postrun
+RUNNING_LOCK_TIMEOUT = 5
+
+_runs = {}  # task_id: run
+_local = threading.local()
+
+
+def record_rows(num: int) -> None:
+    """Add number of rows processed by currently running task"""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1]["rows"] += num
+
+
+def _alive(running: dict or None, now: float) -> dict:
+    return {
+        task_id: expires_at
+        for task_id, expires_at in (running or {}).items()
+        if expires_at > now
+    }
+
+
+def running_count(task_name: str) -> int:
+    running = cache.get(RUNNING_CACHE_KEY.format(task_name=task_name))
+    return len(_alive(running, time.time()))
+
+
+def _update_running(task_name: str, started: str = None, finished: str = None) -> dict:
+    """
+    Add/remove task id to/from running task ids of `task_name`, returns them.
+    Ids of runs killed before postrun expire after RUNNING_CACHE_TIMEOUT.
+    """
+    key = RUNNING_CACHE_KEY.format(task_name=task_name)
+    lock_key = f"{key}:lock"
+    locked = False
+    for _ in range(50):
+        locked = cache.add(lock_key, 1, timeout=RUNNING_LOCK_TIMEOUT)
+        if locked:
+            break
+        time.sleep(0.01)
+    try:
+        now = time.time()
+        running = _alive(cache.get(key), now)
+        if started:
+            running[started] = now + RUNNING_CACHE_TIMEOUT
+        running.pop(finished, None)
+        cache.set(key, running, timeout=RUNNING_CACHE_TIMEOUT)
+        return running
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def beat_intervals() -> dict:
+    """{task name: interval in seconds} of fixed interval beat schedules"""
+    intervals = {}
+    for entry in settings.CELERY_BEAT_SCHEDULE.values():
+        schedule = entry["schedule"]
+        if isinstance(schedule, datetime.timedelta):
+            intervals[entry["task"]] = schedule.total_seconds()
+        elif isinstance(schedule, (int, float)):
+            intervals[entry["task"]] = schedule
+    return intervals
+
+
+def _lag_ms(request, started_at: float) -> int or None:
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None) or (
+        getattr(request, "headers", None) or {}
+    ).get(PUBLISHED_AT_HEADER)
+    if published_at is None:
+        return None  # e.g. eager, or published by old code
+    scheduled_at = float(published_at)
+    eta = getattr(request, "eta", None)
+    if eta:
+        eta = datetime.datetime.fromisoformat(eta) if isinstance(eta, str) else eta
+        scheduled_at = max(scheduled_at, eta.timestamp())
+    return max(int((started_at - scheduled_at) * 1000), 0)
+
+
+def _log(event: str, level: int = logging.INFO, **fields) -> None:
+    logger.log(level, json.dumps({"event": event, **fields}, ensure_ascii=False))
+
+
+@before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def start_run(task_id=None, task=None, **kwargs):
+    started_at = time.time()
+    running = len(_update_running(task.name, started=task_id))
+    run = {
+        "task_name": task.name,
+        "started_at": started_at,
+        "perf_counter": time.perf_counter(),
+        "lag_ms": _lag_ms(task.request, started_at),
+        "rows": 0,
+        "overlapped": running > 1,
+        "failed": False,
+        "soft_time_limit_exceeded": False,
+        "query_stats": QueryStats().__enter__(),
+    }
+    _runs[task_id] = run
+    _local.stack = getattr(_local, "stack", []) + [run]
+    if run["overlapped"]:
+        _log(
+            "task_overlap",
+            logging.WARNING,
+            task=task.name,
+            task_id=task_id,
+            reason="concurrent",
+            running=running,
+        )
+
+
+@task_failure.connect
+def mark_failed(task_id=None, exception=None, **kwargs):
+    run = _runs.get(task_id)
+    if run is None:
+        return
+    run["failed"] = True
+    run["soft_time_limit_exceeded"] = isinstance(exception, SoftTimeLimitExceeded)
+
+
+@task_postrun.connect
+def finish_run(task_id=None, task=None, state=None, **kwargs):
+    run = _runs.pop(task_id, None)
+    if run is None:
+        return
+    duration_ms = int((time.perf_counter() - run["perf_counter"]) * 1000)
+    stats = run["query_stats"]
+    stats.__exit__(None, None, None)
+    _local.stack = [r for r in getattr(_local, "stack", []) if r is not run]
+    try:
+        _update_running(task.name, finished=task_id)
+    except Exception as e:
+        logger.exception(f"Failed to update running tasks of {task.name}: {e}")
+
+    interval = beat_intervals().get(task.name)
+    if interval and duration_ms > interval * 1000:
+        run["overlapped"] = True
+        _log(
+            "task_overlap",
+            logging.WARNING,
+            task=task.name,
+            task_id=task_id,
+            reason="overran",
+            duration_ms=duration_ms,
+            interval_ms=int(interval * 1000),
+        )
+
+    _log(
+        "task_run",
+        task=task.name,
+        task_id=task_id,
+        state=state,
+        duration_ms=duration_ms,
+        query_count=stats.count,
+        db_time_ms=round(stats.total_ms, 2),
+        rows=run["rows"],
+        lag_ms=run["lag_ms"],
+        soft_time_limit_exceeded=run["soft_time_limit_exceeded"],
+        overlapped=run["overlapped"],
+    )
+    try:
+        TaskRunHourlyStat.objects.record(
+            task_name=task.name,
+            started_at=datetime.datetime.fromtimestamp(
+                run["started_at"], tz=timezone.utc
+            ),
+            duration_ms=duration_ms,
+            query_count=stats.count,
+            rows=run["rows"],
+            lag_ms=run["lag_ms"],
+            failed=run["failed"],
+            soft_time_limit_exceeded=run["soft_time_limit_exceeded"],
+            overlapped=run["overlapped"],
+        )
+    except Exception as e:
+        logger.exception(f"Failed to record telemetry of {task.name}: {e}")
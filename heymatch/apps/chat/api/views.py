@@ -15,11 +15,11 @@ from rest_framework.response import Response
 from heymatch.apps.chat.models import StreamChannel
 from heymatch.apps.group.api.serializers import V2GroupFullFieldSerializer
 from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.notification.outbox import enqueue_push_notification
 
 User = get_user_model()
 stream = settings.STREAM_CLIENT
 logger = logging.getLogger()
-onesignal_client = settings.ONE_SIGNAL_CLIENT
 
 
 class StreamChatViewSet(viewsets.ModelViewSet):
@@ -309,7 +309,7 @@ class StreamChatWebHookViewSet(viewsets.ViewSet):
             ).first()
 
             # Get group name
-            res = onesignal_client.send_notification_to_specific_users(
+            enqueue_push_notification(
                 title=f"[{sc.group_member.group.title}]으로 부터 새로운 매세지가 왔어요!",
                 content=f"[{sc.group_member.group.title}]으로 부터 새로운 메세지가 왔어요! ",
                 user_ids=receiver_user_ids,
@@ -318,7 +318,6 @@ class StreamChatWebHookViewSet(viewsets.ViewSet):
                     "data": serializer_data,
                 },
             )
-            logger.debug(f"OneSignal response for Stream Webhook message: {res}")
         else:
             pass
 
@@ -0,0 +1,55 @@
+import pytest
+from django.conf import settings
+
+from heymatch.apps.chat.models import StreamChannel
+from heymatch.apps.group.tests.factories import GroupMemberFactory
+from heymatch.apps.user.tests.factories import (
+    ActiveEmployeeFemaleUserFactory,
+    ActiveEmployeeMaleUserFactory,
+    UserProfileImageFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_group_member(user_factory):
+    user = user_factory.create()
+    UserProfileImageFactory.create_batch(2, user=user)
+    return GroupMemberFactory.create(user=user)
+
+
+def _channel(cid: str) -> dict:
+    return {
+        "channel": {"cid": cid},
+        "read": [],
+        "messages": [{"text": "안녕하세요", "created_at": "2023-12-01T00:00:00Z"}],
+    }
+
+
+class TestStreamChatQueryBudgets:
+    def test_stream_chat_list(self, api_client, query_stats, query_budget, mocker):
+        my_member = _create_group_member(ActiveEmployeeMaleUserFactory)
+        api_client.force_authenticate(user=my_member.user)
+        channels = []
+        for i in range(2):
+            cid = f"messaging:test-{i}"
+            other_member = _create_group_member(ActiveEmployeeFemaleUserFactory)
+            for group_member in [my_member, other_member]:
+                StreamChannel.objects.create(
+                    stream_id=f"test-{i}",
+                    cid=cid,
+                    type="messaging",
+                    group_member=group_member,
+                )
+            channels.append(_channel(cid))
+        mocker.patch.object(
+            settings.STREAM_CLIENT,
+            "query_channels",
+            return_value={"channels": channels},
+        )
+
+        with query_stats:
+            res = api_client.get("/api/chats/")
+        assert res.status_code == 200
+        assert len(res.data) == 2
+        query_budget("stream_chat_list", query_stats)
@@ -3,6 +3,7 @@ from simple_history.admin import SimpleHistoryAdmin
 
 from .models import (
     Group,
+    GroupAddressHourlyCount,
     GroupMember,
     GroupProfileImage,
     GroupProfilePhotoPurchased,
@@ -28,14 +29,10 @@ class GroupV2Admin(SimpleHistoryAdmin):
         "member_number",
         "member_avg_age",
         "match_point",
-        # "member_avg_height",
-        # "member_gender_type",
+        "member_avg_height",
+        "gender_composition",
         "about_our_group_tags",
         "meeting_we_want_tags",
-        "notified_to_update_meetup_date_after_one_day",
-        "notified_to_update_meetup_date_after_three_day",
-        "notified_to_update_meetup_date_after_one_week",
-        "notified_to_update_meetup_date_after_two_week",
         "created_at",
         "updated_at",
         "is_active",
@@ -59,10 +56,6 @@ class GroupV2Admin(SimpleHistoryAdmin):
         # "member_gender_type",
         "about_our_group_tags",
         "meeting_we_want_tags",
-        "notified_to_update_meetup_date_after_one_day",
-        "notified_to_update_meetup_date_after_three_day",
-        "notified_to_update_meetup_date_after_one_week",
-        "notified_to_update_meetup_date_after_two_week",
         "created_at",
         "updated_at",
         "is_active",
@@ -102,6 +95,19 @@ class Recent24HrTopGroupAddressAdmin(admin.ModelAdmin):
     ]
 
 
+@admin.register(GroupAddressHourlyCount)
+class GroupAddressHourlyCountAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "bucket",
+        "gps_address",
+        "count",
+    ]
+    search_fields = [
+        "gps_address",
+    ]
+
+
 @admin.register(ReportedGroupV2)
 class ReportedGroupAdmin(admin.ModelAdmin):
     list_display = [
@@ -195,6 +201,7 @@ class GroupProfilePhotoAdmin(admin.ModelAdmin):
         "image_blurred",
         "thumbnail",
         "thumbnail_blurred",
+        "variants_pending",
         "order",
     ]
     history_list_display = ["status", *list_display]
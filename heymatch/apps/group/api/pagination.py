@@ -0,0 +1,161 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class GroupV2FeedCursorPagination(BasePagination):
+    """
+    Keyset(cursor) pagination for GroupV2 feed.
+    Instead of COUNT(*) + OFFSET, next page continues right after the last row of
+    previous page, so deep scrolling costs the same as the first page.
+
+    Ordering follows `order_by` of GroupV2Filter:
+        - updated_at (default): -updated_at, -id
+        - meetup_date: relevance, timediff, id
+        - distance: distance, id  (requires `point`)
+
+    e.g.)
+        GET ../api/groups/?pagination=cursor&order_by=meetup_date
+        GET ../api/groups/?pagination=cursor&order_by=meetup_date&cursor=<opaque>
+    Total count is only calculated when `with_count=true` is given.
+    """
+
+    page_size = 15
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    invalid_cursor_message = "Invalid cursor"
+
+    # mode -> ((field, descending), ...). Last field should be unique.
+    orderings = {
+        "updated_at": (("updated_at", True), ("id", True)),
+        "meetup_date": (("relevance", False), ("timediff", False), ("id", False)),
+        "distance": (("distance", False), ("id", False)),
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.mode = self.get_mode(queryset, request)
+        ordering = self.orderings[self.mode]
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ["true", "1"]:
+            self.count = queryset.order_by().count()
+
+        queryset = queryset.order_by(
+            *[f"-{field}" if desc else field for field, desc in ordering]
+        )
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_q(ordering, position))
+
+        # fetch one more row to know whether next page exists
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        self.next_position = None
+        if self.has_next:
+            last = self.page[-1]
+            self.next_position = [getattr(last, field) for field, _ in ordering]
+        return self.page
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response["count"] = self.count
+        response["next"] = self.get_next_link()
+        response["results"] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_mode(self, queryset, request) -> str:
+        mode = request.query_params.get("order_by")
+        if mode == "created_at":
+            mode = "updated_at"
+        if mode not in self.orderings:
+            return "updated_at"
+        # annotations are added by GroupV2Filter. (e.g. distance without `point`)
+        annotated = queryset.query.annotations
+        for field, _ in self.orderings[mode]:
+            if field not in ["id", "updated_at"] and field not in annotated:
+                return "updated_at"
+        return mode
+
+    @staticmethod
+    def get_keyset_q(ordering, position) -> Q:
+        """(a, b, c) > (a0, b0, c0) for mixed asc/desc ordering"""
+        q = Q()
+        equal = Q()
+        for (field, desc), value in zip(ordering, position):
+            lookup = "lt" if desc else "gt"
+            q |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return q
+
+    def get_next_link(self) -> str or None:
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            remove_query_param(self.base_url, self.count_query_param),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def encode_cursor(self, position) -> str:
+        values = [self._dump_value(value) for value in position]
+        payload = json.dumps({"m": self.mode, "p": values}, separators=(",", ":"))
+        return urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            if payload["m"] != self.mode:
+                raise ValueError("cursor is not for current ordering")
+            position = [self._load_value(value) for value in payload["p"]]
+            if len(position) != len(self.orderings[self.mode]):
+                raise ValueError("cursor length mismatch")
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    @staticmethod
+    def _dump_value(value) -> list:
+        if isinstance(value, datetime):
+            return ["dt", value.isoformat()]
+        if isinstance(value, date):
+            return ["d", value.isoformat()]
+        if isinstance(value, timedelta):
+            return ["td", value.total_seconds()]
+        return ["v", value]
+
+    @staticmethod
+    def _load_value(value):
+        kind, raw = value
+        if kind == "dt":
+            return datetime.fromisoformat(raw)
+        if kind == "d":
+            return date.fromisoformat(raw)
+        if kind == "td":
+            return timedelta(seconds=raw)
+        if kind == "v" and isinstance(raw, (int, float)):
+            return raw
+        raise ValueError("unknown cursor value")
@@ -11,12 +11,36 @@ from heymatch.apps.group.models import (
     Recent24HrTopGroupAddress,
     ReportedGroupV2,
 )
+from heymatch.apps.hotplace.index import get_hotplace_index
 from heymatch.apps.hotplace.models import HotPlace
 from heymatch.apps.user.models import FakeChatUser, User, UserProfileImage
-from heymatch.utils.util import (
-    generate_rand_geoopt_within_boundary,
-    is_geopt_within_boundary,
-)
+from heymatch.shared import image_variants
+from heymatch.utils.util import generate_rand_geoopt_within_boundary
+
+
+def _build_tag_label_table(tag_choices) -> dict:
+    table = {}
+    for value, label_and_color in tag_choices.choices:
+        split = label_and_color.split("/")
+        table[value] = {"value": value, "label": split[0], "color": split[1]}
+    return table
+
+
+def _convert_tags_value_to_label(tags, table: dict) -> list:
+    return [table[tag] for tag in tags or [] if tag in table]
+
+
+def _url(image) -> str or None:
+    """None while variants are being generated (see `variants_pending`)"""
+    return image.url if image else None
+
+
+def _storage_url(field, name: str) -> str or None:
+    return field.storage.url(name) if name else None
+
+
+ABOUT_OUR_GROUP_TAG_TABLE = _build_tag_label_table(GroupV2.GroupWhoWeAreTag)
+MEETING_WE_WANT_TAG_TABLE = _build_tag_label_table(GroupV2.GroupWantToMeetTag)
 
 
 #####################
@@ -29,6 +53,9 @@ class _UserProfileByContextSerializer(serializers.ModelSerializer):
     thumbnail = serializers.SerializerMethodField(
         "decide_whether_original_or_blurred_thumbnail"
     )
+    # {format: {width: url}}. `image`, `thumbnail` are JPEG fallbacks
+    image_srcset = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = UserProfileImage
@@ -37,35 +64,45 @@ class _UserProfileByContextSerializer(serializers.ModelSerializer):
             "status",
             "image",
             "thumbnail",
+            "image_srcset",
+            "thumbnail_srcset",
             "order",
             "is_active",
+            "variants_pending",
         ]
 
     def decide_whether_original_or_blurred_image(self, obj):
-        if self.context.get("force_original_image", False):
-            return obj.image.url
-        if self.context.get("user_purchased_group_profile_ids", None):
-            group_ids = GroupMember.objects.filter(user=obj.user).values_list(
-                "group_id", flat=True
-            )
-            if set(group_ids).intersection(
-                set(self.context["user_purchased_group_profile_ids"])
-            ):
-                return obj.image.url
-        return obj.image_blurred.url
+        if self.is_original_image_unlocked(obj):
+            return _url(obj.image)
+        return _url(obj.image_blurred)
 
     def decide_whether_original_or_blurred_thumbnail(self, obj):
+        if self.is_original_image_unlocked(obj):
+            return _url(obj.thumbnail)
+        return _url(obj.thumbnail_blurred)
+
+    def get_image_srcset(self, obj):
+        if self.is_original_image_unlocked(obj):
+            return obj.srcset("image")
+        return obj.srcset("image_blurred")
+
+    def get_thumbnail_srcset(self, obj):
+        if self.is_original_image_unlocked(obj):
+            return obj.srcset("thumbnail")
+        return obj.srcset("thumbnail_blurred")
+
+    def is_original_image_unlocked(self, obj) -> bool:
         if self.context.get("force_original_image", False):
-            return obj.thumbnail.url
-        if self.context.get("user_purchased_group_profile_ids", None):
-            group_ids = GroupMember.objects.filter(user=obj.user).values_list(
-                "group_id", flat=True
+            return True
+        # Views should pass "unlocked_profile_user_ids" in context.
+        # Otherwise calculate it once, and share it with the rest of the response.
+        unlocked_user_ids = self.context.get("unlocked_profile_user_ids", None)
+        if unlocked_user_ids is None:
+            unlocked_user_ids = GroupMember.objects.get_unlocked_profile_user_ids(
+                self.context.get("user_purchased_group_profile_ids", None)
             )
-            if set(group_ids).intersection(
-                set(self.context["user_purchased_group_profile_ids"])
-            ):
-                return obj.thumbnail.url
-        return obj.thumbnail_blurred.url
+            self.context["unlocked_profile_user_ids"] = unlocked_user_ids
+        return obj.user_id in unlocked_user_ids
 
 
 class _UserFullFieldSerializer(serializers.ModelSerializer):
@@ -162,26 +199,221 @@ class V2GroupLimitedFieldSerializer(serializers.ModelSerializer):
         return False
 
     def convert_about_our_group_tags_value_to_label(self, obj):
-        refer = {}
-        for tag in GroupV2.GroupWhoWeAreTag.choices:
-            split = tag[1].split("/")
-            refer[tag[0]] = {"value": tag[0], "label": split[0], "color": split[1]}
-        result = []
-        for tag in obj.about_our_group_tags:
-            if tag in refer:
-                result.append(refer[tag])
-        return result
+        return _convert_tags_value_to_label(
+            obj.about_our_group_tags, ABOUT_OUR_GROUP_TAG_TABLE
+        )
 
     def convert_meeting_we_want_tags_tags_value_to_label(self, obj):
-        refer = {}
-        for tag in GroupV2.GroupWantToMeetTag.choices:
-            split = tag[1].split("/")
-            refer[tag[0]] = {"value": tag[0], "label": split[0], "color": split[1]}
-        result = []
-        for tag in obj.meeting_we_want_tags:
-            if tag in refer:
-                result.append(refer[tag])
-        return result
+        return _convert_tags_value_to_label(
+            obj.meeting_we_want_tags, MEETING_WE_WANT_TAG_TABLE
+        )
+
+
+class V2GroupLimitedFieldFastSerializer:
+    """
+    Read-only fast path of V2GroupLimitedFieldSerializer for the group feed.
+    Output should be identical to V2GroupLimitedFieldSerializer(many=True).
+
+    Group columns are read from given GroupV2 instances (page), and members/users/images
+    are fetched with two values() queries, then response dicts are built directly
+    without nested serializer/model instances.
+    """
+
+    USER_FIELDS = [
+        "id",
+        "username",
+        "gender",
+        "birthdate",
+        "height_cm",
+        "male_body_form",
+        "female_body_form",
+        "job_title",
+        "verified_school_name",
+        "verified_company_name",
+    ]
+    USER_PROFILE_IMAGE_FIELDS = [
+        "user_id",
+        "is_main",
+        "status",
+        "image",
+        "image_blurred",
+        "thumbnail",
+        "thumbnail_blurred",
+        "order",
+        "is_active",
+        "variants_pending",
+        "renditions",
+    ]
+    # columns needed from GroupV2 (see V2GroupLimitedFieldSerializer.Meta.fields)
+    GROUP_FIELDS = [
+        "id",
+        "mode",
+        "title",
+        "meetup_date",
+        "meetup_place_title",
+        "meetup_place_address",
+        "member_number",
+        "member_avg_age",
+        "about_our_group_tags",
+        "meeting_we_want_tags",
+        "created_at",
+        "updated_at",
+    ]
+
+    # Formatters shared with DRF, in order to keep exactly same output
+    _date_field = serializers.DateField()
+    _datetime_field = serializers.DateTimeField()
+
+    def __init__(self, instance, context=None):
+        self.instance = instance
+        self.context = context or {}
+
+    @property
+    def data(self) -> list:
+        groups = list(self.instance)
+        members_by_group = self.get_members_by_group([group.id for group in groups])
+        return [
+            self.to_representation(group, members_by_group.get(group.id, []))
+            for group in groups
+        ]
+
+    def to_representation(self, group, members) -> dict:
+        purchased_group_ids = self.context.get("user_purchased_group_profile_ids", None)
+        return {
+            "id": group.id,
+            "mode": group.mode,
+            "title": group.title,
+            "meetup_date": self._format(self._date_field, group.meetup_date),
+            "meetup_place_title": group.meetup_place_title,
+            "meetup_place_address": group.meetup_place_address,
+            "member_number": group.member_number,
+            "member_avg_age": group.member_avg_age,
+            "profile_photo_purchased": bool(
+                self.context.get("force_original_image", False)
+                or (purchased_group_ids and group.id in purchased_group_ids)
+            ),
+            "group_members": members,
+            "about_our_group_tags": _convert_tags_value_to_label(
+                group.about_our_group_tags, ABOUT_OUR_GROUP_TAG_TABLE
+            ),
+            "meeting_we_want_tags": _convert_tags_value_to_label(
+                group.meeting_we_want_tags, MEETING_WE_WANT_TAG_TABLE
+            ),
+            "created_at": self._format(self._datetime_field, group.created_at),
+        }
+
+    def get_members_by_group(self, group_ids) -> dict:
+        if not group_ids:
+            return {}
+        member_rows = list(
+            GroupMember.objects.filter(group_id__in=group_ids)
+            .order_by("id")
+            .values(
+                "group_id",
+                "is_user_leader",
+                "user_id",
+                "user__hide_my_school_or_company_name",
+                *[f"user__{field}" for field in self.USER_FIELDS],
+            )
+        )
+        images_by_user = self.get_profile_images_by_user(
+            {row["user_id"] for row in member_rows if row["user_id"]}
+        )
+
+        members_by_group = {}
+        for row in member_rows:
+            user = None
+            if row["user_id"]:
+                user = self.user_to_representation(
+                    row, images_by_user.get(row["user_id"], [])
+                )
+            members_by_group.setdefault(row["group_id"], []).append(
+                {"user": user, "is_user_leader": row["is_user_leader"]}
+            )
+        return members_by_group
+
+    def get_profile_images_by_user(self, user_ids) -> dict:
+        if not user_ids:
+            return {}
+        unlocked_user_ids = self.get_unlocked_user_ids()
+        image_field = UserProfileImage._meta.get_field("image")
+        thumbnail_field = UserProfileImage._meta.get_field("thumbnail")
+        image_rows = (
+            UserProfileImage.all_objects.filter(user_id__in=user_ids)
+            .order_by("order", "id")
+            .values(*self.USER_PROFILE_IMAGE_FIELDS)
+        )
+
+        images_by_user = {}
+        for row in image_rows:
+            if row["user_id"] in unlocked_user_ids:
+                image_key, thumbnail_key = "image", "thumbnail"
+            else:
+                image_key, thumbnail_key = "image_blurred", "thumbnail_blurred"
+            renditions = row["renditions"] or {}
+            images_by_user.setdefault(row["user_id"], []).append(
+                {
+                    "is_main": row["is_main"],
+                    "status": row["status"],
+                    "image": _storage_url(image_field, row[image_key]),
+                    "thumbnail": _storage_url(thumbnail_field, row[thumbnail_key]),
+                    "image_srcset": image_variants.srcset(
+                        image_field.storage, renditions.get(image_key)
+                    ),
+                    "thumbnail_srcset": image_variants.srcset(
+                        thumbnail_field.storage, renditions.get(thumbnail_key)
+                    ),
+                    "order": row["order"],
+                    "is_active": row["is_active"],
+                    "variants_pending": row["variants_pending"],
+                }
+            )
+        return images_by_user
+
+    def get_unlocked_user_ids(self):
+        if self.context.get("force_original_image", False):
+            return _AllUserIds()
+        unlocked_user_ids = self.context.get("unlocked_profile_user_ids", None)
+        if unlocked_user_ids is None:
+            unlocked_user_ids = GroupMember.objects.get_unlocked_profile_user_ids(
+                self.context.get("user_purchased_group_profile_ids", None)
+            )
+        return unlocked_user_ids
+
+    def user_to_representation(self, row, profile_images) -> dict:
+        user = {
+            "id": str(row["user__id"]),
+            "username": row["user__username"],
+            "gender": row["user__gender"],
+            "birthdate": self._format(self._date_field, row["user__birthdate"]),
+            "height_cm": row["user__height_cm"],
+            "male_body_form": row["user__male_body_form"],
+            "female_body_form": row["user__female_body_form"],
+            "job_title": row["user__job_title"],
+            "verified_school_name": row["user__verified_school_name"],
+            "verified_company_name": row["user__verified_company_name"],
+            "user_profile_images": profile_images,
+        }
+        # same as _UserFullFieldSerializer.to_representation
+        if row["user__hide_my_school_or_company_name"]:
+            if user["job_title"] == User.JobChoices.EMPLOYEE:
+                user["verified_school_name"] = None
+                user["verified_company_name"] = "직장인"
+            if user["job_title"] == User.JobChoices.COLLEGE_STUDENT:
+                user["verified_school_name"] = "대학생"
+                user["verified_company_name"] = None
+        return user
+
+    @staticmethod
+    def _format(field, value):
+        if value is None:
+            return None
+        return field.to_representation(value)
+
+
+class _AllUserIds:
+    def __contains__(self, item):
+        return True
 
 
 class V2GroupFullFieldSerializer(serializers.ModelSerializer):
@@ -219,26 +451,14 @@ class V2GroupFullFieldSerializer(serializers.ModelSerializer):
         ]
 
     def convert_about_our_group_tags_value_to_label(self, obj):
-        refer = {}
-        for tag in GroupV2.GroupWhoWeAreTag.choices:
-            split = tag[1].split("/")
-            refer[tag[0]] = {"value": tag[0], "label": split[0], "color": split[1]}
-        result = []
-        for tag in obj.about_our_group_tags:
-            if tag in refer:
-                result.append(refer[tag])
-        return result
+        return _convert_tags_value_to_label(
+            obj.about_our_group_tags, ABOUT_OUR_GROUP_TAG_TABLE
+        )
 
     def convert_meeting_we_want_tags_tags_value_to_label(self, obj):
-        refer = {}
-        for tag in GroupV2.GroupWantToMeetTag.choices:
-            split = tag[1].split("/")
-            refer[tag[0]] = {"value": tag[0], "label": split[0], "color": split[1]}
-        result = []
-        for tag in obj.meeting_we_want_tags:
-            if tag in refer:
-                result.append(refer[tag])
-        return result
+        return _convert_tags_value_to_label(
+            obj.meeting_we_want_tags, MEETING_WE_WANT_TAG_TABLE
+        )
 
 
 class V2GroupCreateUpdateSerializer(serializers.ModelSerializer):
@@ -323,25 +543,26 @@ class GroupProfileImagesByJoinedGroupConditionSerializer(serializers.ModelSerial
         fields = [
             "image",
             "thumbnail",
+            "variants_pending",
         ]
 
     def decide_whether_original_or_blurred_image(self, obj):
         if self.context.get("force_original", False):
-            return obj.image.url
+            return _url(obj.image)
         hotplace_id = self.context.get("hotplace_id", None)
         if hotplace_id:
             if obj.group.hotplace.id == hotplace_id:
-                return obj.image.url
-        return obj.image_blurred.url
+                return _url(obj.image)
+        return _url(obj.image_blurred)
 
     def decide_whether_original_or_blurred_thumbnail(self, obj):
         if self.context.get("force_original", False):
-            return obj.thumbnail.url
+            return _url(obj.thumbnail)
         hotplace_id = self.context.get("hotplace_id", None)
         if hotplace_id:
             if obj.group.hotplace.id == hotplace_id:
-                return obj.thumbnail.url
-        return obj.thumbnail_blurred.url
+                return _url(obj.thumbnail)
+        return _url(obj.thumbnail_blurred)
 
 
 class RestrictedGroupProfileSerializer(serializers.ModelSerializer):
@@ -478,11 +699,7 @@ class GroupCreationSerializer(serializers.ModelSerializer):
             geopt = GeoPt(gps_geoinfo)
         except ValidationError as e:
             raise serializers.ValidationError(detail=str(e))
-        hotplace = None
-        for hp in HotPlace.active_objects.all():
-            if is_geopt_within_boundary(geopt, hp.zone_boundary_geoinfos):
-                hotplace = hp
-                break
+        hotplace = get_hotplace_index().find_containing(geopt)
         if not hotplace:
             raise serializers.ValidationError(detail="헤이매치 핫플 안에 있으셔야 해요! 😯")
         return hotplace
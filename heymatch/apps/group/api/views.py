@@ -3,21 +3,8 @@ from typing import Any
 from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.core.exceptions import ValidationError
-from django.db.models import (
-    Avg,
-    Case,
-    Count,
-    DurationField,
-    F,
-    IntegerField,
-    OuterRef,
-    Prefetch,
-    Q,
-    Subquery,
-    Sum,
-    When,
-)
-from django.db.models.functions import Coalesce
+from django.db import transaction
+from django.db.models import Case, DurationField, F, IntegerField, Prefetch, Q, When
 from django.db.models.query import QuerySet
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -29,6 +16,7 @@ from django_filters.rest_framework import (
     DjangoFilterBackend,
     FilterSet,
     NumberFilter,
+    RangeFilter,
 )
 from django_google_maps.fields import GeoPt
 from drf_yasg.utils import no_body, swagger_auto_schema
@@ -40,9 +28,12 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework_gis.filters import DistanceToPointFilter
 
+from heymatch.apps.celery.tasks import resolve_group_gps_address
 from heymatch.apps.chat.models import StreamChannel
+from heymatch.apps.group.exclusions import get_excluded_group_ids
 from heymatch.apps.group.models import (
     Group,
+    GroupAddressHourlyCount,
     GroupMember,
     GroupProfilePhotoPurchased,
     GroupV2,
@@ -51,8 +42,10 @@ from heymatch.apps.group.models import (
 )
 from heymatch.apps.hotplace.models import HotPlace
 from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.notification.outbox import enqueue_push_notification
 from heymatch.apps.payment.models import UserPointConsumptionHistory
 from heymatch.apps.user.models import User
+from heymatch.shared import geocoding
 from heymatch.shared.exceptions import (
     GroupNotWithinSameHotplaceException,
     GroupProfilePhotoAlreadyPurchasedException,
@@ -66,13 +59,15 @@ from heymatch.shared.exceptions import (
     UserNotJoinedGroupException,
     UserPointBalanceNotEnoughException,
 )
+from heymatch.shared.expressions import KNNDistance
 from heymatch.shared.permissions import (
     IsGroupCreationAllowed,
     IsUserActive,
     IsUserJoinedGroup,
 )
-from heymatch.utils.util import NaverGeoAPI, is_geopt_within_boundary
+from heymatch.utils.util import is_geopt_within_boundary
 
+from .pagination import GroupV2FeedCursorPagination
 from .serializers import (
     FullGroupProfileByHotplaceSerializer,
     FullGroupProfileSerializer,
@@ -85,18 +80,22 @@ from .serializers import (
     RestrictedGroupProfileByHotplaceSerializer,
     V2GroupCreateUpdateSerializer,
     V2GroupFullFieldSerializer,
+    V2GroupLimitedFieldFastSerializer,
     V2GroupLimitedFieldSerializer,
 )
 
 # User = get_user_model()
 stream = settings.STREAM_CLIENT
-onesignal_client = settings.ONE_SIGNAL_CLIENT
-NAVER_GEO_API = NaverGeoAPI()
+
+
+def defer_gps_address_resolution(group: GroupV2):
+    if group.gps_address == geocoding.GPS_ADDRESS_PENDING:
+        transaction.on_commit(lambda: resolve_group_gps_address.delay(group.id))
 
 
 class GroupV2Filter(FilterSet):
     meetup_date = DateFromToRangeFilter(field_name="meetup_date")
-    # height = RangeFilter(method="filter_avg_heights_in_group")
+    height = RangeFilter(method="filter_avg_heights_in_group")
     # gender = CharFilter(method="filter_gender_type_in_group")
     member_num = NumberFilter(method="filter_member_number_in_group")
     order_by = CharFilter(method="filter_order_by_in_group")
@@ -108,37 +107,13 @@ class GroupV2Filter(FilterSet):
         ]
 
     def filter_avg_heights_in_group(self, queryset, field_name, value):
-        # Define subquery to get the height of each user
+        # member_avg_height is maintained by group.signals (see GroupMemberManager)
         if not value:
             return queryset
-
-        height_subquery = Subquery(
-            User.objects.filter(id=OuterRef("user_id")).values("height_cm")[:1]
-        )
-        # Define subquery to get the group IDs
-        # group_subquery = Subquery(
-        #     GroupV2.objects.filter(id=OuterRef("group_id")).values("id")[:1]
-        # )
-        # Define subquery to get the average height for each group
-        avg_height_subquery = (
-            GroupMember.objects.filter(group_id=OuterRef("group_id"))
-            .annotate(height_cm=Coalesce(height_subquery, 0))
-            .values("group_id")
-            .annotate(avg_height=Avg("height_cm", output_field=IntegerField()))
-            .values("avg_height")
-        )
-        # Define the final queryset
-        gm_queryset = (
-            GroupMember.objects.annotate(height_cm=Coalesce(height_subquery, 0))
-            # .annotate(group_anno_id=Coalesce(group_subquery, 0))
-            .annotate(avg_height=Coalesce(avg_height_subquery, 0))
-            .filter(avg_height__gte=value.start, avg_height__lte=value.stop)
-            .distinct("group_id")
-        )
-        # Get final GroupV2 QS
-        queryset = queryset.filter(
-            id__in=list(gm_queryset.values_list("group_id", flat=True))
-        )
+        if value.start is not None:
+            queryset = queryset.filter(member_avg_height__gte=value.start)
+        if value.stop is not None:
+            queryset = queryset.filter(member_avg_height__lte=value.stop)
         return queryset
 
     def filter_member_number_in_group(self, queryset, field_name, value):
@@ -172,6 +147,17 @@ class GroupV2Filter(FilterSet):
             )
         if value == "created_at" or value == "updated_at":
             return queryset.order_by("-updated_at")
+        if value == "distance":
+            # KNN ordering (<->) walks the GiST index on gps_point nearest first
+            if self.request is None:
+                return queryset
+            point = DistanceToPointFilter().get_filter_point(self.request)
+            if not point:
+                return queryset
+            return queryset.annotate(distance=KNNDistance("gps_point", point)).order_by(
+                "distance"
+            )
+        return queryset
 
     # def filter_member_number_in_group(self, queryset, field_name, value):
     #     if not value:
@@ -298,6 +284,16 @@ class GroupV2GeneralViewSet(viewsets.ModelViewSet):
     filterset_class = GroupV2Filter
     pagination_class = StandardResultsSetPagination
 
+    @property
+    def paginator(self):
+        # ?pagination=cursor => keyset pagination without COUNT(*) and OFFSET
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = GroupV2FeedCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """
         1) "검색 장소 기준 반경 km" 나누고
@@ -312,6 +308,9 @@ class GroupV2GeneralViewSet(viewsets.ModelViewSet):
             gender=male_only or gender=female_only or gender=mixed
         6) 마지막 pagination
             page=3
+            or pagination=cursor (+ cursor=<next 링크의 cursor>, 필요시 with_count=true)
+        7) 정렬
+            order_by=updated_at or order_by=meetup_date or order_by=distance (point 필요)
 
         예시) 압구정역 기준 반경 5km 내 미팅날짜가 2023-01-01~2023-01-05 사이고 멤버들의 평균키가 130cm-180cm 사이인 그룹들
             GET ../api/groups/
@@ -329,14 +328,26 @@ class GroupV2GeneralViewSet(viewsets.ModelViewSet):
         """
         qs = self.get_queryset()
         filtered_qs = self.filter_queryset(queryset=qs)
+        # members/users/images are fetched in bulk by the fast serializer
+        filtered_qs = filtered_qs.prefetch_related(None).only(
+            *V2GroupLimitedFieldFastSerializer.GROUP_FIELDS
+        )
         paginated_qs = self.paginate_queryset(filtered_qs)
-        purchased_group_ids = GroupProfilePhotoPurchased.objects.filter(
-            buyer=request.user
-        ).values_list("seller_id", flat=True)
-        serializer = V2GroupLimitedFieldSerializer(
+        purchased_group_ids = list(
+            GroupProfilePhotoPurchased.objects.filter(buyer=request.user).values_list(
+                "seller_id", flat=True
+            )
+        )
+        # precompute once instead of querying per profile image
+        unlocked_user_ids = GroupMember.objects.get_unlocked_profile_user_ids(
+            purchased_group_ids
+        )
+        serializer = V2GroupLimitedFieldFastSerializer(
             paginated_qs,
-            many=True,
-            context={"user_purchased_group_profile_ids": list(purchased_group_ids)},
+            context={
+                "user_purchased_group_profile_ids": purchased_group_ids,
+                "unlocked_profile_user_ids": unlocked_user_ids,
+            },
         )
         return self.get_paginated_response(data=serializer.data)
 
@@ -346,75 +357,27 @@ class GroupV2GeneralViewSet(viewsets.ModelViewSet):
         qs = self.filter_other_gender_groups(qs)
 
         # 1) Exclude my group
-        q = Q(user=self.request.user) & Q(is_active=True)
-
         # 2) Exclude blocked school/company
         #   a) 나의 block_my_school_or_company_users=True일때
         #    - 내꺼랑 똑같은 사람은 exclude하기
         #   b) 나의 block_my_school_or_company_users=False일때
         #    - GroupMember중에 block_my_school_or_company_users=True면서 내꺼랑 똑같은 사람 exclude하기
-        my_school_name = self.request.user.verified_school_name
-        my_company_name = self.request.user.verified_company_name
-        block_q = Q(user__block_my_school_or_company_users=True)
-        school_q = Q(user__verified_school_name=my_school_name)
-        company_q = Q(user__verified_company_name=my_company_name)
-
-        if not self.request.user.block_my_school_or_company_users:
-            if my_school_name:
-                q |= block_q & school_q
-            if my_company_name:
-                q |= block_q & company_q
-        else:
-            if my_school_name:
-                q |= school_q
-            if my_company_name:
-                q |= company_q
-
-        blocked_group_ids = list(
-            GroupMember.objects.filter(q).values_list("group_id", flat=True)
-        )
-
         # 3) Exclude Matched (chat) groups
         # TODO: future job
-
         # 4) Exclude reported by me groups
-        reported_group_ids = list(
-            ReportedGroupV2.objects.filter(reported_by=self.request.user).values_list(
-                "reported_group_id", flat=True
-            )
-        )
-
-        return qs.exclude(id__in=reported_group_ids + blocked_group_ids)
+        # => cached per viewer (see heymatch.apps.group.exclusions)
+        excluded_group_ids = get_excluded_group_ids(self.request.user)
+        if not excluded_group_ids:
+            return qs
+        return qs.exclude(id__in=excluded_group_ids)
 
     def filter_other_gender_groups(self, queryset):
-        other_gender = "m" if self.request.user.gender == "f" else "f"
-        groupmember = (
-            GroupMember.objects.annotate(
-                gender=Subquery(
-                    User.objects.filter(id=OuterRef("user_id")).values("gender")[:1]
-                )
-            )
-            .select_related("group")
-            .values("group_id")
-            .distinct()
-        )
-        gm_queryset = (
-            groupmember.annotate(num_members=Count("user_id", distinct=True))
-            .annotate(
-                num_target_members=Sum(
-                    Case(
-                        When(Q(gender=other_gender), then=1),
-                        default=0,
-                        output_field=IntegerField(),
-                    ),
-                )
-            )
-            .filter(num_members=F("num_target_members"))
-        )
-        queryset = queryset.filter(
-            id__in=list(gm_queryset.values_list("group_id", flat=True))
-        )
-        return queryset
+        # gender_composition is maintained by group.signals (see GroupMemberManager)
+        if self.request.user.gender == User.GenderChoices.FEMALE:
+            target = GroupV2.GenderCompositionChoices.MALE_ONLY
+        else:
+            target = GroupV2.GenderCompositionChoices.FEMALE_ONLY
+        return queryset.filter(gender_composition=target)
 
     @swagger_auto_schema(request_body=V2GroupCreateUpdateSerializer)
     def create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -434,7 +397,7 @@ class GroupV2GeneralViewSet(viewsets.ModelViewSet):
         gps_point = serializer.validated_data.get("gps_point")
         gps = gps_point.split(",")
         serializer.validated_data["gps_point"] = Point(x=float(gps[0]), y=float(gps[1]))
-        serializer.validated_data["gps_address"] = NAVER_GEO_API.reverse_geocode(
+        serializer.validated_data["gps_address"] = geocoding.resolve_gps_address(
             long=gps[0], lat=gps[1]
         )
 
@@ -467,6 +430,7 @@ class GroupV2GeneralViewSet(viewsets.ModelViewSet):
         GroupMember.objects.create(
             group=group, user=self.request.user, is_user_leader=True
         )
+        defer_gps_address_resolution(group)
         return group
 
 
@@ -505,7 +469,15 @@ class GroupV2DetailViewSet(viewsets.ModelViewSet):
     serializer_class = V2GroupFullFieldSerializer
 
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        queryset = GroupV2.objects.all().filter(is_active=True)
+        queryset = (
+            GroupV2.objects.all()
+            .filter(is_active=True)
+            .prefetch_related(
+                "group_member_group",
+                "group_member_group__user",
+                "group_member_group__user__user_profile_images",
+            )
+        )
         group = get_object_or_404(queryset, id=kwargs["group_id"])
 
         # Check if my group
@@ -580,7 +552,7 @@ class GroupV2DetailViewSet(viewsets.ModelViewSet):
             gps_point = request.data.get("gps_point")
             gps = gps_point.split(",")
             group.gps_point = Point(x=float(gps[0]), y=float(gps[1]))
-            group.gps_address = NAVER_GEO_API.reverse_geocode(long=gps[0], lat=gps[1])
+            group.gps_address = geocoding.resolve_gps_address(long=gps[0], lat=gps[1])
         group.meetup_date = request.data.get("meetup_date", group.meetup_date)
         group.meetup_place_title = request.data.get(
             "meetup_place_title", group.meetup_place_title
@@ -613,6 +585,7 @@ class GroupV2DetailViewSet(viewsets.ModelViewSet):
                 "updated_at",
             ]
         )
+        defer_gps_address_resolution(group)
         serializer = self.get_serializer(group)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -664,7 +637,7 @@ class GroupV2DetailViewSet(viewsets.ModelViewSet):
                 str(user_id)
                 for user_id in seller_gm_qs.values_list("user_id", flat=True)
             ]
-            onesignal_client.send_notification_to_specific_users(
+            enqueue_push_notification(
                 title="누가 내 프로필 사진을 봤어요!!",
                 content=f"[{buyer_gm.group.title}]님이 내 프로필 사진을 열어 봤어요!! 상대 그룹을 확인해보세요!🧐",
                 user_ids=seller_user_ids,
@@ -695,12 +668,9 @@ class GroupV2DetailViewSet(viewsets.ModelViewSet):
 
         # if max ads per day reached, prohibit
         user = request.user
-        if user.num_of_available_ads < 1:
+        if not User.objects.consume_ads_quota(user):
             raise GroupProfilePhotoPurchaseByAdsReachedException()
 
-        user.num_of_available_ads = user.num_of_available_ads - 1
-        user.save(update_fields=["num_of_available_ads"])
-
         # purchase by Ads
         GroupProfilePhotoPurchased.objects.create(
             seller=group,
@@ -731,7 +701,7 @@ class GroupV2DetailViewSet(viewsets.ModelViewSet):
                 str(user_id)
                 for user_id in seller_gm_qs.values_list("user_id", flat=True)
             ]
-            onesignal_client.send_notification_to_specific_users(
+            enqueue_push_notification(
                 title="누가 내 프로필 사진을 봤어요!!",
                 content=f"[{buyer_gm.group.title}]님이 내 프로필 사진을 열어 봤어요!! 상대 그룹을 확인해보세요!🧐",
                 user_ids=seller_user_ids,
@@ -756,15 +726,13 @@ class GroupsTopAddressViewSet(viewsets.ModelViewSet):
 
     @method_decorator(cache_page(60 * 5))  # cache every 5min
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        queryset = Recent24HrTopGroupAddress.objects.last()
-        serializer = self.get_serializer(queryset)
-        data = serializer.data
-        # re-order
-        data["result"] = {
-            k: v
-            for k, v in sorted(data["result"].items(), key=lambda x: x[1], reverse=True)
-        }
-        return Response(data=data, status=status.HTTP_200_OK)
+        # read straight from hourly buckets (already ordered by count desc)
+        top_address = Recent24HrTopGroupAddress(
+            result=GroupAddressHourlyCount.objects.top_addresses(limit=10),
+            aggregated_at=timezone.now(),
+        )
+        serializer = self.get_serializer(top_address)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
 
 
 class GroupV2MatchRequestViewSet(viewsets.ViewSet):
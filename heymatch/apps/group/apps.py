@@ -5,3 +5,9 @@ from django.utils.translation import gettext_lazy as _
 class GroupAppConfig(AppConfig):
     name = "heymatch.apps.group"
     verbose_name = _("Group App")
+
+    def ready(self):
+        try:
+            import heymatch.apps.group.signals  # noqa F401
+        except ImportError:
+            pass
@@ -0,0 +1,114 @@
+"""
+Per-viewer exclusion set for the group feed.
+
+Feed에서 제외되어야 하는 그룹들 (내 그룹 / 같은 학교,회사 차단 / 내가 신고한 그룹)을 캐시(Redis)에 저장.
+Viewer의 exclusion set은 아래 조각들의 합집합:
+    - own:{user_id}                 내가 속한 그룹
+    - reported:{user_id}            내가 신고한 그룹
+    - school:{name} / company:{name}
+        a) 나의 block_my_school_or_company_users=True 일때: 같은 학교/회사 사람이 속한 그룹 전체
+        b) False 일때: 같은 학교/회사 사람 중 block_my_school_or_company_users=True 인 사람이 속한 그룹
+학교/회사 조각은 같은 소속의 viewer들이 공유하므로, 멤버십 변경시 해당 소속 key만 지우면 된다.
+Invalidation은 heymatch.apps.group.signals 참고.
+"""
+import hashlib
+from typing import Iterable, Set
+
+from django.core.cache import cache
+
+from heymatch.apps.group.models import GroupMember, ReportedGroupV2
+
+EXCLUSION_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+EXCLUSION_CACHE_KEY_PREFIX = "group_feed_exclusion"
+
+
+def _key(kind: str, value) -> str:
+    # school/company names are user input (Korean, spaces..), keep cache keys safe
+    if kind.startswith(("school", "company")):
+        value = hashlib.md5(str(value).encode("utf-8")).hexdigest()
+    return f"{EXCLUSION_CACHE_KEY_PREFIX}:{kind}:{value}"
+
+
+def _affiliation_keys(school_name, company_name, blocks_all: bool) -> dict:
+    """Returns {cache_key: GroupMember filter kwargs} for the viewer's school/company"""
+    keys = {}
+    for kind, name in (("school", school_name), ("company", company_name)):
+        if not name:
+            continue
+        lookup = {f"user__verified_{kind}_name": name}
+        if blocks_all:
+            keys[_key(f"{kind}_all", name)] = lookup
+        else:
+            lookup["user__block_my_school_or_company_users"] = True
+            keys[_key(f"{kind}_blocking", name)] = lookup
+    return keys
+
+
+def _group_ids(qs) -> Set[int]:
+    # Only active groups can show up in the feed. Keeps the NOT IN list bounded.
+    return set(
+        qs.filter(group__is_active=True)
+        .values_list("group_id", flat=True)
+        .distinct()
+        .iterator()
+    )
+
+
+def get_excluded_group_ids(user) -> Set[int]:
+    builders = {
+        _key("own", user.id): lambda: _group_ids(
+            GroupMember.objects.filter(user=user, is_active=True)
+        ),
+        _key("reported", user.id): lambda: set(
+            ReportedGroupV2.objects.filter(
+                reported_by=user, reported_group__is_active=True
+            ).values_list("reported_group_id", flat=True)
+        ),
+    }
+    for key, lookup in _affiliation_keys(
+        user.verified_school_name,
+        user.verified_company_name,
+        user.block_my_school_or_company_users,
+    ).items():
+        builders[key] = lambda lookup=lookup: _group_ids(
+            GroupMember.objects.filter(**lookup)
+        )
+
+    cached = cache.get_many(builders.keys())
+    missing = {}
+    for key, build in builders.items():
+        if key not in cached:
+            missing[key] = build()
+    if missing:
+        cache.set_many(missing, timeout=EXCLUSION_CACHE_TIMEOUT)
+
+    excluded_group_ids = set()
+    for group_ids in [*cached.values(), *missing.values()]:
+        excluded_group_ids |= group_ids
+    return excluded_group_ids
+
+
+def invalidate_reported_group_ids(user_id) -> None:
+    cache.delete(_key("reported", user_id))
+
+
+def invalidate_affiliation(
+    school_names: Iterable[str] = (), company_names: Iterable[str] = ()
+) -> None:
+    keys = []
+    for kind, names in (("school", school_names), ("company", company_names)):
+        for name in names:
+            if name:
+                keys.append(_key(f"{kind}_all", name))
+                keys.append(_key(f"{kind}_blocking", name))
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_member(user) -> None:
+    """Group membership of `user` changed"""
+    cache.delete(_key("own", user.id))
+    invalidate_affiliation(
+        school_names=[user.verified_school_name],
+        company_names=[user.verified_company_name],
+    )
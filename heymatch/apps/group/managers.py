@@ -1,8 +1,14 @@
+from datetime import datetime, timedelta
 from statistics import mean
 
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import Trunc
 from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from heymatch.shared import geocoding
 
 User = get_user_model()
 
@@ -48,12 +54,116 @@ class GroupMemberManager(models.Manager):
         else:
             return "mixed"
 
+    def get_unlocked_profile_user_ids(self, purchased_group_ids) -> set:
+        """Users whose original profile photos are unlocked by purchased groups"""
+        if not purchased_group_ids:
+            return set()
+        return set(
+            self.get_queryset()
+            .filter(group_id__in=purchased_group_ids)
+            .values_list("user_id", flat=True)
+        )
+
+    def get_active_member_summary(self, group_id) -> dict:
+        """Denormalized GroupV2 columns calculated from active members"""
+        summary = (
+            self.get_queryset()
+            .filter(group_id=group_id, is_active=True)
+            .aggregate(
+                males=Count("id", filter=Q(user__gender=User.GenderChoices.MALE)),
+                females=Count("id", filter=Q(user__gender=User.GenderChoices.FEMALE)),
+                avg_height=Avg("user__height_cm"),
+            )
+        )
+        if summary["males"] == 0 and summary["females"] == 0:
+            gender_composition = None
+        elif summary["females"] == 0:
+            gender_composition = "male_only"
+        elif summary["males"] == 0:
+            gender_composition = "female_only"
+        else:
+            gender_composition = "mixed"
+        avg_height = summary["avg_height"]
+        return {
+            "gender_composition": gender_composition,
+            "member_avg_height": int(avg_height) if avg_height is not None else None,
+        }
+
+    def update_member_summary(self, group_id) -> dict:
+        """
+        Recompute GroupV2.gender_composition and GroupV2.member_avg_height.
+        Uses queryset.update() so that GroupV2 history/signals are not triggered.
+        """
+        summary = self.get_active_member_summary(group_id)
+        group_model = self.model._meta.get_field("group").related_model
+        group_model.objects.filter(id=group_id).update(**summary)
+        return summary
+
 
 class ActiveGroupManager(models.Manager):
     def get_queryset(self) -> QuerySet:
         return super().get_queryset().filter(is_active=True)
 
 
+class GroupAddressHourlyCountManager(models.Manager):
+    WINDOW_BUCKETS = 24
+
+    @staticmethod
+    def bucket_of(dt: datetime) -> datetime:
+        return dt.replace(minute=0, second=0, microsecond=0)
+
+    def window_start(self, now: datetime or None = None) -> datetime:
+        now = now or timezone.now()
+        return self.bucket_of(now) - timedelta(hours=self.WINDOW_BUCKETS - 1)
+
+    def bump(self, gps_address: str, at: datetime, delta: int = 1) -> None:
+        """Add delta to the hourly bucket which `at` belongs to"""
+        bucket = self.bucket_of(at)
+        if bucket < self.window_start():
+            return  # already out of window
+        qs = self.get_queryset().filter(bucket=bucket, gps_address=gps_address)
+        if delta > 0:
+            # upsert
+            self.bulk_create(
+                [self.model(bucket=bucket, gps_address=gps_address, count=0)],
+                ignore_conflicts=True,
+            )
+        else:
+            qs = qs.filter(count__gte=-delta)
+        qs.update(count=F("count") + delta)
+
+    def top_addresses(self, limit: int = 10, now: datetime or None = None) -> dict:
+        """{gps_address: count} of recent 24 hours, in descending order"""
+        qs = (
+            self.get_queryset()
+            .filter(bucket__gte=self.window_start(now))
+            .values("gps_address")
+            .annotate(total=Sum("count"))
+            .filter(total__gt=0)
+            .order_by("-total", "gps_address")
+        )
+        return {row["gps_address"]: row["total"] for row in qs[:limit]}
+
+    def prune(self, now: datetime or None = None) -> int:
+        deleted, _ = (
+            self.get_queryset().filter(bucket__lt=self.window_start(now)).delete()
+        )
+        return deleted
+
+    def rebuild(self, group_qs, now: datetime or None = None) -> None:
+        """Recount buckets in window from groups (e.g. active GroupV2 queryset)"""
+        window_start = self.window_start(now)
+        rows = (
+            group_qs.filter(updated_at__gte=window_start)
+            .exclude(gps_address__in=geocoding.GPS_ADDRESS_PLACEHOLDERS)
+            .annotate(bucket=Trunc("updated_at", "hour"))
+            .values("bucket", "gps_address")
+            .annotate(count=Count("id"))
+        )
+        self.get_queryset().filter(bucket__gte=window_start).delete()
+        self.bulk_create([self.model(**row) for row in rows])
+
+
 # ========================
 #  DEPRECATED
 # ========================
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.13 on 2023-12-02 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0014_auto_20231128_0147'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupv2',
+            name='gender_composition',
+            field=models.CharField(blank=True, choices=[('male_only', 'Male Only'), ('female_only', 'Female Only'), ('mixed', 'Mixed')], max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalgroupv2',
+            name='gender_composition',
+            field=models.CharField(blank=True, choices=[('male_only', 'Male Only'), ('female_only', 'Female Only'), ('mixed', 'Mixed')], max_length=16, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='groupv2',
+            index=models.Index(fields=['is_active', 'gender_composition'], name='groupv2_active_gender_idx'),
+        ),
+    ]
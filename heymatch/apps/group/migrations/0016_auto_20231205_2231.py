@@ -0,0 +1,27 @@
+# Generated by Django 3.2.13 on 2023-12-05 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0015_auto_20231202_1410'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupv2',
+            name='member_avg_height',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalgroupv2',
+            name='member_avg_height',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='groupv2',
+            index=models.Index(fields=['is_active', 'member_avg_height'], name='groupv2_active_height_idx'),
+        ),
+    ]
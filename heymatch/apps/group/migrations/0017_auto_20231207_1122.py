@@ -0,0 +1,18 @@
+# Generated by Django 3.2.13 on 2023-12-07 02:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0016_auto_20231205_2231'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupv2',
+            index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('is_active', True)), fields=['gps_point'], name='groupv2_active_gps_gist_idx'),
+        ),
+    ]
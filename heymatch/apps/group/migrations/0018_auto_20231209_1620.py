@@ -0,0 +1,26 @@
+# Generated by Django 3.2.13 on 2023-12-09 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0017_auto_20231207_1122'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupAddressHourlyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('gps_address', models.CharField(max_length=250)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='groupaddresshourlycount',
+            constraint=models.UniqueConstraint(fields=('bucket', 'gps_address'), name='group_address_hourly_count_unique'),
+        ),
+    ]
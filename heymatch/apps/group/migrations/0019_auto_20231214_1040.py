@@ -0,0 +1,70 @@
+# Generated by Django 3.2.13 on 2023-12-14 01:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0018_auto_20231209_1620'),
+        ('notification', '0002_auto_20231214_1030'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_send_mr_after_half_hour',
+        ),
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_send_mr_after_one_day',
+        ),
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_send_mr_after_three_day',
+        ),
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_update_meetup_date_after_one_day',
+        ),
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_update_meetup_date_after_one_week',
+        ),
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_update_meetup_date_after_three_day',
+        ),
+        migrations.RemoveField(
+            model_name='groupv2',
+            name='notified_to_update_meetup_date_after_two_week',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_send_mr_after_half_hour',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_send_mr_after_one_day',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_send_mr_after_three_day',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_update_meetup_date_after_one_day',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_update_meetup_date_after_one_week',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_update_meetup_date_after_three_day',
+        ),
+        migrations.RemoveField(
+            model_name='historicalgroupv2',
+            name='notified_to_update_meetup_date_after_two_week',
+        ),
+    ]
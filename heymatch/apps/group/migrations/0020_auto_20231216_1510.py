@@ -0,0 +1,54 @@
+# Generated by Django 3.2.13 on 2023-12-16 06:10
+
+from django.db import migrations, models
+import heymatch.apps.group.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0019_auto_20231214_1040'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalgroupprofileimage',
+            name='variants_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='groupprofileimage',
+            name='variants_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='historicalgroupprofileimage',
+            name='image_blurred',
+            field=models.TextField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='historicalgroupprofileimage',
+            name='thumbnail',
+            field=models.TextField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='historicalgroupprofileimage',
+            name='thumbnail_blurred',
+            field=models.TextField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='groupprofileimage',
+            name='image_blurred',
+            field=models.ImageField(blank=True, upload_to=heymatch.apps.group.models.upload_to),
+        ),
+        migrations.AlterField(
+            model_name='groupprofileimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to=heymatch.apps.group.models.upload_to),
+        ),
+        migrations.AlterField(
+            model_name='groupprofileimage',
+            name='thumbnail_blurred',
+            field=models.ImageField(blank=True, upload_to=heymatch.apps.group.models.upload_to),
+        ),
+    ]
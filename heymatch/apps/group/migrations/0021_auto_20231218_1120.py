@@ -0,0 +1,23 @@
+# Generated by Django 3.2.13 on 2023-12-18 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0020_auto_20231216_1510'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalgroupprofileimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='groupprofileimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
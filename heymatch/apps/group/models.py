@@ -1,22 +1,35 @@
 import os.path
 import uuid
-from io import BytesIO
 
 from django.conf import settings
 from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GistIndex
 from django.contrib.postgres.operations import CreateExtension
-from django.core.files.base import ContentFile
 from django.db import migrations
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.timezone import now
 from django_google_maps.fields import GeoLocationField
 from fernet_fields import EncryptedField
 from ordered_model.models import OrderedModel
-from PIL import Image, ImageFilter, ImageOps
 from simple_history.models import HistoricalRecords
 
-from .managers import ActiveGroupManager, GroupManager, GroupMemberManager
+from heymatch.shared.image_variants import (
+    IMAGE_MAX_SIZE,
+    IMAGE_WIDTHS,
+    THUMBNAIL_MAX_SIZE,
+    THUMBNAIL_WIDTHS,
+    ImageVariantsMixin,
+    Variant,
+)
+
+from .managers import (
+    ActiveGroupManager,
+    GroupAddressHourlyCountManager,
+    GroupManager,
+    GroupMemberManager,
+)
 
 
 class EncryptedGeoLocationField(EncryptedField, GeoLocationField):
@@ -85,6 +98,11 @@ class GroupV2(models.Model):
         )
         DRINK_MAKGULI = ("DRINK_MAKGULI", "☂️ 비올땐 막걸리/rgba(217,225,239,1.0)")
 
+    class GenderCompositionChoices(models.TextChoices):
+        MALE_ONLY = "male_only"
+        FEMALE_ONLY = "female_only"
+        MIXED = "mixed"
+
     mode = models.CharField(
         blank=False, null=False, choices=GroupMode.choices, max_length=10
     )
@@ -106,6 +124,12 @@ class GroupV2(models.Model):
     )  # NAVER reverse geocoded address. For Top rank aggregation purpose
     member_number = models.IntegerField(blank=True, null=True)
     member_avg_age = models.IntegerField(blank=True, null=True)
+    gender_composition = models.CharField(
+        blank=True, null=True, choices=GenderCompositionChoices.choices, max_length=16
+    )  # Denormalized from active GroupMembers. Maintained by group.signals
+    member_avg_height = models.IntegerField(
+        blank=True, null=True
+    )  # Denormalized from active GroupMembers. Maintained by group.signals
 
     # Match
     photo_point = models.IntegerField(
@@ -131,16 +155,6 @@ class GroupV2(models.Model):
         null=True,
     )
 
-    # Notification
-    notified_to_update_meetup_date_after_one_day = models.BooleanField(default=False)
-    notified_to_update_meetup_date_after_three_day = models.BooleanField(default=False)
-    notified_to_update_meetup_date_after_one_week = models.BooleanField(default=False)
-    notified_to_update_meetup_date_after_two_week = models.BooleanField(default=False)
-
-    notified_to_send_mr_after_half_hour = models.BooleanField(default=False)
-    notified_to_send_mr_after_one_day = models.BooleanField(default=False)
-    notified_to_send_mr_after_three_day = models.BooleanField(default=False)
-
     # Lifecycle
     created_at = models.DateTimeField(default=now, editable=False)
     updated_at = models.DateTimeField(default=now, editable=True)
@@ -149,6 +163,25 @@ class GroupV2(models.Model):
     # History
     history = HistoricalRecords()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["is_active", "gender_composition"],
+                name="groupv2_active_gender_idx",
+            ),
+            models.Index(
+                fields=["is_active", "member_avg_height"],
+                name="groupv2_active_height_idx",
+            ),
+            # gps_point already has the default spatial index (spatial_index=True).
+            # Feed only looks up active groups, so keep a smaller one for them.
+            GistIndex(
+                fields=["gps_point"],
+                name="groupv2_active_gps_gist_idx",
+                condition=Q(is_active=True),
+            ),
+        ]
+
     # @property
     # def member_number(self):
     #     if not self.member_number:
@@ -156,11 +189,6 @@ class GroupV2(models.Model):
     #         return manager.count_group_members(self)
     #     return self.member_number
 
-    @property
-    def member_avg_height(self):
-        manager = GroupMember.objects
-        return manager.count_group_members_avg_height(self)
-
     @property
     def member_gender_type(self):
         manager = GroupMember.objects
@@ -200,6 +228,27 @@ class Recent24HrTopGroupAddress(models.Model):
     aggregated_at = models.DateTimeField(default=now, editable=False)
 
 
+class GroupAddressHourlyCount(models.Model):
+    """
+    Number of active groups created/updated in each hour per gps_address.
+    Recent 24hr top addresses = sum of last 24 buckets. Maintained by group.signals
+    """
+
+    bucket = models.DateTimeField(blank=False, null=False)  # truncated to hour
+    gps_address = models.CharField(blank=False, null=False, max_length=250)
+    count = models.IntegerField(default=0)
+
+    objects = GroupAddressHourlyCountManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket", "gps_address"],
+                name="group_address_hourly_count_unique",
+            )
+        ]
+
+
 class ReportedGroupV2(models.Model):
     class ReportGroupStatusChoices(models.TextChoices):
         REPORTED = "REPORTED"
@@ -340,7 +389,7 @@ def upload_to(instance, filename):
 
 
 # TODO(@jin): LEGACY - Should delete GroupProfileImage related models and endpoints
-class GroupProfileImage(OrderedModel):
+class GroupProfileImage(ImageVariantsMixin, OrderedModel):
     group = models.ForeignKey(
         "group.Group",
         blank=True,
@@ -349,28 +398,52 @@ class GroupProfileImage(OrderedModel):
         related_name="group_profile_images",
     )
     image = models.ImageField(upload_to=upload_to)
-    image_blurred = models.ImageField(upload_to=upload_to)
-    thumbnail = models.ImageField(upload_to=upload_to)
-    thumbnail_blurred = models.ImageField(upload_to=upload_to)
+    image_blurred = models.ImageField(upload_to=upload_to, blank=True)
+    thumbnail = models.ImageField(upload_to=upload_to, blank=True)
+    thumbnail_blurred = models.ImageField(upload_to=upload_to, blank=True)
+    # True until variants above are generated from uploaded original (celery)
+    variants_pending = models.BooleanField(default=False)
+    # WebP/AVIF renditions of variants: {field: {format: {width: name}}}
+    renditions = models.JSONField(default=dict, blank=True)
 
     # History
     history = HistoricalRecords()
 
     order_with_respect_to = "group"
 
+    VARIANTS = [
+        Variant("image", "image_4x3", "4x3", IMAGE_MAX_SIZE, widths=IMAGE_WIDTHS),
+        Variant(
+            "image_blurred",
+            "image_4x3_blurred",
+            "4x3",
+            IMAGE_MAX_SIZE,
+            blur_radius=10,
+            widths=IMAGE_WIDTHS,
+        ),
+        Variant(
+            "thumbnail",
+            "thumbnail_1x1",
+            "1x1",
+            THUMBNAIL_MAX_SIZE,
+            widths=THUMBNAIL_WIDTHS,
+        ),
+        Variant(
+            "thumbnail_blurred",
+            "thumbnail_1x1_blurred",
+            "1x1",
+            THUMBNAIL_MAX_SIZE,
+            blur_radius=5,
+            blur_on_output=True,
+            widths=THUMBNAIL_WIDTHS,
+        ),
+    ]
+
     def save(self, *args, **kwargs):
-        image = Image.open(self.image)
-        image = ImageOps.exif_transpose(image)  # fix ios image rotation bug
-
-        # crop
-        image_4x3 = self.crop_by_4x3(image)
-        image_1x1 = self.crop_by_1x1(image)
-
-        # process
-        self.process_image(image_4x3)
-        self.process_image_blurred(image_4x3)
-        self.process_thumbnail(image_1x1)
-        self.process_thumbnail_blurred(image_1x1)
+        if self.image and not self.image._committed:
+            # New upload. Only the original is stored here,
+            # variants are generated by `generate_*_profile_image_variants` task
+            self.reset_variants()
         super(GroupProfileImage, self).save(*args, **kwargs)
 
     def check_file_type(self):
@@ -385,90 +458,3 @@ class GroupProfileImage(OrderedModel):
             return "PNG"
         else:
             return False  # Unrecognized file type
-
-    @staticmethod
-    def crop_by_4x3(image):
-        """
-        We always make sure that height is greater than width
-        """
-        width, height = image.size
-        expected_height = width * (4 / 3)
-        if height > expected_height:
-            offset = int(abs((height - expected_height) / 2))
-            image = image.crop([0, offset, width, height - offset])
-
-        return image
-
-    @staticmethod
-    def crop_by_1x1(image):
-        width, height = image.size
-        if width == height:
-            return image
-        offset = int(abs(height - width) / 2)
-        if width > height:
-            image = image.crop(
-                [offset, 0, width - offset, height]
-            )  # left, upper, right, and lower
-        else:
-            image = image.crop([0, offset, width, height - offset])
-        return image
-
-    def process_image(self, image, filetype: str = "JPEG"):
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.image.save(
-            f"image_4x3.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
-    def process_image_blurred(self, image, filetype: str = "JPEG"):
-        """
-        Blurs image and save
-        :return:
-        """
-        image = image.filter(ImageFilter.BoxBlur(10))
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.image_blurred.save(
-            f"image_4x3_blurred.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
-    def process_thumbnail(self, image, filetype: str = "JPEG"):
-        """
-        Creates thumbnail and blurred_thumbnail.
-        """
-        image.thumbnail((350, 350), Image.Resampling.LANCZOS)
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.thumbnail.save(
-            f"thumbnail_1x1.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
-    def process_thumbnail_blurred(self, image, filetype: str = "JPEG"):
-        image.thumbnail((350, 350), Image.Resampling.LANCZOS)
-        image = image.filter(ImageFilter.BoxBlur(5))
-        # Save thumbnail to in-memory file as StringIO
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.thumbnail_blurred.save(
-            f"thumbnail_1x1_blurred.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
@@ -0,0 +1,177 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from heymatch.apps.group import exclusions
+from heymatch.apps.group.models import (
+    GroupAddressHourlyCount,
+    GroupMember,
+    GroupProfileImage,
+    GroupV2,
+    ReportedGroupV2,
+)
+from heymatch.apps.notification.schedule import (
+    reschedule_meetup_date_notifications,
+    schedule_group_notifications,
+)
+from heymatch.apps.user.models import User
+from heymatch.shared import geocoding
+
+# User fields which affect denormalized group data when changed
+USER_TRACKED_FIELDS = [
+    "gender",
+    "height_cm",
+    "verified_school_name",
+    "verified_company_name",
+    "block_my_school_or_company_users",
+]
+
+
+def _invalidate_member_on_commit(instance) -> None:
+    # Invalidated before commit, a concurrent feed request could cache
+    # exclusions built from not yet committed data (for EXCLUSION_CACHE_TIMEOUT)
+    if instance.user_id:
+        user = instance.user
+        transaction.on_commit(lambda: exclusions.invalidate_member(user))
+
+
+@receiver(post_save, sender=GroupMember)
+def update_group_on_member_save(sender, instance, **kwargs):
+    if instance.group_id:
+        GroupMember.objects.update_member_summary(instance.group_id)
+    _invalidate_member_on_commit(instance)
+
+
+@receiver(post_delete, sender=GroupMember)
+def update_group_on_member_delete(sender, instance, **kwargs):
+    if instance.group_id:
+        GroupMember.objects.update_member_summary(instance.group_id)
+    _invalidate_member_on_commit(instance)
+
+
+@receiver(post_save, sender=ReportedGroupV2)
+def invalidate_exclusion_on_report(sender, instance, **kwargs):
+    if instance.reported_by_id:
+        reported_by_id = instance.reported_by_id
+        transaction.on_commit(
+            lambda: exclusions.invalidate_reported_group_ids(reported_by_id)
+        )
+
+
+def _address_contribution(instance) -> tuple or None:
+    """(gps_address, updated_at) which GroupV2 is counted for in GroupAddressHourlyCount"""
+    values = instance.__dict__
+    if any(field not in values for field in ["is_active", "gps_address", "updated_at"]):
+        return None  # deferred
+    if not values["is_active"] or values["gps_address"] in (
+        geocoding.GPS_ADDRESS_PLACEHOLDERS
+    ):
+        return None
+    return values["gps_address"], values["updated_at"]
+
+
+@receiver(post_init, sender=GroupV2)
+def remember_address_contribution(sender, instance, **kwargs):
+    instance._address_contribution = _address_contribution(instance)
+
+
+@receiver(post_save, sender=GroupV2)
+def update_address_count_on_group_save(sender, instance, created, **kwargs):
+    old = None if created else instance._address_contribution
+    new = _address_contribution(instance)
+    if old == new:
+        return
+    if old:
+        GroupAddressHourlyCount.objects.bump(*old, delta=-1)
+    if new:
+        GroupAddressHourlyCount.objects.bump(*new, delta=1)
+    instance._address_contribution = new
+
+
+@receiver(post_init, sender=GroupV2)
+def remember_meetup_date(sender, instance, **kwargs):
+    instance._loaded_meetup_date = instance.__dict__.get("meetup_date")
+
+
+@receiver(post_save, sender=GroupV2)
+def schedule_notifications_on_group_save(sender, instance, created, **kwargs):
+    if created:
+        schedule_group_notifications(instance)
+    elif (
+        instance._loaded_meetup_date is not None
+        and instance.meetup_date != instance._loaded_meetup_date
+    ):
+        reschedule_meetup_date_notifications(instance)
+    instance._loaded_meetup_date = instance.__dict__.get("meetup_date")
+
+
+@receiver(post_save, sender=GroupProfileImage)
+def schedule_profile_image_variants(sender, instance, **kwargs):
+    if not instance.variants_pending:
+        return
+    from heymatch.apps.celery.tasks import generate_group_profile_image_variants
+
+    transaction.on_commit(
+        lambda: generate_group_profile_image_variants.delay(instance.id)
+    )
+
+
+@receiver(post_init, sender=User)
+def remember_loaded_fields(sender, instance, **kwargs):
+    # Do not access fields directly, some of them may be deferred (not tracked)
+    instance._loaded_fields = {
+        field: instance.__dict__[field]
+        for field in USER_TRACKED_FIELDS
+        if field in instance.__dict__
+    }
+
+
+def _changed_fields(instance, update_fields) -> set:
+    loaded = getattr(instance, "_loaded_fields", {})
+    candidates = USER_TRACKED_FIELDS if update_fields is None else update_fields
+    deferred = instance.get_deferred_fields()
+    changed = {
+        field
+        for field in candidates
+        if field in loaded
+        and field not in deferred
+        and getattr(instance, field) != loaded[field]
+    }
+    for field in changed:
+        loaded[field] = getattr(instance, field)
+    return changed
+
+
+@receiver(post_save, sender=User)
+def update_groups_on_user_change(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return
+    old_values = dict(getattr(instance, "_loaded_fields", {}))
+    changed = _changed_fields(instance, update_fields)
+    if not changed:
+        return
+
+    if changed & {"gender", "height_cm"}:
+        group_ids = (
+            GroupMember.objects.filter(user=instance, is_active=True)
+            .values_list("group_id", flat=True)
+            .distinct()
+        )
+        for group_id in group_ids:
+            if group_id:
+                GroupMember.objects.update_member_summary(group_id)
+
+    if changed - {"gender", "height_cm"}:
+        school_names = [
+            old_values.get("verified_school_name"),
+            instance.verified_school_name,
+        ]
+        company_names = [
+            old_values.get("verified_company_name"),
+            instance.verified_company_name,
+        ]
+        transaction.on_commit(
+            lambda: exclusions.invalidate_affiliation(
+                school_names=school_names, company_names=company_names
+            )
+        )
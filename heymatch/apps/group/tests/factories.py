@@ -1,7 +1,7 @@
 import datetime
 from itertools import combinations
 
-from factory import SubFactory
+from factory import SubFactory, post_generation
 from factory.django import DjangoModelFactory, ImageField
 from factory.faker import Faker
 from factory.fuzzy import FuzzyDate, FuzzyDateTime
@@ -308,6 +308,15 @@ class GroupProfileImageFactory(DjangoModelFactory):
     group = SubFactory(ActiveGroupFactory)
     image = ImageField()
 
+    @post_generation
+    def variants(self, create, extracted, **kwargs):
+        # celery task is enqueued on commit, which never happens in tests
+        if create:
+            from heymatch.apps.celery.tasks import generate_group_profile_image_variants
+
+            generate_group_profile_image_variants(self.id)
+            self.refresh_from_db()
+
 
 # ========================
 #  DEPRECATED
@@ -1,15 +1,25 @@
 import tempfile
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from PIL import Image
 
-from heymatch.apps.group.models import Group, GroupProfileImage
+from heymatch.apps.group.models import (
+    Group,
+    GroupProfileImage,
+    GroupProfilePhotoPurchased,
+)
 from heymatch.apps.hotplace.tests.factories import (
     RANDOM_HOTPLACE_INFO,
     RANDOM_HOTPLACE_NAMES,
 )
-from heymatch.apps.user.models import User
-from heymatch.apps.user.tests.factories import ActiveUserFactory
+from heymatch.apps.user.models import User, UserProfileImage
+from heymatch.apps.user.tests.factories import (
+    ActiveEmployeeFemaleUserFactory,
+    ActiveUserFactory,
+)
 from heymatch.utils.util import generate_rand_geoopt_within_boundary
 
 pytestmark = pytest.mark.django_db
@@ -1144,3 +1154,63 @@ class TestGroupInvitationCodeEndpoints:
         api_client.force_authenticate(user=friend)
         res = api_client.post(self.INVITATION_ENDPOINT)
         assert res.status_code == 201
+
+
+class TestGroupV2FeedEndpoints:
+    FEED_ENDPOINT = "/api/groups/"
+
+    def _count_feed_queries(self, api_client) -> int:
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            res = api_client.get(self.FEED_ENDPOINT)
+        assert res.status_code == 200
+        return len(ctx.captured_queries)
+
+    def test_feed_query_count_does_not_depend_on_page_size(
+        self, api_client, create_male_groups
+    ):
+        viewer = ActiveEmployeeFemaleUserFactory.create()
+        api_client.force_authenticate(user=viewer)
+
+        groups = create_male_groups(2)
+        GroupProfilePhotoPurchased.objects.create(
+            buyer=viewer,
+            seller=groups[0],
+            method=GroupProfilePhotoPurchased.PurchaseMethodChoices.POINT,
+        )
+        num_queries_small_page = self._count_feed_queries(api_client)
+
+        create_male_groups(6)
+        num_queries_large_page = self._count_feed_queries(api_client)
+
+        assert num_queries_small_page == num_queries_large_page
+
+    def test_feed_unlocks_only_purchased_group_images(
+        self, api_client, create_male_groups
+    ):
+        viewer = ActiveEmployeeFemaleUserFactory.create()
+        api_client.force_authenticate(user=viewer)
+        purchased, not_purchased = create_male_groups(2)
+        GroupProfilePhotoPurchased.objects.create(
+            buyer=viewer,
+            seller=purchased,
+            method=GroupProfilePhotoPurchased.PurchaseMethodChoices.POINT,
+        )
+
+        res = api_client.get(self.FEED_ENDPOINT)
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 2
+        for group in res.data["results"]:
+            user = group["group_members"][0]["user"]
+            expected = {
+                obj.order: obj
+                for obj in UserProfileImage.all_objects.filter(user_id=user["id"])
+            }
+            for image in user["user_profile_images"]:
+                obj = expected[image["order"]]
+                if group["id"] == purchased.id:
+                    assert image["image"] == obj.image.url
+                    assert image["thumbnail"] == obj.thumbnail.url
+                else:
+                    assert image["image"] == obj.image_blurred.url
+                    assert image["thumbnail"] == obj.thumbnail_blurred.url
@@ -0,0 +1,94 @@
+import pytest
+from django.core.cache import cache
+
+from heymatch.apps.group.exclusions import _key, get_excluded_group_ids
+from heymatch.apps.group.models import ReportedGroupV2
+from heymatch.apps.group.tests.factories import GroupMemberFactory, GroupV2Factory
+from heymatch.apps.user.tests.factories import (
+    ActiveEmployeeFemaleUserFactory,
+    ActiveEmployeeMaleUserFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_excluded_group_ids_cached_and_invalidated_on_report(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    viewer = ActiveEmployeeMaleUserFactory.create(
+        verified_company_name="헤이매치", block_my_school_or_company_users=False
+    )
+    my_gm = GroupMemberFactory.create(group=GroupV2Factory.create(), user=viewer)
+    other_gm = GroupMemberFactory.create(
+        group=GroupV2Factory.create(), user=ActiveEmployeeFemaleUserFactory.create()
+    )
+
+    assert get_excluded_group_ids(viewer) == {my_gm.group_id}
+    # served from cache
+    with django_assert_num_queries(0):
+        assert get_excluded_group_ids(viewer) == {my_gm.group_id}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ReportedGroupV2.objects.create(
+            reported_group=other_gm.group, reported_by=viewer
+        )
+    assert get_excluded_group_ids(viewer) == {my_gm.group_id, other_gm.group_id}
+
+
+def test_excluded_group_ids_invalidated_only_after_commit(
+    django_capture_on_commit_callbacks,
+):
+    viewer = ActiveEmployeeMaleUserFactory.create()
+    other_gm = GroupMemberFactory.create(
+        group=GroupV2Factory.create(), user=ActiveEmployeeFemaleUserFactory.create()
+    )
+    assert get_excluded_group_ids(viewer) == set()
+    reported_key = _key("reported", viewer.id)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        ReportedGroupV2.objects.create(
+            reported_group=other_gm.group, reported_by=viewer
+        )
+        # not committed yet, concurrent requests still see old exclusions
+        assert cache.get(reported_key) == set()
+    for callback in callbacks:
+        callback()
+    assert cache.get(reported_key) is None
+    assert get_excluded_group_ids(viewer) == {other_gm.group_id}
+
+
+def test_excluded_group_ids_invalidated_on_block_change(
+    django_capture_on_commit_callbacks,
+):
+    viewer = ActiveEmployeeMaleUserFactory.create(
+        verified_company_name="헤이매치", block_my_school_or_company_users=False
+    )
+    colleague = ActiveEmployeeFemaleUserFactory.create(
+        verified_company_name="헤이매치", block_my_school_or_company_users=False
+    )
+    colleague_gm = GroupMemberFactory.create(
+        group=GroupV2Factory.create(), user=colleague
+    )
+    assert colleague_gm.group_id not in get_excluded_group_ids(viewer)
+
+    colleague.block_my_school_or_company_users = True
+    with django_capture_on_commit_callbacks(execute=True):
+        colleague.save(update_fields=["block_my_school_or_company_users"])
+    assert colleague_gm.group_id in get_excluded_group_ids(viewer)
+
+    # new membership of a blocking colleague
+    with django_capture_on_commit_callbacks(execute=True):
+        new_gm = GroupMemberFactory.create(
+            group=GroupV2Factory.create(),
+            user=ActiveEmployeeFemaleUserFactory.create(
+                verified_company_name="헤이매치", block_my_school_or_company_users=True
+            ),
+        )
+    assert new_gm.group_id in get_excluded_group_ids(viewer)
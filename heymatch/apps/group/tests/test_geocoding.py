@@ -0,0 +1,115 @@
+import pytest
+import requests
+from django.contrib.gis.geos import Point
+from django.core.cache import cache
+
+from heymatch.apps.celery.tasks import resolve_group_gps_address
+from heymatch.apps.group.models import GroupAddressHourlyCount
+from heymatch.apps.group.tests.factories import GroupV2Factory
+from heymatch.shared import geocoding
+from heymatch.shared.geocoding import FakeGeoAPI
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_geocoding_cache():
+    cache.clear()
+    geocoding.clear_local_cache()
+    yield
+    geocoding.clear_local_cache()
+
+
+class TestReverseGeocoding:
+    def test_snap_to_grid(self):
+        assert geocoding.snap_to_grid("127.02841", "37.51649") == ("127.028", "37.516")
+        assert geocoding.snap_to_grid(127.0285, 37.5165) == ("127.029", "37.517")
+
+    def test_same_cell_calls_backend_once(self, mocker):
+        spy = mocker.spy(FakeGeoAPI, "reverse_geocode")
+        assert geocoding.reverse_geocode("127.02841", "37.51649") == (
+            FakeGeoAPI.default_address
+        )
+        assert geocoding.reverse_geocode("127.02839", "37.51639") == (
+            FakeGeoAPI.default_address
+        )
+        assert spy.call_count == 1
+
+        # other process: local LRU is empty, but shared cache is hit
+        geocoding.clear_local_cache()
+        assert geocoding.get_cached_address("127.0284", "37.5162") == (
+            FakeGeoAPI.default_address
+        )
+        assert spy.call_count == 1
+
+    def test_resolve_deferred(self, settings, mocker):
+        settings.GEOCODING_DEFERRED = True
+        spy = mocker.spy(FakeGeoAPI, "reverse_geocode")
+        assert (
+            geocoding.resolve_gps_address("127.0284", "37.5165")
+            == geocoding.GPS_ADDRESS_PENDING
+        )
+        assert spy.call_count == 0
+
+    def test_resolve_backend_failure(self, mocker):
+        mocker.patch.object(
+            FakeGeoAPI, "reverse_geocode", side_effect=requests.Timeout()
+        )
+        assert (
+            geocoding.resolve_gps_address("127.0284", "37.5165")
+            == geocoding.GPS_ADDRESS_PENDING
+        )
+
+
+class TestResolveGroupGpsAddressTask:
+    def test_fill_up_pending_address(self):
+        group = GroupV2Factory(
+            gps_point=Point(127.0284, 37.5165),
+            gps_address=geocoding.GPS_ADDRESS_PENDING,
+        )
+        resolve_group_gps_address(group.id)
+        group.refresh_from_db()
+        assert group.gps_address == FakeGeoAPI.default_address
+
+    def test_resolved_address_is_kept(self, mocker):
+        spy = mocker.spy(FakeGeoAPI, "reverse_geocode")
+        group = GroupV2Factory(gps_address="서울특별시 마포구 서교동")
+        resolve_group_gps_address(group.id)
+        group.refresh_from_db()
+        assert group.gps_address == "서울특별시 마포구 서교동"
+        assert spy.call_count == 0
+
+    @pytest.mark.parametrize("error", [LookupError("no results"), ValueError()])
+    def test_no_result_is_not_pending_forever(self, mocker, error):
+        mocker.patch.object(FakeGeoAPI, "reverse_geocode", side_effect=error)
+        group = GroupV2Factory(
+            gps_point=Point(127.0284, 37.5165),
+            gps_address=geocoding.GPS_ADDRESS_PENDING,
+        )
+        resolve_group_gps_address(group.id)
+        group.refresh_from_db()
+        assert group.gps_address == geocoding.GPS_ADDRESS_UNRESOLVED
+        assert not GroupAddressHourlyCount.objects.exists()
+
+    def test_retries_exhausted(self, mocker):
+        mocker.patch.object(
+            FakeGeoAPI, "reverse_geocode", side_effect=requests.Timeout()
+        )
+        group = GroupV2Factory(
+            gps_point=Point(127.0284, 37.5165),
+            gps_address=geocoding.GPS_ADDRESS_PENDING,
+        )
+        with pytest.raises(requests.Timeout):
+            resolve_group_gps_address(group.id)  # retried
+        group.refresh_from_db()
+        assert group.gps_address == geocoding.GPS_ADDRESS_PENDING
+
+        resolve_group_gps_address.push_request(
+            retries=resolve_group_gps_address.max_retries
+        )
+        try:
+            resolve_group_gps_address.run(group.id)  # keeps pushed request
+        finally:
+            resolve_group_gps_address.pop_request()
+        group.refresh_from_db()
+        assert group.gps_address == geocoding.GPS_ADDRESS_UNRESOLVED
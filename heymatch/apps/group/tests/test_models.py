@@ -1,14 +1,202 @@
+from datetime import timedelta
 from typing import List, Sequence
 
 import pytest
+from django.contrib.gis.geos import Point
+from django.db import connection
 from django.db.models import Avg
+from django.utils import timezone
 
-from heymatch.apps.group.models import Group
+from heymatch.apps.group.models import (
+    Group,
+    GroupAddressHourlyCount,
+    GroupMember,
+    GroupV2,
+)
+from heymatch.apps.group.tests.factories import GroupMemberFactory, GroupV2Factory
 from heymatch.apps.user.models import User
+from heymatch.apps.user.tests.factories import (
+    ActiveEmployeeFemaleUserFactory,
+    ActiveEmployeeMaleUserFactory,
+)
+from heymatch.shared import geocoding
+from heymatch.shared.expressions import KNNDistance
 
 pytestmark = pytest.mark.django_db
 
 
+# ----------------------------
+#  [GroupV2] Model Test Codes
+# ----------------------------
+def test_group_v2_gender_composition_follows_members():
+    group = GroupV2Factory.create()
+    male_gm = GroupMemberFactory.create(
+        group=group, user=ActiveEmployeeMaleUserFactory.create()
+    )
+    group.refresh_from_db()
+    assert group.gender_composition == GroupV2.GenderCompositionChoices.MALE_ONLY
+
+    female_gm = GroupMemberFactory.create(
+        group=group, user=ActiveEmployeeFemaleUserFactory.create()
+    )
+    group.refresh_from_db()
+    assert group.gender_composition == GroupV2.GenderCompositionChoices.MIXED
+
+    # deactivated member does not count
+    male_gm.is_active = False
+    male_gm.save(update_fields=["is_active"])
+    group.refresh_from_db()
+    assert group.gender_composition == GroupV2.GenderCompositionChoices.FEMALE_ONLY
+
+    # member's gender changed
+    female_user = female_gm.user
+    female_user.gender = User.GenderChoices.MALE
+    female_user.save(update_fields=["gender"])
+    group.refresh_from_db()
+    assert group.gender_composition == GroupV2.GenderCompositionChoices.MALE_ONLY
+
+    # no active members left
+    GroupMember.objects.filter(id=female_gm.id).delete()
+    male_gm.delete()
+    group.refresh_from_db()
+    assert group.gender_composition is None
+
+
+def test_group_v2_member_avg_height_follows_members():
+    group = GroupV2Factory.create()
+    tall_gm = GroupMemberFactory.create(
+        group=group, user=ActiveEmployeeMaleUserFactory.create(height_cm=185)
+    )
+    group.refresh_from_db()
+    assert group.member_avg_height == 185
+
+    short_gm = GroupMemberFactory.create(
+        group=group, user=ActiveEmployeeMaleUserFactory.create(height_cm=170)
+    )
+    group.refresh_from_db()
+    assert group.member_avg_height == 177  # int(177.5)
+
+    # member's height changed
+    short_user = short_gm.user
+    short_user.height_cm = 175
+    short_user.save()
+    group.refresh_from_db()
+    assert group.member_avg_height == 180
+
+    # deactivated member does not count
+    tall_gm.is_active = False
+    tall_gm.save(update_fields=["is_active"])
+    group.refresh_from_db()
+    assert group.member_avg_height == 175
+    assert GroupV2.objects.filter(member_avg_height__gte=175).exists()
+
+
+def test_user_saved_with_deferred_fields_is_not_changed(
+    mocker, django_capture_on_commit_callbacks
+):
+    gm = GroupMemberFactory.create(
+        user=ActiveEmployeeMaleUserFactory.create(
+            height_cm=180, verified_company_name="헤이매치"
+        )
+    )
+    update_member_summary = mocker.patch.object(
+        GroupMember.objects, "update_member_summary"
+    )
+    invalidate_affiliation = mocker.patch(
+        "heymatch.apps.group.exclusions.invalidate_affiliation"
+    )
+
+    user = User.objects.only("id", "point_balance").get(id=gm.user_id)
+    user.point_balance += 1
+    with django_capture_on_commit_callbacks(execute=True):
+        user.save()
+
+    update_member_summary.assert_not_called()
+    invalidate_affiliation.assert_not_called()
+
+
+def test_group_v2_distance_feed_uses_spatial_index():
+    GroupV2Factory.create_batch(5)
+    point = Point(127.03952, 37.52628, srid=4326)  # 압구정역
+    queryset = (
+        GroupV2.objects.filter(is_active=True, gps_point__dwithin=(point, 5000))
+        .annotate(distance=KNNDistance("gps_point", point))
+        .order_by("distance")[:15]
+    )
+    # Table is tiny in test DB, so force planner not to choose seq scan
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = queryset.explain()
+
+    assert "Seq Scan" not in plan
+    assert "groupv2_active_gps_gist_idx" in plan or "group_groupv2_gps_point_id" in plan
+
+
+def test_group_address_hourly_count_follows_groups():
+    now = timezone.now()
+    group = GroupV2Factory.create(gps_address="서울특별시 강남구 신사동", updated_at=now)
+    GroupV2Factory.create(gps_address="서울특별시 강남구 신사동", updated_at=now)
+    GroupV2Factory.create(gps_address="서울특별시 마포구 서교동", updated_at=now)
+    assert GroupAddressHourlyCount.objects.top_addresses() == {
+        "서울특별시 강남구 신사동": 2,
+        "서울특별시 마포구 서교동": 1,
+    }
+
+    # moved: counted once, at new address
+    group.gps_address = "서울특별시 마포구 서교동"
+    group.updated_at = timezone.now()
+    group.save()
+    assert GroupAddressHourlyCount.objects.top_addresses() == {
+        "서울특별시 마포구 서교동": 2,
+        "서울특별시 강남구 신사동": 1,
+    }
+
+    # deactivated
+    group.is_active = False
+    group.save(update_fields=["is_active"])
+    assert GroupAddressHourlyCount.objects.top_addresses() == {
+        "서울특별시 강남구 신사동": 1,
+        "서울특별시 마포구 서교동": 1,
+    }
+
+
+def test_group_address_hourly_count_rebuild_skips_placeholders():
+    now = timezone.now()
+    GroupV2Factory.create(gps_address="서울특별시 강남구 신사동", updated_at=now)
+    GroupV2Factory.create(gps_address=geocoding.GPS_ADDRESS_PENDING, updated_at=now)
+    GroupV2Factory.create(gps_address=geocoding.GPS_ADDRESS_UNRESOLVED, updated_at=now)
+
+    GroupAddressHourlyCount.objects.rebuild(GroupV2.objects.filter(is_active=True))
+
+    assert GroupAddressHourlyCount.objects.top_addresses() == {"서울특별시 강남구 신사동": 1}
+
+
+def test_group_address_hourly_count_window():
+    now = timezone.now()
+    GroupV2Factory.create(gps_address="서울특별시 강남구 신사동", updated_at=now)
+    GroupAddressHourlyCount.objects.bump(
+        "서울특별시 마포구 서교동", now - timedelta(hours=5), delta=3
+    )
+    assert GroupAddressHourlyCount.objects.top_addresses() == {
+        "서울특별시 마포구 서교동": 3,
+        "서울특별시 강남구 신사동": 1,
+    }
+
+    # 20 hours later: bucket of 5 hours ago is out of window
+    later = now + timedelta(hours=20)
+    assert GroupAddressHourlyCount.objects.top_addresses(now=later) == {
+        "서울특별시 강남구 신사동": 1,
+    }
+    assert GroupAddressHourlyCount.objects.prune(now=later) == 1
+    assert GroupAddressHourlyCount.objects.count() == 1
+
+    # rebuild gives the same result
+    GroupAddressHourlyCount.objects.rebuild(GroupV2.objects.filter(is_active=True))
+    assert GroupAddressHourlyCount.objects.top_addresses() == {
+        "서울특별시 강남구 신사동": 1,
+    }
+
+
 # --------------------------
 #  [Group] Model Test Codes
 # --------------------------
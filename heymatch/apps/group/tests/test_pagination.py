@@ -0,0 +1,73 @@
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from heymatch.apps.group.api.pagination import GroupV2FeedCursorPagination
+from heymatch.apps.group.api.views import GroupV2Filter
+from heymatch.apps.group.models import GroupV2
+from heymatch.apps.group.tests.factories import GroupV2Factory
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+def _walk_pages(query_params: dict) -> list:
+    paginator = GroupV2FeedCursorPagination()
+    paginator.page_size = 2
+    request = Request(factory.get("/api/groups/", query_params))
+    ids = []
+    while True:
+        queryset = GroupV2Filter(
+            data=request.query_params, queryset=GroupV2.objects.all(), request=request
+        ).qs
+        page = paginator.paginate_queryset(queryset, request)
+        ids += [group.id for group in page]
+        next_link = paginator.get_next_link()
+        if not next_link:
+            return ids
+        request = Request(factory.get(next_link))
+
+
+@pytest.mark.parametrize("order_by", ["updated_at", "meetup_date"])
+def test_cursor_pagination_walks_all_groups_once(order_by):
+    GroupV2Factory.create_batch(7)
+    ids = _walk_pages({"pagination": "cursor", "order_by": order_by})
+
+    expected = GroupV2Filter(
+        data={"order_by": order_by}, queryset=GroupV2.objects.all()
+    ).qs
+    assert len(ids) == 7
+    assert len(set(ids)) == 7
+    if order_by == "updated_at":
+        assert ids == list(
+            expected.order_by("-updated_at", "-id").values_list("id", flat=True)
+        )
+
+
+def test_cursor_pagination_has_no_count_by_default(django_assert_num_queries):
+    GroupV2Factory.create_batch(3)
+    paginator = GroupV2FeedCursorPagination()
+    request = Request(factory.get("/api/groups/", {"pagination": "cursor"}))
+    with django_assert_num_queries(1):
+        paginator.paginate_queryset(GroupV2.objects.all(), request)
+    assert "count" not in paginator.get_paginated_response([]).data
+
+
+def test_cursor_pagination_rejects_cursor_of_other_ordering():
+    GroupV2Factory.create_batch(3)
+    paginator = GroupV2FeedCursorPagination()
+    paginator.page_size = 1
+    request = Request(factory.get("/api/groups/", {"order_by": "updated_at"}))
+    paginator.paginate_queryset(GroupV2.objects.all(), request)
+    cursor = paginator.encode_cursor(paginator.next_position)
+
+    queryset = GroupV2Filter(
+        data={"order_by": "meetup_date"}, queryset=GroupV2.objects.all()
+    ).qs
+    request = Request(
+        factory.get("/api/groups/", {"order_by": "meetup_date", "cursor": cursor})
+    )
+    with pytest.raises(NotFound):
+        paginator.paginate_queryset(queryset, request)
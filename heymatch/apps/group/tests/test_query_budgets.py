@@ -0,0 +1,38 @@
+import pytest
+from django.core.cache import cache
+
+from heymatch.apps.group.models import GroupProfilePhotoPurchased
+from heymatch.apps.user.tests.factories import ActiveEmployeeFemaleUserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestGroupV2QueryBudgets:
+    def test_feed_list(self, api_client, query_stats, query_budget, create_male_groups):
+        viewer = ActiveEmployeeFemaleUserFactory.create()
+        api_client.force_authenticate(user=viewer)
+        groups = create_male_groups(3)
+        GroupProfilePhotoPurchased.objects.create(
+            buyer=viewer,
+            seller=groups[0],
+            method=GroupProfilePhotoPurchased.PurchaseMethodChoices.POINT,
+        )
+
+        cache.clear()  # cold exclusion cache
+        with query_stats:
+            res = api_client.get("/api/groups/")
+        assert res.status_code == 200
+        assert len(res.data["results"]) == 3
+        query_budget("group_feed_list", query_stats)
+
+    def test_detail_retrieve(
+        self, api_client, query_stats, query_budget, create_male_groups
+    ):
+        viewer = ActiveEmployeeFemaleUserFactory.create()
+        api_client.force_authenticate(user=viewer)
+        (group,) = create_male_groups(1)
+
+        with query_stats:
+            res = api_client.get(f"/api/groups/{group.id}/")
+        assert res.status_code == 200
+        query_budget("group_detail_retrieve", query_stats)
@@ -0,0 +1,77 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from heymatch.apps.group.api.serializers import (
+    V2GroupLimitedFieldFastSerializer,
+    V2GroupLimitedFieldSerializer,
+)
+from heymatch.apps.group.models import GroupV2
+from heymatch.apps.group.tests.factories import GroupMemberFactory, GroupV2Factory
+from heymatch.apps.user.models import User
+from heymatch.apps.user.tests.factories import (
+    ActiveCollegeMaleUserFactory,
+    ActiveEmployeeMaleUserFactory,
+    UserProfileImageFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def feed_groups():
+    groups = GroupV2Factory.create_batch(
+        3,
+        about_our_group_tags=["A_LOT_OF_CUTENESS", "WE_ARE_HUMOROUS"],
+        meeting_we_want_tags=["WE_LIKE_WINE", "NOT_EXISTING_TAG"],
+    )
+    users = [
+        ActiveEmployeeMaleUserFactory.create(hide_my_school_or_company_name=True),
+        ActiveCollegeMaleUserFactory.create(hide_my_school_or_company_name=True),
+        ActiveEmployeeMaleUserFactory.create(birthdate=None),
+        ActiveCollegeMaleUserFactory.create(),
+    ]
+    for user in users:
+        UserProfileImageFactory.create_batch(2, user=user)
+    GroupMemberFactory.create(group=groups[0], user=users[0], is_user_leader=True)
+    GroupMemberFactory.create(group=groups[0], user=users[1])
+    GroupMemberFactory.create(group=groups[1], user=users[2], is_user_leader=True)
+    GroupMemberFactory.create(group=groups[2], user=users[3], is_user_leader=True)
+    return groups
+
+
+@pytest.mark.parametrize("case", ["blurred", "force_original_image", "purchased"])
+def test_fast_feed_serializer_output_is_identical(feed_groups, case):
+    context = {}
+    if case == "force_original_image":
+        context = {"force_original_image": True}
+    if case == "purchased":
+        context = {"user_purchased_group_profile_ids": [feed_groups[0].id]}
+    queryset = (
+        GroupV2.objects.filter(id__in=[group.id for group in feed_groups])
+        .order_by("id")
+        .prefetch_related(
+            "group_member_group",
+            "group_member_group__user",
+            "group_member_group__user__user_profile_images",
+        )
+    )
+    expected = V2GroupLimitedFieldSerializer(
+        queryset, many=True, context=dict(context)
+    ).data
+    result = V2GroupLimitedFieldFastSerializer(
+        queryset.prefetch_related(None), context=dict(context)
+    ).data
+
+    assert JSONRenderer().render(result) == JSONRenderer().render(expected)
+
+
+def test_fast_feed_serializer_hides_school_or_company_name(feed_groups):
+    result = V2GroupLimitedFieldFastSerializer(
+        GroupV2.objects.filter(id=feed_groups[0].id)
+    ).data
+    users = {
+        member["user"]["job_title"]: member["user"]
+        for member in result[0]["group_members"]
+    }
+    assert users[User.JobChoices.EMPLOYEE]["verified_company_name"] == "직장인"
+    assert users[User.JobChoices.COLLEGE_STUDENT]["verified_school_name"] == "대학생"
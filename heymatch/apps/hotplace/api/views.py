@@ -1,6 +1,5 @@
 from typing import Any
 
-import geopy.distance
 from django.db.models.query import QuerySet
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
@@ -10,6 +9,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from heymatch.apps.group.models import Group
+from heymatch.apps.hotplace.index import get_hotplace_index
 from heymatch.apps.hotplace.models import HotPlace
 
 from .serializers import (
@@ -50,30 +50,13 @@ class HotPlaceNearestViewSet(viewsets.ViewSet):
 
     @swagger_auto_schema(request_body=HotPlaceNearestBodySerializer)
     def nearest(self, request) -> Response:
-        queryset = HotPlace.active_objects.all()
-        hotplace = self.get_nearest_hotplace(
-            request.data["lat"], request.data["long"], hotplace_qs=queryset
-        )
+        hotplace = self.get_nearest_hotplace(request.data["lat"], request.data["long"])
         serializer = HotPlaceDetailSerializer(hotplace)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     @staticmethod
-    def get_nearest_hotplace(lat: str, long: str, hotplace_qs) -> HotPlace or None:
-        nearest_hotplace = None
-        nearest_meter = None
-        for hp in hotplace_qs:
-            hp_lat_lon = hp.zone_center_geoinfo
-            dist_meter = geopy.distance.geodesic(
-                (hp_lat_lon.lat, hp_lat_lon.lon), (lat, long)
-            ).m
-            if not nearest_hotplace:
-                nearest_hotplace = hp
-                nearest_meter = dist_meter
-                continue
-            if dist_meter < nearest_meter:
-                nearest_hotplace = hp
-                nearest_meter = dist_meter
-        return nearest_hotplace
+    def get_nearest_hotplace(lat: str, long: str) -> HotPlace or None:
+        return get_hotplace_index().nearest(lat, long)
 
 
 class HotPlaceActiveGroupViewSet(viewsets.ModelViewSet):
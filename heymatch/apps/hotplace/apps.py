@@ -5,3 +5,9 @@ from django.utils.translation import gettext_lazy as _
 class HotplaceAppConfig(AppConfig):
     name = "heymatch.apps.hotplace"
     verbose_name = _("Hotplace App")
+
+    def ready(self):
+        try:
+            import heymatch.apps.hotplace.signals  # noqa F401
+        except ImportError:
+            pass
@@ -0,0 +1,144 @@
+"""
+Process-wide spatial index of active HotPlaces.
+
+    - zone containment: STRtree of zone polygons + prepared polygon contains check
+    - nearest hotplace: STRtree nearest of zone centers, re-ranked by geodesic distance
+
+Built lazily on first use. Invalidated by HotPlace post_save/post_delete (see signals.py)
+through a version number in django cache, so every worker process rebuilds as well.
+"""
+import math
+import threading
+
+from django.core.cache import cache
+from geopy.distance import geodesic
+from shapely.geometry import Point, Polygon
+from shapely.prepared import prep
+from shapely.strtree import STRtree
+
+from .models import HotPlace
+
+INDEX_VERSION_CACHE_KEY = "hotplace_index:version"
+# equirectangular vs geodesic error at city scale, on top of projection distortion
+NEAREST_SLACK = 0.01
+
+
+class HotPlaceIndex:
+    def __init__(self, hotplaces):
+        self.zone_hotplaces = []
+        self.zone_polygons = []
+        self.center_hotplaces = []
+        self.center_latlons = []
+        for hp in hotplaces:
+            # same (lat, lon) order as `is_geopt_within_boundary`
+            boundary = [
+                (geopt.lat, geopt.lon) for geopt in hp.zone_boundary_geoinfos or []
+            ]
+            if len(boundary) >= 3:
+                self.zone_hotplaces.append(hp)
+                self.zone_polygons.append(Polygon(boundary))
+            if hp.zone_center_geoinfo:
+                center = hp.zone_center_geoinfo
+                self.center_hotplaces.append(hp)
+                self.center_latlons.append((float(center.lat), float(center.lon)))
+
+        # single reference latitude for every point, so that projected distances
+        # are comparable to each other (see `nearest`)
+        lats = [lat for lat, _ in self.center_latlons] or [0.0]
+        self.lat_min, self.lat_max = min(lats), max(lats)
+        self.cos_ref = math.cos(math.radians((self.lat_min + self.lat_max) / 2))
+        self.center_points = [
+            self._project(lat, lon) for lat, lon in self.center_latlons
+        ]
+
+        self.prepared_zones = [prep(polygon) for polygon in self.zone_polygons]
+        self.zone_tree = STRtree(self.zone_polygons) if self.zone_polygons else None
+        self.center_tree = STRtree(self.center_points) if self.center_points else None
+        # shapely<2.0 returns geometries instead of indices
+        self._zone_idx = {id(g): i for i, g in enumerate(self.zone_polygons)}
+        self._center_idx = {id(g): i for i, g in enumerate(self.center_points)}
+
+    def _project(self, lat, lon) -> Point:
+        # equirectangular projection at reference latitude `cos_ref`
+        return Point(float(lat), float(lon) * self.cos_ref)
+
+    def _distortion(self, lat) -> float:
+        """
+        Bound of (projected / true distance) ratio between two points, over the
+        latitude range of centers and `lat`. Longitude gaps are scaled by cos_ref
+        instead of cos of their own latitude.
+        """
+        ratios = [
+            self.cos_ref / math.cos(math.radians(extreme))
+            for extreme in (min(self.lat_min, lat), max(self.lat_max, lat))
+        ]
+        return max(1.0, *ratios) / min(1.0, *ratios)
+
+    @staticmethod
+    def _to_index(hit, idx_by_id) -> int:
+        if hasattr(hit, "__index__"):
+            return int(hit)
+        return idx_by_id[id(hit)]
+
+    def find_containing(self, geopt) -> HotPlace or None:
+        if self.zone_tree is None:
+            return None
+        pnt = Point(geopt.lat, geopt.lon)
+        candidates = sorted(
+            self._to_index(hit, self._zone_idx) for hit in self.zone_tree.query(pnt)
+        )
+        for idx in candidates:
+            if self.prepared_zones[idx].contains(pnt):
+                return self.zone_hotplaces[idx]
+        return None
+
+    def nearest(self, lat, long) -> HotPlace or None:
+        """
+        Nearest center in projected space is only a candidate. Every center which
+        could be nearer (within projection distortion) is re-ranked by geodesic distance.
+        """
+        if self.center_tree is None:
+            return None
+        lat, long = float(lat), float(long)
+        query = self._project(lat, long)
+        hit = self._to_index(self.center_tree.nearest(query), self._center_idx)
+        radius = query.distance(self.center_points[hit]) * (
+            self._distortion(lat) + NEAREST_SLACK
+        )
+        candidates = {hit} | {
+            self._to_index(other, self._center_idx)
+            for other in self.center_tree.query(query.buffer(radius))
+        }
+        nearest = min(
+            candidates,
+            key=lambda idx: (
+                geodesic((lat, long), self.center_latlons[idx]).m,
+                idx,
+            ),
+        )
+        return self.center_hotplaces[nearest]
+
+
+_lock = threading.Lock()
+_index = None
+_index_version = None
+
+
+def get_hotplace_index() -> HotPlaceIndex:
+    global _index, _index_version
+    version = cache.get(INDEX_VERSION_CACHE_KEY, 0)
+    if _index is None or _index_version != version:
+        with _lock:
+            if _index is None or _index_version != version:
+                _index = HotPlaceIndex(HotPlace.active_objects.order_by("id"))
+                _index_version = version
+    return _index
+
+
+def invalidate_hotplace_index():
+    global _index
+    _index = None
+    try:
+        cache.incr(INDEX_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_CACHE_KEY, 1, timeout=None)
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from heymatch.apps.hotplace.index import invalidate_hotplace_index
+from heymatch.apps.hotplace.models import HotPlace
+
+
+@receiver(post_save, sender=HotPlace)
+@receiver(post_delete, sender=HotPlace)
+def invalidate_index_on_hotplace_change(sender, instance, **kwargs):
+    invalidate_hotplace_index()
@@ -0,0 +1,75 @@
+from typing import Sequence
+
+import geopy.distance
+import pytest
+from django.core.cache import cache
+from django_google_maps.fields import GeoPt
+
+from heymatch.apps.hotplace.index import get_hotplace_index, invalidate_hotplace_index
+from heymatch.apps.hotplace.models import HotPlace
+from heymatch.apps.hotplace.tests.factories import HotPlaceFactory
+from heymatch.utils.util import (
+    generate_rand_geoopt_within_boundary,
+    is_geopt_within_boundary,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    # index lives across tests, while rows are rolled back without signals
+    cache.clear()
+    invalidate_hotplace_index()
+
+
+class TestHotPlaceIndex:
+    def test_find_containing(self, hotplaces: Sequence[HotPlace]):
+        index = get_hotplace_index()
+        for hp in hotplaces:
+            geopt = generate_rand_geoopt_within_boundary(hp.zone_boundary_geoinfos)
+            assert is_geopt_within_boundary(geopt, hp.zone_boundary_geoinfos)
+            assert index.find_containing(geopt).id == hp.id
+        assert index.find_containing(GeoPt(35.1, 129.0)) is None
+
+    def test_nearest_same_as_geodesic(self, hotplaces: Sequence[HotPlace]):
+        index = get_hotplace_index()
+        for lat, long in [(37.5262, 127.0395), (37.5665, 126.9780), (37.55, 126.92)]:
+            expected = min(
+                hotplaces,
+                key=lambda hp: geopy.distance.geodesic(
+                    (hp.zone_center_geoinfo.lat, hp.zone_center_geoinfo.lon),
+                    (lat, long),
+                ).m,
+            )
+            assert index.nearest(str(lat), str(long)).id == expected.id
+
+    def test_nearest_when_projection_ranks_differently(self):
+        # Scaling each point by cos of its own latitude would pick `east` (1.76km)
+        north = HotPlaceFactory(name="north", zone_center_geoinfo=GeoPt(37.51, 127.0))
+        east = HotPlaceFactory(name="east", zone_center_geoinfo=GeoPt(37.5, 127.02))
+        query = (37.5, 127.0)
+        assert geopy.distance.geodesic(query, (37.51, 127.0)).m < 1200
+        assert geopy.distance.geodesic(query, (37.5, 127.02)).m > 1700
+
+        index = get_hotplace_index()
+        assert index.nearest("37.5", "127.0").id == north.id
+        assert index.nearest("37.5", "127.018").id == east.id
+
+    def test_invalidated_on_hotplace_change(self, hotplaces: Sequence[HotPlace]):
+        hp = hotplaces[0]
+        geopt = generate_rand_geoopt_within_boundary(hp.zone_boundary_geoinfos)
+        assert get_hotplace_index().find_containing(geopt).id == hp.id
+
+        hp.is_active = False
+        hp.save()
+        assert get_hotplace_index().find_containing(geopt) is None
+
+        hp.is_active = True
+        hp.save()
+        assert get_hotplace_index().find_containing(geopt).id == hp.id
+
+    def test_empty(self):
+        index = get_hotplace_index()
+        assert index.find_containing(GeoPt(37.5, 127.0)) is None
+        assert index.nearest("37.5", "127.0") is None
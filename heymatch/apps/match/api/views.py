@@ -14,6 +14,7 @@ from rest_framework.response import Response
 from heymatch.apps.chat.models import StreamChannel
 from heymatch.apps.group.models import GroupMember, GroupProfilePhotoPurchased, GroupV2
 from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.notification.outbox import enqueue_push_notification
 from heymatch.apps.payment.models import UserPointConsumptionHistory
 from heymatch.shared.exceptions import (
     MatchRequestAlreadySubmittedException,
@@ -31,7 +32,6 @@ from .serializers import (
 )
 
 stream = settings.STREAM_CLIENT
-onesignal_client = settings.ONE_SIGNAL_CLIENT
 
 logger = logging.getLogger(__name__)
 
@@ -170,7 +170,7 @@ class MatchRequestViewSet(viewsets.ModelViewSet):
                 user__is_active=True, group_id__in=[to_group_id]
             ).values_list("user_id", flat=True)
         ]
-        res = onesignal_client.send_notification_to_specific_users(
+        enqueue_push_notification(
             title="매칭 요청이 왔어요!",
             content=f"[{from_group.title}] 그룹으로부터 매칭요청을 받았어요! 수락하면 바로 채팅할 수 있어요 😀",
             user_ids=to_group_user_ids,
@@ -181,7 +181,6 @@ class MatchRequestViewSet(viewsets.ModelViewSet):
                 },
             },
         )
-        logger.debug(f"OneSignal response for Match request: {res}")
 
         serializer = ReceivedMatchRequestSerializer(
             instance=mr, context={"force_original_image": True}
@@ -279,7 +278,7 @@ class MatchRequestViewSet(viewsets.ModelViewSet):
             )
         # Send push notification
         if send_push_notification:
-            res = onesignal_client.send_notification_to_specific_users(
+            enqueue_push_notification(
                 title="매칭 성공!!",
                 content=f"[{receiver_group.title}] 그룹이 매칭요청을 수락했어요!! 지금 바로 메세지를 보내봐요 🎉",
                 user_ids=sender_user_ids,
@@ -290,7 +289,6 @@ class MatchRequestViewSet(viewsets.ModelViewSet):
                     },
                 },
             )
-            logger.debug(f"OneSignal response for Match Success: {res}")
         return {
             "stream_chat_id": stream_channel_id,
             "stream_chat_cid": stream_channel_cid,
@@ -320,7 +318,7 @@ class MatchRequestViewSet(viewsets.ModelViewSet):
             for user_id in sender_group_member_qs.values_list("user_id", flat=True)
         ]
         # Send push notification
-        res = onesignal_client.send_notification_to_specific_users(
+        enqueue_push_notification(
             title="아쉬워요..",
             content=f"[{receiver_group.title}] 그룹이 매칭요청을 거절했어요..😥 다른 그룹을 찾아봐요!",
             user_ids=sender_user_ids,
@@ -331,7 +329,6 @@ class MatchRequestViewSet(viewsets.ModelViewSet):
                 },
             },
         )
-        logger.debug(f"OneSignal response for Match deny: {res}")
         return Response(status=status.HTTP_200_OK)
 
     @swagger_auto_schema(request_body=no_body)
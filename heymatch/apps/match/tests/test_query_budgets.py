@@ -0,0 +1,38 @@
+import pytest
+
+from heymatch.apps.group.tests.factories import GroupMemberFactory
+from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.user.tests.factories import (
+    ActiveEmployeeFemaleUserFactory,
+    ActiveEmployeeMaleUserFactory,
+    UserProfileImageFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_group(user_factory):
+    user = user_factory.create()
+    UserProfileImageFactory.create_batch(2, user=user)
+    return GroupMemberFactory.create(user=user).group, user
+
+
+class TestMatchRequestQueryBudgets:
+    def test_match_request_list(self, api_client, query_stats, query_budget):
+        my_group, viewer = _create_group(ActiveEmployeeMaleUserFactory)
+        api_client.force_authenticate(user=viewer)
+
+        other_group, _ = _create_group(ActiveEmployeeFemaleUserFactory)
+        MatchRequest.objects.create(sender_group=my_group, receiver_group=other_group)
+        for _ in range(2):
+            other_group, _ = _create_group(ActiveEmployeeFemaleUserFactory)
+            MatchRequest.objects.create(
+                sender_group=other_group, receiver_group=my_group
+            )
+
+        with query_stats:
+            res = api_client.get("/api/match-requests/")
+        assert res.status_code == 200
+        assert len(res.data["sent"]) == 1
+        assert len(res.data["received"]) == 2
+        query_budget("match_request_list", query_stats)
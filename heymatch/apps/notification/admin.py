@@ -0,0 +1,37 @@
+from django.contrib import admin
+
+from .models import PushNotification, ScheduledNotification
+
+
+@admin.register(PushNotification)
+class PushNotificationAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "title",
+        "content",
+        "created_at",
+        "sent_at",
+    ]
+    search_fields = [
+        "title",
+        "content",
+    ]
+
+
+@admin.register(ScheduledNotification)
+class ScheduledNotificationAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "subject",
+        "kind",
+        "due_at",
+        "expires_at",
+        "sent_at",
+        "created_at",
+    ]
+    list_filter = [
+        "kind",
+    ]
+    search_fields = [
+        "subject",
+    ]
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class NotificationAppConfig(AppConfig):
+    name = "heymatch.apps.notification"
+    verbose_name = _("Notification App")
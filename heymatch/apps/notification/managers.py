@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from django.db import models
+
+
+class ScheduledNotificationManager(models.Manager):
+    def schedule(self, kind: str, entries: list) -> None:
+        """
+        entries: [(subject, due_at, expires_at), ...]
+        Already scheduled (or sent) ones are kept as is.
+        """
+        self.bulk_create(
+            [
+                self.model(
+                    subject=str(subject),
+                    kind=kind,
+                    due_at=due_at,
+                    expires_at=expires_at,
+                )
+                for subject, due_at, expires_at in entries
+            ],
+            ignore_conflicts=True,
+        )
+
+    def reschedule(
+        self, kind: str, subject, due_at: datetime, expires_at: datetime or None
+    ) -> None:
+        """Move not yet sent notification. Sent ones are never sent again."""
+        updated = self.filter(
+            subject=str(subject), kind=kind, sent_at__isnull=True
+        ).update(due_at=due_at, expires_at=expires_at)
+        if not updated:
+            self.schedule(kind, [(subject, due_at, expires_at)])
+
+    def claim_due(self, now: datetime, batch_size: int) -> list:
+        """Lock due notifications. Rows locked by other dispatchers are skipped."""
+        return list(
+            self.select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True, due_at__lte=now)
+            .order_by("due_at")[:batch_size]
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.13 on 2023-12-12 03:12
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PushNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('content', models.TextField()),
+                ('data', models.JSONField(blank=True, default=None, null=True)),
+                ('user_ids', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=64), default=list, size=None)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, default=None, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='pushnotification',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='pushnotification_pending_idx'),
+        ),
+    ]
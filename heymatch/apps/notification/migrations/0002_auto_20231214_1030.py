@@ -0,0 +1,99 @@
+# Generated by Django 3.2.13 on 2023-12-14 01:30
+
+import datetime
+
+from django.db import migrations, models
+import django.utils.timezone
+
+FIRST_GROUP_SERIES = [
+    ('first_group_after_10min', 'notified_to_make_first_group_after_join_10min', datetime.timedelta(minutes=10)),
+    ('first_group_after_1hr', 'notified_to_make_first_group_after_join_1hr', datetime.timedelta(hours=1)),
+    ('first_group_after_1day', 'notified_to_make_first_group_after_join_1day', datetime.timedelta(days=1)),
+]
+SEND_MR_SERIES = [
+    ('send_mr_after_30min', 'notified_to_send_mr_after_half_hour', datetime.timedelta(minutes=30)),
+    ('send_mr_after_1day', 'notified_to_send_mr_after_one_day', datetime.timedelta(days=1)),
+    ('send_mr_after_3day', 'notified_to_send_mr_after_three_day', datetime.timedelta(days=3)),
+]
+UPDATE_MEETUP_DATE_SERIES = [
+    ('update_meetup_date_after_1day', 'notified_to_update_meetup_date_after_one_day', datetime.timedelta(days=1)),
+    ('update_meetup_date_after_3day', 'notified_to_update_meetup_date_after_three_day', datetime.timedelta(days=3)),
+    ('update_meetup_date_after_1week', 'notified_to_update_meetup_date_after_one_week', datetime.timedelta(days=7)),
+    ('update_meetup_date_after_2week', 'notified_to_update_meetup_date_after_two_week', datetime.timedelta(days=14)),
+]
+
+
+def _pending(obj, series, start, now):
+    # already notified flags become sent rows, so they are never scheduled again
+    for idx, (kind, flag, delay) in enumerate(series):
+        expires_at = start + series[idx + 1][2] if idx + 1 < len(series) else None
+        if getattr(obj, flag):
+            yield kind, start + delay, expires_at, now
+        elif not (expires_at and expires_at <= now):
+            yield kind, start + delay, expires_at, None
+
+
+def schedule_not_yet_notified(apps, schema_editor):
+    ScheduledNotification = apps.get_model('notification', 'ScheduledNotification')
+    User = apps.get_model('user', 'User')
+    UserOnBoarding = apps.get_model('user', 'UserOnBoarding')
+    GroupV2 = apps.get_model('group', 'GroupV2')
+    GroupMember = apps.get_model('group', 'GroupMember')
+    MatchRequest = apps.get_model('match', 'MatchRequest')
+
+    now = django.utils.timezone.now()
+    rows = []
+    users = User.objects.filter(
+        id__in=UserOnBoarding.objects.filter(onboarding_completed=True).values('user_id')
+    ).exclude(id__in=GroupMember.objects.values('user_id'))
+    for user in users.iterator():
+        for kind, due_at, expires_at, sent_at in _pending(user, FIRST_GROUP_SERIES, user.created_at, now):
+            rows.append(ScheduledNotification(subject=str(user.id), kind=kind, due_at=due_at, expires_at=expires_at, sent_at=sent_at))
+
+    mr_sent_group_ids = set(MatchRequest.objects.values_list('sender_group_id', flat=True))
+    for group in GroupV2.objects.filter(is_active=True).iterator():
+        series = []
+        if group.id not in mr_sent_group_ids:
+            series.extend(_pending(group, SEND_MR_SERIES, group.created_at, now))
+        meetup_start = django.utils.timezone.make_aware(
+            datetime.datetime.combine(group.meetup_date, datetime.time(hour=22))
+        )
+        series.extend(_pending(group, UPDATE_MEETUP_DATE_SERIES, meetup_start, now))
+        for kind, due_at, expires_at, sent_at in series:
+            rows.append(ScheduledNotification(subject=str(group.id), kind=kind, due_at=due_at, expires_at=expires_at, sent_at=sent_at))
+
+    ScheduledNotification.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0001_initial'),
+        ('group', '0018_auto_20231209_1620'),
+        ('match', '0002_initial'),
+        ('user', '0009_auto_20231213_1130'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('first_group_after_10min', 'First Group After 10Min'), ('first_group_after_1hr', 'First Group After 1Hr'), ('first_group_after_1day', 'First Group After 1Day'), ('update_meetup_date_after_1day', 'Update Meetup Date After 1Day'), ('update_meetup_date_after_3day', 'Update Meetup Date After 3Day'), ('update_meetup_date_after_1week', 'Update Meetup Date After 1Week'), ('update_meetup_date_after_2week', 'Update Meetup Date After 2Week'), ('send_mr_after_30min', 'Send Mr After 30Min'), ('send_mr_after_1day', 'Send Mr After 1Day'), ('send_mr_after_3day', 'Send Mr After 3Day')], max_length=32)),
+                ('due_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(blank=True, default=None, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, default=None, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='schedulednotification',
+            constraint=models.UniqueConstraint(fields=('subject', 'kind'), name='scheduled_notification_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='schedulednotification',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['due_at'], name='scheduled_notification_due_idx'),
+        ),
+        migrations.RunPython(schedule_not_yet_notified, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.13 on 2023-12-19 02:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0002_auto_20231214_1030'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pushnotification',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='pushnotification',
+            name='coalesce_id',
+            field=models.BigIntegerField(blank=True, default=None, null=True),
+        ),
+    ]
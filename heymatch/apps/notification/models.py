@@ -0,0 +1,86 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .managers import ScheduledNotificationManager
+
+
+class PushNotification(models.Model):
+    """
+    Outbox of OneSignal push notifications.
+    Written in the same transaction as the business logic, delivered by
+    `flush_push_notification_outbox` task. See outbox.py
+    """
+
+    title = models.CharField(blank=False, null=False, max_length=255)
+    content = models.TextField(blank=False, null=False)
+    data = models.JSONField(blank=True, null=True, default=None)
+    user_ids = ArrayField(models.CharField(max_length=64), default=list)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    # set by `flush_outbox` when claimed, claim expires after PUSH_NOTIFICATION_CLAIM_TIMEOUT
+    claimed_at = models.DateTimeField(blank=True, null=True, default=None)
+    # id of the first row coalesced with, kept across claims (idempotency key)
+    coalesce_id = models.BigIntegerField(blank=True, null=True, default=None)
+    sent_at = models.DateTimeField(blank=True, null=True, default=None)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="pushnotification_pending_idx",
+                condition=Q(sent_at__isnull=True),
+            ),
+        ]
+
+
+class ScheduledNotification(models.Model):
+    """
+    Time-based push notification of a User or GroupV2 (`subject`).
+    Written when subject is created/updated, dispatched by
+    `dispatch_scheduled_notifications` task once `due_at` has passed. See schedule.py
+    """
+
+    class KindChoices(models.TextChoices):
+        # subject: User
+        FIRST_GROUP_AFTER_10MIN = "first_group_after_10min"
+        FIRST_GROUP_AFTER_1HR = "first_group_after_1hr"
+        FIRST_GROUP_AFTER_1DAY = "first_group_after_1day"
+        # subject: GroupV2
+        UPDATE_MEETUP_DATE_AFTER_1DAY = "update_meetup_date_after_1day"
+        UPDATE_MEETUP_DATE_AFTER_3DAY = "update_meetup_date_after_3day"
+        UPDATE_MEETUP_DATE_AFTER_1WEEK = "update_meetup_date_after_1week"
+        UPDATE_MEETUP_DATE_AFTER_2WEEK = "update_meetup_date_after_2week"
+        SEND_MR_AFTER_30MIN = "send_mr_after_30min"
+        SEND_MR_AFTER_1DAY = "send_mr_after_1day"
+        SEND_MR_AFTER_3DAY = "send_mr_after_3day"
+
+    subject = models.CharField(blank=False, null=False, max_length=64)
+    kind = models.CharField(
+        blank=False, null=False, choices=KindChoices.choices, max_length=32
+    )
+    due_at = models.DateTimeField(blank=False, null=False)
+    expires_at = models.DateTimeField(
+        blank=True, null=True, default=None
+    )  # skipped (not sent) when dispatched after this
+    sent_at = models.DateTimeField(blank=True, null=True, default=None)
+
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = ScheduledNotificationManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subject", "kind"],
+                name="scheduled_notification_unique",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["due_at"],
+                name="scheduled_notification_due_idx",
+                condition=Q(sent_at__isnull=True),
+            ),
+        ]
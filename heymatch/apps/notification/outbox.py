@@ -0,0 +1,132 @@
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import PushNotification
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SCHEDULED_CACHE_KEY = "push_notification_outbox:flush_scheduled"
+
+
+def enqueue_push_notification(
+    title: str,
+    content: str,
+    user_ids: List[str],
+    data: dict or None = None,
+) -> PushNotification or None:
+    """
+    Same interface as `OneSignalClient.send_notification_to_specific_users`,
+    but only writes to outbox. Delivered by celery after the transaction is committed.
+    """
+    if not user_ids:
+        return None
+    notification = PushNotification.objects.create(
+        title=title,
+        content=content,
+        data=data,
+        user_ids=[str(user_id) for user_id in user_ids],
+    )
+    transaction.on_commit(schedule_flush)
+    return notification
+
+
+def schedule_flush():
+    """Bursts within PUSH_NOTIFICATION_COALESCE_SECONDS are flushed by one task"""
+    countdown = settings.PUSH_NOTIFICATION_COALESCE_SECONDS
+    if not cache.add(FLUSH_SCHEDULED_CACHE_KEY, 1, timeout=countdown):
+        return
+    from heymatch.apps.celery.tasks import flush_push_notification_outbox
+
+    flush_push_notification_outbox.apply_async(countdown=countdown)
+
+
+def _idempotency_key(coalesce_id: int, chunk_idx: int) -> str:
+    # same rows -> same key, so retried sends are not delivered twice
+    name = f"heymatch-push:{coalesce_id}:{chunk_idx}"
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
+def _claim(batch_size: int) -> list:
+    """
+    Claim pending notifications in a short transaction. Rows which are not claimed
+    before are coalesced by identical (title, content, data), `coalesce_id` is the
+    id of the first row. Rows claimed again (e.g. worker killed) keep theirs.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        pending = list(
+            PushNotification.objects.select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True)
+            .filter(
+                Q(claimed_at__isnull=True)
+                | Q(claimed_at__lt=now - settings.PUSH_NOTIFICATION_CLAIM_TIMEOUT)
+            )
+            .order_by("id")[:batch_size]
+        )
+        heads = {}
+        for notification in pending:
+            if notification.coalesce_id is None:
+                key = (
+                    notification.title,
+                    notification.content,
+                    json.dumps(notification.data, sort_keys=True),
+                )
+                notification.coalesce_id = heads.setdefault(key, notification.id)
+            notification.claimed_at = now
+        PushNotification.objects.bulk_update(pending, ["claimed_at", "coalesce_id"])
+    return pending
+
+
+def flush_outbox(batch_size: int = 500) -> int:
+    """
+    Claim pending notifications, send one API call per `max_external_user_ids`
+    users of coalesced notifications (outside of transaction), and mark them as sent.
+    Returns number of API calls.
+    """
+    client = settings.ONE_SIGNAL_CLIENT
+    claimed = _claim(batch_size)
+    coalesced = OrderedDict()
+    for notification in claimed:
+        coalesced.setdefault(notification.coalesce_id, []).append(notification)
+
+    num_calls = 0
+    for coalesce_id, notifications in coalesced.items():
+        notification_ids = [n.id for n in notifications]
+        head = notifications[0]
+        user_ids = list(
+            OrderedDict.fromkeys(
+                user_id for n in notifications for user_id in n.user_ids
+            )
+        )
+        size = client.max_external_user_ids
+        try:
+            for chunk_idx, offset in enumerate(range(0, len(user_ids), size)):
+                end = offset + size
+                res = client.send_notification_to_specific_users(
+                    title=head.title,
+                    content=head.content,
+                    user_ids=user_ids[offset:end],
+                    data=head.data,
+                    idempotency_key=_idempotency_key(coalesce_id, chunk_idx),
+                )
+                num_calls += 1
+                logger.debug(f"OneSignal response for {notification_ids}: {res}")
+        except Exception:
+            # release not sent claims to be retried right away
+            PushNotification.objects.filter(
+                id__in=[n.id for n in claimed], sent_at__isnull=True
+            ).update(claimed_at=None)
+            raise
+        PushNotification.objects.filter(id__in=notification_ids).update(
+            sent_at=timezone.now()
+        )
+    return num_calls
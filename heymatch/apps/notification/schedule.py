@@ -0,0 +1,218 @@
+"""
+Time-based push notifications (ScheduledNotification).
+
+    - [첫 그룹 생성 유도 알림] scheduled when user completes onboarding
+    - [매칭 요청 유도 알림], [만남날짜 업데이트 알림] scheduled when group is created
+      (meetup date ones are moved when meetup_date changes, see group.signals)
+
+Each series is a list of (kind, delay from start). A notification expires when the next
+one of the same series becomes due, so late dispatch never sends stale messages.
+Whether subject still needs the notification is checked once, at dispatch time.
+"""
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from heymatch.apps.group.models import GroupMember, GroupV2
+from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.user.models import UserOnBoarding
+
+from .models import ScheduledNotification
+from .outbox import enqueue_push_notification
+
+User = get_user_model()
+Kind = ScheduledNotification.KindChoices
+
+FIRST_GROUP_SERIES = [
+    (Kind.FIRST_GROUP_AFTER_10MIN, datetime.timedelta(minutes=10)),
+    (Kind.FIRST_GROUP_AFTER_1HR, datetime.timedelta(hours=1)),
+    (Kind.FIRST_GROUP_AFTER_1DAY, datetime.timedelta(days=1)),
+]
+SEND_MR_SERIES = [
+    (Kind.SEND_MR_AFTER_30MIN, datetime.timedelta(minutes=30)),
+    (Kind.SEND_MR_AFTER_1DAY, datetime.timedelta(days=1)),
+    (Kind.SEND_MR_AFTER_3DAY, datetime.timedelta(days=3)),
+]
+UPDATE_MEETUP_DATE_SERIES = [
+    (Kind.UPDATE_MEETUP_DATE_AFTER_1DAY, datetime.timedelta(days=1)),
+    (Kind.UPDATE_MEETUP_DATE_AFTER_3DAY, datetime.timedelta(days=3)),
+    (Kind.UPDATE_MEETUP_DATE_AFTER_1WEEK, datetime.timedelta(days=7)),
+    (Kind.UPDATE_MEETUP_DATE_AFTER_2WEEK, datetime.timedelta(days=14)),
+]
+UPDATE_MEETUP_DATE_NOTIFICATION_TIME = datetime.time(hour=22)  # 10 p.m
+
+# kind: (title, content)
+MESSAGES = {
+    Kind.FIRST_GROUP_AFTER_10MIN: (
+        "첫 그룹을 만들어 보세요!",
+        "방금 가입하셨네요! 첫 그룹을 만들고 미팅팸 구해봐요! 🥳",
+    ),
+    Kind.FIRST_GROUP_AFTER_1HR: (
+        "첫 그룹을 만들어 보세요!",
+        "아직 늦지 않았어요! 첫 그룹을 만들고 매칭해봐요! 😍",
+    ),
+    Kind.FIRST_GROUP_AFTER_1DAY: (
+        "첫 그룹을 만들어 보세요!",
+        "벌써 많은 그룹이 만들어졌어요! 오늘이 가기 전에 첫 그룹을 만들고 매칭해봐요! 👀",
+    ),
+    Kind.UPDATE_MEETUP_DATE_AFTER_1DAY: (
+        "만든 그룹의 만남날짜가 지났어요!",
+        "만든 그룹의 만남날짜가 [하루] 지났어요!😵 날짜가 지나면 매칭률이 떨어지니 업데이트 해봐요!🙈",
+    ),
+    Kind.UPDATE_MEETUP_DATE_AFTER_3DAY: (
+        "만든 그룹의 만남날짜가 지났어요!",
+        "만든 그룹의 만남날짜가 [3일] 지났어요!😯 아직 미팅팸 못 구했다면? 지금 당장 만남날짜 업데이트하자!😍",
+    ),
+    Kind.UPDATE_MEETUP_DATE_AFTER_1WEEK: (
+        "만든 그룹의 만남날짜가 지났어요!",
+        "만든 그룹의 만남날짜가 무려 [일주일]이나 지났어요..😰 날짜 업데이트하고 매칭 많이 받아봐요!🫡",
+    ),
+    Kind.UPDATE_MEETUP_DATE_AFTER_2WEEK: (
+        "만든 그룹의 만남날짜가 지났어요!",
+        "만드신 그룹의 만남날짜가 많이 지났어요🤧 날짜 업데이트하고 매칭 많이 받아봐요!🫡",
+    ),
+    Kind.SEND_MR_AFTER_30MIN: (
+        "첫 매칭을 걸어보세요!",
+        "방금 그룹을 만드셨네요! 마음에 드는 미팅팸을 보고 매칭을 보내봐요! 🥳",
+    ),
+    Kind.SEND_MR_AFTER_1DAY: (
+        "첫 매칭을 걸어보세요!",
+        "어제 그룹을 만드셨네요! 그동안 미팅팸이 더 많이 생겼어요! 어서 매칭을 보내봐요! 💚",
+    ),
+    Kind.SEND_MR_AFTER_3DAY: (
+        "첫 그룹을 만들어 보세요!",
+        "엊그제 그룹을 만드셨네요! 그동안 미팅팸이 더 많이 생겼어요! 어서 매칭을 보내봐요! 💗💗",
+    ),
+}
+
+
+def _series_entries(series: list, start: datetime.datetime) -> list:
+    """[(kind, due_at, expires_at), ...]"""
+    entries = []
+    for idx, (kind, delay) in enumerate(series):
+        expires_at = start + series[idx + 1][1] if idx + 1 < len(series) else None
+        entries.append((kind, start + delay, expires_at))
+    return entries
+
+
+def _meetup_date_start(meetup_date: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(
+        datetime.datetime.combine(meetup_date, UPDATE_MEETUP_DATE_NOTIFICATION_TIME)
+    )
+
+
+# ================================================
+# == Scheduling
+# ================================================
+
+
+def schedule_first_group_notifications(user_ids: list) -> None:
+    users = User.objects.filter(id__in=user_ids).values_list("id", "created_at")
+    entries_by_kind = {}
+    for user_id, created_at in users:
+        for kind, due_at, expires_at in _series_entries(FIRST_GROUP_SERIES, created_at):
+            entries_by_kind.setdefault(kind, []).append((user_id, due_at, expires_at))
+    for kind, entries in entries_by_kind.items():
+        ScheduledNotification.objects.schedule(kind, entries)
+
+
+def schedule_group_notifications(group: GroupV2) -> None:
+    for kind, due_at, expires_at in _series_entries(SEND_MR_SERIES, group.created_at):
+        ScheduledNotification.objects.schedule(kind, [(group.id, due_at, expires_at)])
+    reschedule_meetup_date_notifications(group, created=True)
+
+
+def reschedule_meetup_date_notifications(group: GroupV2, created=False) -> None:
+    start = _meetup_date_start(group.meetup_date)
+    for kind, due_at, expires_at in _series_entries(UPDATE_MEETUP_DATE_SERIES, start):
+        if created:
+            ScheduledNotification.objects.schedule(
+                kind, [(group.id, due_at, expires_at)]
+            )
+        else:
+            ScheduledNotification.objects.reschedule(kind, group.id, due_at, expires_at)
+
+
+# ================================================
+# == Dispatch
+# ================================================
+
+
+def _first_group_recipients(subjects: list) -> list:
+    """users who completed onboarding but never joined any group"""
+    return list(
+        User.objects.filter(id__in=subjects)
+        .filter(
+            Exists(
+                UserOnBoarding.objects.filter(
+                    user_id=OuterRef("id"), onboarding_completed=True
+                )
+            ),
+            ~Exists(GroupMember.objects.filter(user_id=OuterRef("id"))),
+        )
+        .values_list("id", flat=True)
+    )
+
+
+def _update_meetup_date_recipients(subjects: list) -> list:
+    groups = GroupV2.objects.filter(id__in=subjects, is_active=True)
+    return list(
+        GroupMember.objects.filter(group__in=groups).values_list("user_id", flat=True)
+    )
+
+
+def _send_mr_recipients(subjects: list) -> list:
+    """members of groups which did not send any match request"""
+    groups = GroupV2.objects.filter(id__in=subjects, is_active=True).filter(
+        ~Exists(MatchRequest.objects.filter(sender_group_id=OuterRef("id")))
+    )
+    return list(
+        GroupMember.objects.filter(group__in=groups).values_list("user_id", flat=True)
+    )
+
+
+RECIPIENTS = {
+    **{kind: _first_group_recipients for kind, _ in FIRST_GROUP_SERIES},
+    **{kind: _update_meetup_date_recipients for kind, _ in UPDATE_MEETUP_DATE_SERIES},
+    **{kind: _send_mr_recipients for kind, _ in SEND_MR_SERIES},
+}
+
+
+def dispatch_due_notifications(batch_size: int = 500) -> int:
+    """
+    Claim due notifications (FOR UPDATE SKIP LOCKED, so dispatchers can run in parallel),
+    enqueue one push per kind and mark them as sent. Returns number of claimed rows.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = ScheduledNotification.objects.claim_due(now, batch_size)
+        if not due:
+            return 0
+
+        subjects_by_kind = {}
+        for notification in due:
+            if notification.expires_at and notification.expires_at <= now:
+                continue  # skipped
+            subjects_by_kind.setdefault(notification.kind, []).append(
+                notification.subject
+            )
+
+        for kind, subjects in subjects_by_kind.items():
+            user_ids = RECIPIENTS[kind](subjects)
+            title, content = MESSAGES[kind]
+            enqueue_push_notification(
+                title=title,
+                content=content,
+                user_ids=[str(user_id) for user_id in user_ids],
+                data={
+                    "route_to": "MainTabs",
+                },
+            )
+
+        ScheduledNotification.objects.filter(id__in=[n.id for n in due]).update(
+            sent_at=now
+        )
+    return len(due)
@@ -0,0 +1,120 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from heymatch.apps.notification.models import PushNotification
+from heymatch.apps.notification.outbox import (
+    _idempotency_key,
+    enqueue_push_notification,
+    flush_outbox,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def onesignal_client():
+    cache.clear()
+    client = settings.ONE_SIGNAL_CLIENT
+    client.local_sent.clear()
+    yield client
+    client.local_sent.clear()
+
+
+class TestPushNotificationOutbox:
+    def test_enqueue_schedules_one_flush_per_burst(
+        self, mocker, django_capture_on_commit_callbacks
+    ):
+        apply_async = mocker.patch(
+            "heymatch.apps.celery.tasks.flush_push_notification_outbox.apply_async"
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            for user_id in range(3):
+                enqueue_push_notification(
+                    title="매칭 요청이 왔어요!", content="content", user_ids=[user_id]
+                )
+        assert PushNotification.objects.filter(sent_at__isnull=True).count() == 3
+        apply_async.assert_called_once_with(
+            countdown=settings.PUSH_NOTIFICATION_COALESCE_SECONDS
+        )
+
+    def test_flush_coalesces_identical_payloads(self, onesignal_client):
+        data = {"route_to": "MainTabs"}
+        for user_id in ["1", "2", "2", "3"]:
+            enqueue_push_notification("title", "content", [user_id], data=data)
+        enqueue_push_notification("title", "other content", ["4"], data=data)
+
+        assert flush_outbox() == 2
+        assert [
+            p["include_external_user_ids"] for p in onesignal_client.local_sent
+        ] == [
+            ["1", "2", "3"],
+            ["4"],
+        ]
+        assert not PushNotification.objects.filter(sent_at__isnull=True).exists()
+        assert flush_outbox() == 0
+
+    def test_flush_splits_by_external_id_limit(self, onesignal_client, mocker):
+        mocker.patch.object(onesignal_client, "max_external_user_ids", 2)
+        enqueue_push_notification("title", "content", ["1", "2", "3", "4", "5"])
+
+        assert flush_outbox() == 3
+        sent = onesignal_client.local_sent
+        assert [p["include_external_user_ids"] for p in sent] == [
+            ["1", "2"],
+            ["3", "4"],
+            ["5"],
+        ]
+        # idempotency key is different per chunk
+        assert len({p["external_id"] for p in sent}) == 3
+
+    def test_failed_flush_is_retried(self, onesignal_client, mocker):
+        enqueue_push_notification("title", "content", ["1"])
+        mocker.patch.object(
+            onesignal_client,
+            "send_notification_to_specific_users",
+            side_effect=RuntimeError("OneSignal is down"),
+        )
+        with pytest.raises(RuntimeError):
+            flush_outbox()
+        assert PushNotification.objects.filter(sent_at__isnull=True).count() == 1
+
+    def test_sent_groups_are_kept_when_later_group_fails(
+        self, onesignal_client, mocker
+    ):
+        enqueue_push_notification("title", "content", ["1"])
+        enqueue_push_notification("title", "other content", ["2"])
+        send = onesignal_client.send_notification_to_specific_users
+
+        def send_or_fail(**kwargs):
+            if kwargs["content"] == "other content":
+                raise RuntimeError("OneSignal is down")
+            return send(**kwargs)
+
+        mocker.patch.object(
+            onesignal_client,
+            "send_notification_to_specific_users",
+            side_effect=send_or_fail,
+        )
+        with pytest.raises(RuntimeError):
+            flush_outbox()
+        pending = PushNotification.objects.filter(sent_at__isnull=True)
+        assert list(pending.values_list("content", "claimed_at")) == [
+            ("other content", None)
+        ]
+
+    def test_expired_claim_is_sent_with_same_key(self, onesignal_client, settings):
+        first = enqueue_push_notification("title", "content", ["1"])
+        enqueue_push_notification("title", "content", ["2"])
+        # claimed by a worker killed before sending
+        PushNotification.objects.update(
+            claimed_at=timezone.now() - settings.PUSH_NOTIFICATION_CLAIM_TIMEOUT,
+            coalesce_id=first.id,
+        )
+        enqueue_push_notification("title", "content", ["3"])
+
+        assert flush_outbox() == 2
+        sent = onesignal_client.local_sent
+        assert [p["include_external_user_ids"] for p in sent] == [["1", "2"], ["3"]]
+        assert sent[0]["external_id"] == _idempotency_key(first.id, 0)
@@ -0,0 +1,132 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from heymatch.apps.group.models import GroupMember
+from heymatch.apps.group.tests.factories import GroupMemberFactory, GroupV2Factory
+from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.notification.models import PushNotification, ScheduledNotification
+from heymatch.apps.notification.schedule import (
+    dispatch_due_notifications,
+    schedule_first_group_notifications,
+)
+from heymatch.apps.user.models import UserOnBoarding
+from heymatch.apps.user.tests.factories import ActiveUserFactory
+
+pytestmark = pytest.mark.django_db
+
+Kind = ScheduledNotification.KindChoices
+
+
+def _sent_user_ids() -> set:
+    return {user_id for pn in PushNotification.objects.all() for user_id in pn.user_ids}
+
+
+def _make_due(subject, kind, now=None):
+    now = now or timezone.now()
+    ScheduledNotification.objects.filter(subject=str(subject), kind=kind).update(
+        due_at=now - datetime.timedelta(seconds=1)
+    )
+
+
+class TestScheduleNotifications:
+    def test_group_creation(self):
+        group = GroupV2Factory(meetup_date=datetime.date(2023, 12, 24))
+        scheduled = {
+            n.kind: n for n in ScheduledNotification.objects.filter(subject=group.id)
+        }
+        assert set(scheduled) == {
+            Kind.SEND_MR_AFTER_30MIN,
+            Kind.SEND_MR_AFTER_1DAY,
+            Kind.SEND_MR_AFTER_3DAY,
+            Kind.UPDATE_MEETUP_DATE_AFTER_1DAY,
+            Kind.UPDATE_MEETUP_DATE_AFTER_3DAY,
+            Kind.UPDATE_MEETUP_DATE_AFTER_1WEEK,
+            Kind.UPDATE_MEETUP_DATE_AFTER_2WEEK,
+        }
+        half_hour = scheduled[Kind.SEND_MR_AFTER_30MIN]
+        assert half_hour.due_at == group.created_at + datetime.timedelta(minutes=30)
+        assert half_hour.expires_at == scheduled[Kind.SEND_MR_AFTER_1DAY].due_at
+        one_day = scheduled[Kind.UPDATE_MEETUP_DATE_AFTER_1DAY]
+        assert timezone.localtime(one_day.due_at).replace(tzinfo=None) == (
+            datetime.datetime(2023, 12, 25, 22)
+        )
+        assert scheduled[Kind.UPDATE_MEETUP_DATE_AFTER_2WEEK].expires_at is None
+
+    def test_meetup_date_change_moves_unsent_only(self):
+        group = GroupV2Factory(meetup_date=datetime.date(2023, 12, 24))
+        ScheduledNotification.objects.filter(
+            subject=group.id, kind=Kind.UPDATE_MEETUP_DATE_AFTER_1DAY
+        ).update(sent_at=timezone.now())
+
+        group.meetup_date = datetime.date(2023, 12, 31)
+        group.save()
+
+        one_day = ScheduledNotification.objects.get(
+            subject=group.id, kind=Kind.UPDATE_MEETUP_DATE_AFTER_1DAY
+        )
+        three_day = ScheduledNotification.objects.get(
+            subject=group.id, kind=Kind.UPDATE_MEETUP_DATE_AFTER_3DAY
+        )
+        assert timezone.localtime(one_day.due_at).date() == datetime.date(2023, 12, 25)
+        assert timezone.localtime(three_day.due_at).date() == datetime.date(2024, 1, 3)
+
+    def test_first_group_is_idempotent(self):
+        user = ActiveUserFactory()
+        schedule_first_group_notifications([user.id])
+        schedule_first_group_notifications([user.id])
+        assert ScheduledNotification.objects.filter(subject=user.id).count() == 3
+
+
+class TestDispatchDueNotifications:
+    def test_first_group(self):
+        user = ActiveUserFactory()
+        group_made = ActiveUserFactory()
+        GroupMemberFactory(user=group_made)
+        not_onboarded = ActiveUserFactory()
+        UserOnBoarding.objects.filter(user=not_onboarded).update(
+            onboarding_completed=False
+        )
+        users = [user, group_made, not_onboarded]
+        schedule_first_group_notifications([u.id for u in users])
+        ScheduledNotification.objects.filter(sent_at__isnull=True).exclude(
+            kind=Kind.FIRST_GROUP_AFTER_10MIN
+        ).delete()
+        for u in users:
+            _make_due(u.id, Kind.FIRST_GROUP_AFTER_10MIN)
+
+        assert dispatch_due_notifications() == 3
+        assert _sent_user_ids() == {str(user.id)}
+        assert not ScheduledNotification.objects.filter(sent_at__isnull=True).exists()
+        # sent only once
+        assert dispatch_due_notifications() == 0
+
+    def test_send_mr_skips_groups_which_sent_match_request(self):
+        group = GroupMemberFactory().group
+        sent_group = GroupMemberFactory().group
+        MatchRequest.objects.create(
+            sender_group=sent_group, receiver_group=GroupV2Factory()
+        )
+        for g in [group, sent_group]:
+            _make_due(g.id, Kind.SEND_MR_AFTER_30MIN)
+
+        dispatch_due_notifications()
+        assert _sent_user_ids() == {
+            str(user_id)
+            for user_id in GroupMember.objects.filter(group=group).values_list(
+                "user_id", flat=True
+            )
+        }
+
+    def test_expired_is_skipped(self):
+        group = GroupMemberFactory().group
+        ScheduledNotification.objects.filter(
+            subject=group.id, kind=Kind.SEND_MR_AFTER_30MIN
+        ).update(
+            due_at=timezone.now() - datetime.timedelta(days=2),
+            expires_at=timezone.now() - datetime.timedelta(days=1),
+        )
+
+        assert dispatch_due_notifications() == 1
+        assert not PushNotification.objects.exists()
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import DailyBusinessRollup
+
+
+@admin.register(DailyBusinessRollup)
+class DailyBusinessRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        "date",
+        "users",
+        "groups",
+        "photo_purchases",
+        "match_requests",
+        "krw",
+        "created_at",
+    ]
+    ordering = ["-date"]
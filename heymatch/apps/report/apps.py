@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class ReportAppConfig(AppConfig):
+    name = "heymatch.apps.report"
+    verbose_name = _("Report App")
@@ -0,0 +1,253 @@
+"""
+Business report (사용 현황 리포트) sent to slack by `aggregate_business_report` task.
+
+    - metrics of a time window: a few conditional aggregate queries (one per model)
+    - all-time metrics: sum of DailyBusinessRollup rows + today
+    - rendering into slack blocks: `render_business_report`, no slack dependency
+"""
+import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, Max, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from heymatch.apps.group.models import GroupMember, GroupProfilePhotoPurchased, GroupV2
+from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.payment.models import UserPurchase
+
+from .models import DailyBusinessRollup
+
+User = get_user_model()
+MALE = User.GenderChoices.MALE
+FEMALE = User.GenderChoices.FEMALE
+
+METRICS = ["users", "groups", "photo_purchases", "match_requests", "krw"]
+FIELDS = [
+    f"{prefix}{metric}" for metric in METRICS for prefix in ["", "male_", "female_"]
+]
+
+
+def _count_by_gender(name: str, male: Q, female: Q) -> dict:
+    return {
+        name: Count("id"),
+        f"male_{name}": Count("id", filter=male),
+        f"female_{name}": Count("id", filter=female),
+    }
+
+
+def _has_member_of(gender: str, group_ref: str) -> Exists:
+    return Exists(
+        GroupMember.objects.filter(group_id=OuterRef(group_ref), user__gender=gender)
+    )
+
+
+def _sources() -> list:
+    """[(queryset, datetime field, aggregates), ...] one query each"""
+    krw = "point_item__price_in_krw"
+    return [
+        (
+            User.objects.all(),
+            "created_at",
+            _count_by_gender("users", Q(gender=MALE), Q(gender=FEMALE)),
+        ),
+        (
+            # mixed group is counted as both male and female group
+            GroupV2.objects.annotate(
+                has_male=_has_member_of(MALE, "id"),
+                has_female=_has_member_of(FEMALE, "id"),
+            ),
+            "created_at",
+            _count_by_gender("groups", Q(has_male=True), Q(has_female=True)),
+        ),
+        (
+            GroupProfilePhotoPurchased.objects.all(),
+            "created_at",
+            _count_by_gender(
+                "photo_purchases", Q(buyer__gender=MALE), Q(buyer__gender=FEMALE)
+            ),
+        ),
+        (
+            MatchRequest.objects.annotate(
+                sent_by_male=_has_member_of(MALE, "sender_group_id"),
+                sent_by_female=_has_member_of(FEMALE, "sender_group_id"),
+            ),
+            "created_at",
+            _count_by_gender(
+                "match_requests", Q(sent_by_male=True), Q(sent_by_female=True)
+            ),
+        ),
+        (
+            UserPurchase.objects.filter(purchase_processed=True),
+            "purchased_at",
+            {
+                "krw": Coalesce(Sum(krw), 0),
+                "male_krw": Coalesce(Sum(krw, filter=Q(user__gender=MALE)), 0),
+                "female_krw": Coalesce(Sum(krw, filter=Q(user__gender=FEMALE)), 0),
+            },
+        ),
+    ]
+
+
+def _in_range(qs, field: str, start, end):
+    if start is not None:
+        qs = qs.filter(**{f"{field}__gte": start})
+    if end is not None:
+        qs = qs.filter(**{f"{field}__lt": end})
+    return qs
+
+
+def compute_business_metrics(
+    start: datetime.datetime or None, end: datetime.datetime or None
+) -> dict:
+    """{field: value} of [start, end)"""
+    metrics = {}
+    for qs, field, aggregates in _sources():
+        metrics.update(_in_range(qs, field, start, end).aggregate(**aggregates))
+    return metrics
+
+
+def compute_daily_business_metrics(
+    start: datetime.datetime or None, end: datetime.datetime
+) -> dict:
+    """{local date: {field: value}} of [start, end). Days without any data are omitted"""
+    daily = {}
+    for qs, field, aggregates in _sources():
+        rows = (
+            _in_range(qs, field, start, end)
+            .annotate(date=TruncDate(field))
+            .values("date")
+            .annotate(**aggregates)
+            .order_by()
+        )
+        for row in rows:
+            date = row.pop("date")
+            daily.setdefault(date, dict.fromkeys(FIELDS, 0)).update(row)
+    return daily
+
+
+def _start_of_day(date: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def rollup_daily_business_metrics(today: datetime.date) -> int:
+    """Write DailyBusinessRollup of days before `today` which are not rolled up yet"""
+    last_date = DailyBusinessRollup.objects.aggregate(last=Max("date"))["last"]
+    first_date = last_date + datetime.timedelta(days=1) if last_date else None
+    if first_date and first_date >= today:
+        return 0
+
+    daily = compute_daily_business_metrics(
+        start=_start_of_day(first_date) if first_date else None,
+        end=_start_of_day(today),
+    )
+    if first_date is None:
+        if not daily:
+            return 0
+        first_date = min(daily)
+
+    rollups = []
+    date = first_date
+    while date < today:
+        rollups.append(
+            DailyBusinessRollup(date=date, **daily.get(date, dict.fromkeys(FIELDS, 0)))
+        )
+        date += datetime.timedelta(days=1)
+    DailyBusinessRollup.objects.bulk_create(rollups, ignore_conflicts=True)
+    return len(rollups)
+
+
+def all_time_business_metrics(now: datetime.datetime or None = None) -> dict:
+    """sum of daily rollups + not yet rolled up days"""
+    now = now or timezone.now()
+    rolled_up = DailyBusinessRollup.objects.aggregate(
+        last=Max("date"), **{field: Coalesce(Sum(field), 0) for field in FIELDS}
+    )
+    last_date = rolled_up.pop("last")
+    rest = compute_business_metrics(
+        start=_start_of_day(last_date + datetime.timedelta(days=1))
+        if last_date
+        else None,
+        end=now,
+    )
+    return {field: rolled_up[field] + rest[field] for field in FIELDS}
+
+
+# ================================================
+# == Rendering
+# ================================================
+
+
+def _candy_spent(metrics: dict, prefix: str) -> int:
+    return (
+        metrics[f"{prefix}photo_purchases"] * settings.POINT_NEEDED_FOR_PHOTO
+        + metrics[f"{prefix}match_requests"] * settings.POINT_NEEDED_FOR_MATCH
+    )
+
+
+def _section(text: str) -> dict:
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def render_business_report(today: dict, all_time: dict, top_hotplaces: dict) -> list:
+    """Slack blocks of business report"""
+    return [
+        _section("안녕하세요! 👋 \n 오늘의 헤이매치 사용 현황 리포트 드립니다!"),
+        _section(
+            f"*👶 신규 유저수*: \n "
+            f"  - 오늘: {today['users']}명 "
+            f"(남성-{today['male_users']}명 / 여성-{today['female_users']}명) \n "
+            f"  - 전체: {all_time['users']}명 "
+            f"(남성-{all_time['male_users']}명 / 여성-{all_time['female_users']}명) \n "
+        ),
+        _section(
+            "*👯‍그룹 생성 개수*: \n "
+            f"  - 오늘: {today['groups']}개 "
+            f"(남성-{today['male_groups']}개 / 여성-{today['female_groups']}개) \n "
+            f"  - 전체: {all_time['groups']}개 "
+            f"(남성-{all_time['male_groups']}개 / 여성-{all_time['female_groups']}개) \n "
+        ),
+        _section(
+            "*📸 사진 열람 개수*: \n "
+            f"  - 오늘: {today['photo_purchases']}개 "
+            f"(남성-{today['male_photo_purchases']}개 "
+            f"/ 여성-{today['female_photo_purchases']}개) \n "
+            f"  - 전체: {all_time['photo_purchases']}개 "
+            f"(남성-{all_time['male_photo_purchases']}개 "
+            f"/ 여성-{all_time['female_photo_purchases']}개) \n "
+        ),
+        _section(
+            "*📬 매칭 요청 개수*: \n "
+            f"  - 오늘: {today['match_requests']}개 "
+            f"(남성-{today['male_match_requests']}개 "
+            f"/ 여성-{today['female_match_requests']}개) \n "
+            f"  - 전체: {all_time['match_requests']}개 "
+            f"(남성-{all_time['male_match_requests']}개 "
+            f"/ 여성-{all_time['female_match_requests']}개) \n "
+        ),
+        _section(
+            "*🍬 사용 캔디 개수*: \n "
+            f"  - 오늘: {_candy_spent(today, '')}개 "
+            f"(남성-{_candy_spent(today, 'male_')}개 "
+            f"/ 여성-{_candy_spent(today, 'female_')}개) \n "
+            f"  - 전체: {_candy_spent(all_time, '')}개 "
+            f"(남성-{_candy_spent(all_time, 'male_')}개 "
+            f"/ 여성-{_candy_spent(all_time, 'female_')}개) \n "
+        ),
+        _section(
+            "*💰 결제 대금*: \n "
+            f"  - 오늘: {today['krw']}원 "
+            f"(남성-{today['male_krw']}원 / 여성-{today['female_krw']}원) \n "
+            f"  - 전체: {all_time['krw']}원 "
+            f"(남성-{all_time['male_krw']}원 / 여성-{all_time['female_krw']}원) \n "
+        ),
+        _section(
+            "*🔥 Top 핫플레이스*: \n " f"  - {top_hotplaces if top_hotplaces else '수집중..'}"
+        ),
+        {"type": "divider"},
+        {
+            "type": "context",
+            "elements": [{"type": "mrkdwn", "text": "👀 오늘도 수고하셨습니다 :)"}],
+        },
+    ]
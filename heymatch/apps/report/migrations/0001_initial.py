@@ -0,0 +1,38 @@
+# Generated by Django 3.2.13 on 2023-12-15 02:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBusinessRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('users', models.IntegerField(default=0)),
+                ('male_users', models.IntegerField(default=0)),
+                ('female_users', models.IntegerField(default=0)),
+                ('groups', models.IntegerField(default=0)),
+                ('male_groups', models.IntegerField(default=0)),
+                ('female_groups', models.IntegerField(default=0)),
+                ('photo_purchases', models.IntegerField(default=0)),
+                ('male_photo_purchases', models.IntegerField(default=0)),
+                ('female_photo_purchases', models.IntegerField(default=0)),
+                ('match_requests', models.IntegerField(default=0)),
+                ('male_match_requests', models.IntegerField(default=0)),
+                ('female_match_requests', models.IntegerField(default=0)),
+                ('krw', models.BigIntegerField(default=0)),
+                ('male_krw', models.BigIntegerField(default=0)),
+                ('female_krw', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils import timezone
+
+
+class DailyBusinessRollup(models.Model):
+    """
+    Business metrics of one (local) day. Written once the day is over,
+    so all-time totals are sum of rollups + today. See business.py
+    """
+
+    date = models.DateField(blank=False, null=False, unique=True)
+
+    users = models.IntegerField(default=0)
+    male_users = models.IntegerField(default=0)
+    female_users = models.IntegerField(default=0)
+    groups = models.IntegerField(default=0)
+    male_groups = models.IntegerField(default=0)
+    female_groups = models.IntegerField(default=0)
+    photo_purchases = models.IntegerField(default=0)
+    male_photo_purchases = models.IntegerField(default=0)
+    female_photo_purchases = models.IntegerField(default=0)
+    match_requests = models.IntegerField(default=0)
+    male_match_requests = models.IntegerField(default=0)
+    female_match_requests = models.IntegerField(default=0)
+    krw = models.BigIntegerField(default=0)
+    male_krw = models.BigIntegerField(default=0)
+    female_krw = models.BigIntegerField(default=0)
+
+    created_at = models.DateTimeField(default=timezone.now)
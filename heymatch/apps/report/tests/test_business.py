@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+from django.conf import settings
+from django.utils import timezone
+
+from heymatch.apps.celery.tasks import aggregate_business_report
+from heymatch.apps.group.models import GroupV2
+from heymatch.apps.group.tests.factories import GroupMemberFactory, GroupV2Factory
+from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.payment.models import PointItem, UserPurchase
+from heymatch.apps.report.business import (
+    FIELDS,
+    all_time_business_metrics,
+    compute_business_metrics,
+    render_business_report,
+    rollup_daily_business_metrics,
+)
+from heymatch.apps.report.models import DailyBusinessRollup
+from heymatch.apps.user.models import User
+from heymatch.apps.user.tests.factories import (
+    ActiveCollegeFemaleUserFactory,
+    ActiveCollegeMaleUserFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def activity():
+    male, female = ActiveCollegeMaleUserFactory(), ActiveCollegeFemaleUserFactory()
+    male_group = GroupMemberFactory(user=male).group
+    mixed_group = GroupV2Factory()
+    GroupMemberFactory(group=mixed_group, user=ActiveCollegeMaleUserFactory())
+    GroupMemberFactory(group=mixed_group, user=female)
+    MatchRequest.objects.create(sender_group=male_group, receiver_group=mixed_group)
+    item = PointItem.objects.create(
+        name="candy_10", product_id="candy_10", price_in_krw=4900, default_point=10
+    )
+    UserPurchase.objects.create(
+        user=male, platform="ios", point_item=item, purchase_processed=True
+    )
+    UserPurchase.objects.create(
+        user=female, platform="ios", point_item=item, purchase_processed=False
+    )
+    return male, female
+
+
+def _set_created_at(days_ago: int):
+    """move every row created by `activity` back in time"""
+    created_at = timezone.now() - datetime.timedelta(days=days_ago)
+    User.objects.update(created_at=created_at)
+    GroupV2.objects.update(created_at=created_at)
+    MatchRequest.objects.update(created_at=created_at)
+    UserPurchase.objects.update(purchased_at=created_at)
+
+
+class TestBusinessMetrics:
+    def test_compute(self, activity):
+        metrics = compute_business_metrics(start=None, end=None)
+        num_users = User.objects.count()
+        assert metrics["users"] == num_users
+        assert metrics["male_users"] + metrics["female_users"] == num_users
+        # mixed group is counted for both
+        assert metrics["male_groups"] == 2
+        assert metrics["female_groups"] == 1
+        assert metrics["match_requests"] == metrics["male_match_requests"] == 1
+        assert metrics["female_match_requests"] == 0
+        assert metrics["krw"] == metrics["male_krw"] == 4900
+        assert metrics["female_krw"] == 0
+
+    def test_all_time_is_same_with_and_without_rollup(self, activity):
+        _set_created_at(days_ago=3)
+        ActiveCollegeFemaleUserFactory()  # today
+        expected = compute_business_metrics(start=None, end=None)
+
+        assert all_time_business_metrics() == expected
+        assert rollup_daily_business_metrics(timezone.localdate()) == 3
+        assert DailyBusinessRollup.objects.count() == 3
+        assert all_time_business_metrics() == expected
+        # already rolled up
+        assert rollup_daily_business_metrics(timezone.localdate()) == 0
+
+
+class TestBusinessReport:
+    def test_render(self):
+        today = dict.fromkeys(FIELDS, 0)
+        all_time = {**today, "match_requests": 2, "male_match_requests": 2}
+        blocks = render_business_report(today, all_time, top_hotplaces={})
+        texts = [b["text"]["text"] for b in blocks if b["type"] == "section"]
+        candy = 2 * settings.POINT_NEEDED_FOR_MATCH
+        assert f"  - 전체: {candy}개 (남성-{candy}개 / 여성-0개)" in texts[5]
+        assert "수집중.." in texts[7]
+
+    def test_task_sends_report(self, activity, mocker):
+        send = mocker.patch.object(settings.SLACK_BUSINESS_REPORT_BOT, "send")
+        aggregate_business_report()
+        send.assert_called_once()
+        assert "결제 대금" in send.call_args.kwargs["blocks"][6]["text"]["text"]
@@ -41,10 +41,8 @@ class UserAdmin(SimpleHistoryAdmin):
                     "block_my_school_or_company_users",
                     "hide_my_school_or_company_name",
                     "has_finished_guide",
-                    "num_of_available_ads",
-                    "notified_to_make_first_group_after_join_10min",
-                    "notified_to_make_first_group_after_join_1hr",
-                    "notified_to_make_first_group_after_join_1day",
+                    "ads_used_today",
+                    "ads_quota_date",
                 )
             },
         ),
@@ -107,10 +105,8 @@ class UserAdmin(SimpleHistoryAdmin):
         "block_my_school_or_company_users",
         "hide_my_school_or_company_name",
         "has_finished_guide",
-        "num_of_available_ads",
-        "notified_to_make_first_group_after_join_10min",
-        "notified_to_make_first_group_after_join_1hr",
-        "notified_to_make_first_group_after_join_1day",
+        "ads_used_today",
+        "ads_quota_date",
     ]
     history_list_display = [
         "status",
@@ -145,10 +141,8 @@ class UserAdmin(SimpleHistoryAdmin):
         "block_my_school_or_company_users",
         "hide_my_school_or_company_name",
         "has_finished_guide",
-        "num_of_available_ads",
-        "notified_to_make_first_group_after_join_10min",
-        "notified_to_make_first_group_after_join_1hr",
-        "notified_to_make_first_group_after_join_1day",
+        "ads_used_today",
+        "ads_quota_date",
     ]
 
 
@@ -163,6 +157,7 @@ class UserProfilePhotoAdmin(SimpleHistoryAdmin):
         "image_blurred",
         "thumbnail",
         "thumbnail_blurred",
+        "variants_pending",
         "is_active",
         "order",
     ]
@@ -232,6 +227,7 @@ class DeleteScheduledUserAdmin(admin.ModelAdmin):
         "delete_schedule_at",
         "delete_reason",
         "status",
+        "progress",
     ]
     search_fields = [
         "id",
@@ -11,6 +11,10 @@ from heymatch.apps.user.models import (
 
 
 class UserProfileImageSerializer(serializers.ModelSerializer):
+    # {format: {width: url}}. `image`, `thumbnail` are JPEG fallbacks
+    image_srcset = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = UserProfileImage
         fields = [
@@ -18,12 +22,22 @@ class UserProfileImageSerializer(serializers.ModelSerializer):
             "status",
             "image",
             "thumbnail",
+            "image_srcset",
+            "thumbnail_srcset",
             "order",
+            "variants_pending",
         ]
 
+    def get_image_srcset(self, obj):
+        return obj.srcset("image")
+
+    def get_thumbnail_srcset(self, obj):
+        return obj.srcset("thumbnail")
+
 
 class UserWithGroupFullInfoSerializer(serializers.ModelSerializer):
     user_purchases = SimpleUserPurchaseSerializer(read_only=True, many=True)
+    num_of_available_ads = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
@@ -164,6 +178,33 @@ class DeleteScheduledUserSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+PROFILE_IMAGE_SLOTS = [
+    "main_profile_image",
+    "other_profile_image_1",
+    "other_profile_image_2",
+]
+PROFILE_IMAGE_UPLOAD_CONTENT_TYPES = {"image/jpeg": "jpeg", "image/png": "png"}
+
+
+class ProfilePhotoUploadIntentRequestBodySerializer(serializers.Serializer):
+    slots = serializers.ListField(
+        child=serializers.ChoiceField(choices=PROFILE_IMAGE_SLOTS),
+        allow_empty=False,
+        max_length=len(PROFILE_IMAGE_SLOTS),
+    )
+    content_type = serializers.ChoiceField(
+        choices=list(PROFILE_IMAGE_UPLOAD_CONTENT_TYPES), default="image/jpeg"
+    )
+
+
+class ProfilePhotoUploadConfirmRequestBodySerializer(serializers.Serializer):
+    upload_tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=len(PROFILE_IMAGE_SLOTS),
+    )
+
+
 class DeleteUserProfilePhotoRequestBodySerializer(serializers.Serializer):
     to_delete = serializers.StringRelatedField(
         many=True, default=["other_profile_image_1", "other_profile_image_2"]
@@ -1,7 +1,10 @@
 import base64
 import hashlib
+import logging
 import math
 import urllib
+import uuid
+from io import BytesIO
 from typing import Any, Dict, Optional
 
 import requests
@@ -9,24 +12,30 @@ from admob_ssv.conf import settings as admob_settings
 from admob_ssv.signals import valid_admob_ssv
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core import signing
 from django.core.cache import cache
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import transaction
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
+from PIL import Image
 from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from heymatch.apps.celery.tasks import schedule_main_profile_image_verification
 from heymatch.apps.group.models import GroupMember
+from heymatch.apps.notification.outbox import enqueue_push_notification
 from heymatch.apps.user.models import (
     AppInfo,
     DeleteScheduledUser,
     UserInvitation,
     UserOnBoarding,
     UserProfileImage,
+    upload_to,
 )
 from heymatch.shared.exceptions import (
     UserInvitationCodeAlreadyAcceptedException,
@@ -35,13 +44,18 @@ from heymatch.shared.exceptions import (
     UsernameAlreadyExistsException,
 )
 from heymatch.shared.permissions import IsUserActive
+from heymatch.shared.uploads import move, presigned_post, read_head
 
 from .serializers import (
+    PROFILE_IMAGE_SLOTS,
+    PROFILE_IMAGE_UPLOAD_CONTENT_TYPES,
     AppInfoSerializer,
     DeleteScheduledUserRequestBodySerializer,
     DeleteScheduledUserSerializer,
     DeleteUserProfilePhotoRequestBodySerializer,
     GroupMemberSerializer,
+    ProfilePhotoUploadConfirmRequestBodySerializer,
+    ProfilePhotoUploadIntentRequestBodySerializer,
     TempUserCreateSerializer,
     UserInfoUpdateBodyRequestSerializer,
     UsernameUniquenessCheckSerializer,
@@ -49,9 +63,95 @@ from .serializers import (
     UserWithGroupFullInfoSerializer,
 )
 
+logger = logging.getLogger(__name__)
 User = get_user_model()
 stream = settings.STREAM_CLIENT
-onesignal_client = settings.ONE_SIGNAL_CLIENT
+
+
+PROFILE_IMAGE_UPDATE_FIELDS = [
+    "image",
+    "image_blurred",
+    "thumbnail",
+    "thumbnail_blurred",
+    "renditions",
+    "variants_pending",
+]
+PROFILE_IMAGE_UPLOAD_SALT = "user.profile_image_upload"
+
+
+def _set_image(upi: UserProfileImage, image) -> None:
+    upi.image = image
+    if isinstance(image, str):
+        # already in storage (presigned url upload), not detected as new by `save`
+        upi.reset_variants()
+
+
+def _save_profile_images(user: User, images: dict) -> None:
+    """
+    Save {slot: image} of `PROFILE_IMAGE_SLOTS`. Image is either an uploaded file
+    (multipart) or name of a file uploaded directly to storage (presigned url)
+    """
+    main_profile_image = images.get("main_profile_image")
+    if main_profile_image:
+        # first create inactive photo
+        # once accepted, will be changed to active
+        upi = UserProfileImage(
+            user=user,
+            is_main=True,
+            status=UserProfileImage.StatusChoices.NOT_VERIFIED,
+            is_active=False,  # first make it inactive
+        )
+        _set_image(upi, main_profile_image)
+        upi.save()
+        transaction.on_commit(lambda: schedule_main_profile_image_verification(upi))
+        uob = UserOnBoarding.objects.get(user=user)
+        # if user under onboarding
+        uob.profile_photo_under_verification = True
+        uob.profile_photo_rejected = False
+        uob.save(
+            update_fields=[
+                "profile_photo_under_verification",
+                "profile_photo_rejected",
+            ]
+        )
+
+    # process other profile image
+    qs = UserProfileImage.objects.filter(user=user, is_main=False)
+    if len(qs) == 2:
+        orig_other_profile_image_1 = qs[0]
+        orig_other_profile_image_2 = qs[1]
+    elif len(qs) == 1:
+        orig_other_profile_image_1 = qs[0]
+        orig_other_profile_image_2 = None
+    else:
+        orig_other_profile_image_1 = None
+        orig_other_profile_image_2 = None
+
+    new_other_profile_image_1 = images.get("other_profile_image_1")
+    new_other_profile_image_2 = images.get("other_profile_image_2")
+
+    if new_other_profile_image_1:
+        if orig_other_profile_image_1:
+            _set_image(orig_other_profile_image_1, new_other_profile_image_1)
+            orig_other_profile_image_1.save(update_fields=PROFILE_IMAGE_UPDATE_FIELDS)
+        else:
+            orig_other_profile_image_1 = UserProfileImage(
+                user=user, status=UserProfileImage.StatusChoices.ACCEPTED
+            )
+            _set_image(orig_other_profile_image_1, new_other_profile_image_1)
+            orig_other_profile_image_1.save()
+
+    if new_other_profile_image_2:
+        if orig_other_profile_image_2:
+            _set_image(orig_other_profile_image_2, new_other_profile_image_2)
+            orig_other_profile_image_2.save(update_fields=PROFILE_IMAGE_UPDATE_FIELDS)
+        else:
+            orig_other_profile_image_2 = UserProfileImage(
+                user=user, status=UserProfileImage.StatusChoices.ACCEPTED
+            )
+            _set_image(orig_other_profile_image_2, new_other_profile_image_2)
+            orig_other_profile_image_2.save()
+            orig_other_profile_image_2.below(orig_other_profile_image_1)
 
 
 class UserWithGroupFullInfoViewSet(viewsets.ModelViewSet):
@@ -92,86 +192,14 @@ class UserWithGroupFullInfoViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
 
-        main_profile_image: InMemoryUploadedFile = serializer.validated_data.pop(
-            "main_profile_image", None
-        )
-        if main_profile_image:
-            # first create inactive photo
-            # once accepted, will be changed to active
-            UserProfileImage.all_objects.create(
-                user=request.user,
-                image=main_profile_image,
-                is_main=True,
-                status=UserProfileImage.StatusChoices.NOT_VERIFIED,
-                is_active=False,  # first make it inactive
-            )
-            uob = UserOnBoarding.objects.get(user=request.user)
-            # if user under onboarding
-            uob.profile_photo_under_verification = True
-            uob.profile_photo_rejected = False
-            uob.save(
-                update_fields=[
-                    "profile_photo_under_verification",
-                    "profile_photo_rejected",
-                ]
-            )
-
-        # process other profile image
-        qs = UserProfileImage.objects.filter(user=request.user, is_main=False)
-        if len(qs) == 2:
-            orig_other_profile_image_1 = qs[0]
-            orig_other_profile_image_2 = qs[1]
-        elif len(qs) == 1:
-            orig_other_profile_image_1 = qs[0]
-            orig_other_profile_image_2 = None
-        else:
-            orig_other_profile_image_1 = None
-            orig_other_profile_image_2 = None
-
-        new_other_profile_image_1: InMemoryUploadedFile or None = (
-            serializer.validated_data.pop("other_profile_image_1", None)
-        )
-        new_other_profile_image_2: InMemoryUploadedFile or None = (
-            serializer.validated_data.pop("other_profile_image_2", None)
+        _save_profile_images(
+            request.user,
+            {
+                slot: serializer.validated_data.pop(slot, None)
+                for slot in PROFILE_IMAGE_SLOTS
+            },
         )
 
-        if new_other_profile_image_1:
-            if orig_other_profile_image_1:
-                orig_other_profile_image_1.image = new_other_profile_image_1
-                orig_other_profile_image_1.save(
-                    update_fields=[
-                        "image",
-                        "image_blurred",
-                        "thumbnail",
-                        "thumbnail_blurred",
-                    ]
-                )
-            else:
-                orig_other_profile_image_1 = UserProfileImage.objects.create(
-                    user=request.user,
-                    image=new_other_profile_image_1,
-                    status=UserProfileImage.StatusChoices.ACCEPTED,
-                )
-
-        if new_other_profile_image_2:
-            if orig_other_profile_image_2:
-                orig_other_profile_image_2.image = new_other_profile_image_2
-                orig_other_profile_image_2.save(
-                    update_fields=[
-                        "image",
-                        "image_blurred",
-                        "thumbnail",
-                        "thumbnail_blurred",
-                    ]
-                )
-            else:
-                orig_other_profile_image_2 = UserProfileImage.objects.create(
-                    user=request.user,
-                    image=new_other_profile_image_2,
-                    status=UserProfileImage.StatusChoices.ACCEPTED,
-                )
-                orig_other_profile_image_2.below(orig_other_profile_image_1)
-
         # user should verify again when changing job title
         job_title = serializer.validated_data.get("job_title", None)
         if job_title and (job_title != request.user.job_title):
@@ -261,6 +289,153 @@ class UserWithGroupProfilePhotoViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_200_OK)
 
 
+def _is_uploaded_image(storage, name: str, content_type: str) -> bool:
+    """
+    Upload is an image in format of `content_type`. Header is parsed from the head
+    of upload, whole file is verified only if it fits in the head.
+    """
+    head = read_head(storage, name, settings.PROFILE_IMAGE_UPLOAD_VERIFY_BYTES)
+    expected_format = PROFILE_IMAGE_UPLOAD_CONTENT_TYPES[content_type].upper()
+    try:
+        image = Image.open(BytesIO(head))
+        if image.format != expected_format:
+            return False
+        if len(head) < settings.PROFILE_IMAGE_UPLOAD_VERIFY_BYTES:
+            image.verify()
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        return False
+    return True
+
+
+class UserProfilePhotoUploadViewSet(viewsets.ViewSet):
+    """
+    Profile photos uploaded directly to S3, instead of multipart body of
+    `UserWithGroupFullInfoViewSet.update` (API workers do not buffer slow uploads)
+
+        1. upload_intent: presigned POST (url & form fields) & upload token per slot.
+           Size is limited by the POST policy, upload goes to pending folder
+        2. client POSTs form fields & image (as "file") to url
+        3. upload_confirm: checks uploaded images, moves them out of pending folder
+           and saves UserProfileImage of them.
+           Variants & verification are processed same as multipart upload
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+        IsUserActive,
+    ]
+
+    @swagger_auto_schema(request_body=ProfilePhotoUploadIntentRequestBodySerializer)
+    def upload_intent(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = ProfilePhotoUploadIntentRequestBodySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        content_type = serializer.validated_data["content_type"]
+        extension = PROFILE_IMAGE_UPLOAD_CONTENT_TYPES[content_type]
+        storage = UserProfileImage._meta.get_field("image").storage
+
+        uploads = []
+        for slot in dict.fromkeys(serializer.validated_data["slots"]):
+            name = (
+                f"{settings.PROFILE_IMAGE_UPLOAD_PENDING_FOLDER}/"
+                f"{uuid.uuid4()}.{extension}"
+            )
+            post = presigned_post(
+                storage,
+                name,
+                content_type,
+                max_size=settings.PROFILE_IMAGE_UPLOAD_MAX_SIZE,
+                expires_in=settings.PROFILE_IMAGE_UPLOAD_URL_EXPIRES,
+            )
+            uploads.append(
+                {
+                    "slot": slot,
+                    "url": post["url"],
+                    "fields": post["fields"],
+                    "upload_token": signing.dumps(
+                        {
+                            "user_id": request.user.id,
+                            "slot": slot,
+                            "name": name,
+                            "content_type": content_type,
+                        },
+                        salt=PROFILE_IMAGE_UPLOAD_SALT,
+                    ),
+                }
+            )
+        return Response(data={"uploads": uploads}, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(request_body=ProfilePhotoUploadConfirmRequestBodySerializer)
+    def upload_confirm(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = ProfilePhotoUploadConfirmRequestBodySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        storage = UserProfileImage._meta.get_field("image").storage
+
+        uploads = {}
+        for token in serializer.validated_data["upload_tokens"]:
+            try:
+                upload = signing.loads(
+                    token,
+                    salt=PROFILE_IMAGE_UPLOAD_SALT,
+                    # url may be used until the last second of expiry
+                    max_age=settings.PROFILE_IMAGE_UPLOAD_URL_EXPIRES * 2,
+                )
+            except signing.BadSignature:
+                raise ValidationError({"upload_tokens": "Invalid or expired token"})
+            if upload["user_id"] != request.user.id:
+                raise ValidationError({"upload_tokens": "Invalid or expired token"})
+            if not storage.exists(upload["name"]):
+                raise ValidationError(
+                    {"upload_tokens": f"{upload['slot']} not uploaded"}
+                )
+            if storage.size(upload["name"]) > settings.PROFILE_IMAGE_UPLOAD_MAX_SIZE:
+                storage.delete(upload["name"])
+                raise ValidationError({"upload_tokens": f"{upload['slot']} too large"})
+            if not _is_uploaded_image(storage, upload["name"], upload["content_type"]):
+                # otherwise variants would never be generated from it
+                storage.delete(upload["name"])
+                raise ValidationError(
+                    {"upload_tokens": f"{upload['slot']} is not a valid image"}
+                )
+            uploads[upload["slot"]] = upload
+
+        # Tokens are claimed only after all of them are valid, and released (with
+        # uploads moved back to pending folder) on failure, so they can be retried
+        claimed = []
+        images = {}
+        try:
+            for upload in uploads.values():
+                # token is single use, otherwise rows would share (and delete) original
+                claim_key = f"profile_image_upload:confirmed:{upload['name']}"
+                if not cache.add(
+                    claim_key, 1, timeout=settings.PROFILE_IMAGE_UPLOAD_URL_EXPIRES * 2
+                ):
+                    raise ValidationError({"upload_tokens": "Already confirmed"})
+                claimed.append(claim_key)
+
+            for slot, upload in uploads.items():
+                extension = PROFILE_IMAGE_UPLOAD_CONTENT_TYPES[upload["content_type"]]
+                images[slot] = move(
+                    storage, upload["name"], upload_to(None, f"upload.{extension}")
+                )
+            with transaction.atomic():
+                _save_profile_images(request.user, images)
+        except Exception:
+            for slot, name in images.items():
+                try:
+                    move(storage, name, uploads[slot]["name"])
+                except Exception as e:
+                    logger.exception(f"Failed to move back upload {name}: {e}")
+            cache.delete_many(claimed)
+            raise
+        qs = UserProfileImage.all_objects.filter(
+            user=request.user, image__in=images.values()
+        )
+        return Response(
+            data=UserProfileImageSerializer(qs, many=True).data,
+            status=status.HTTP_200_OK,
+        )
+
+
 class UsernameUniquenessCheckViewSet(viewsets.ModelViewSet):
     permission_classes = [
         AllowAny,
@@ -295,7 +470,7 @@ class UserInvitationCodeViewSet(viewsets.ViewSet):
         # add point to each
         sent.point_balance = sent.point_balance + BONUS_POINT
         sent.save(update_fields=["point_balance"])
-        onesignal_client.send_notification_to_specific_users(
+        enqueue_push_notification(
             title=f"[{str(received.username)}]님께서 초대를 수락했어요!",
             content=f"보너스 캔디 {BONUS_POINT}개를 얻으셨어요!!😵",
             user_ids=[str(sent.id)],
@@ -303,7 +478,7 @@ class UserInvitationCodeViewSet(viewsets.ViewSet):
 
         received.point_balance = received.point_balance + BONUS_POINT
         received.save(update_fields=["point_balance"])
-        onesignal_client.send_notification_to_specific_users(
+        enqueue_push_notification(
             title=f"[{str(sent.username)}]님의 초대를 수락했어요!",
             content=f"보너스 캔디 {BONUS_POINT}개를 얻으셨어요!!😵",
             user_ids=[str(received.id)],
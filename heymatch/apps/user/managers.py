@@ -4,8 +4,9 @@ import string
 from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
 from django.db.models.query import QuerySet
+from django.utils import timezone
 from ordered_model.models import OrderedModelManager
 
 stream = settings.STREAM_CLIENT
@@ -47,6 +48,23 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault("is_staff", True)
         return self._create_user(phone_number, password, username, **extra_fields)
 
+    def consume_ads_quota(self, user) -> bool:
+        """
+        Use one of daily ads quota. Returns False if quota is exhausted.
+        Counter of previous day is reset here instead of a nightly full-table update.
+        """
+        today = timezone.localdate()
+        qs = self.get_queryset().filter(id=user.id)
+        consumed = qs.exclude(ads_quota_date=today).update(
+            ads_used_today=1, ads_quota_date=today
+        )
+        if not consumed:
+            consumed = qs.filter(
+                ads_quota_date=today, ads_used_today__lt=settings.DAILY_ADS_QUOTA
+            ).update(ads_used_today=F("ads_used_today") + 1)
+        user.refresh_from_db(fields=["ads_used_today", "ads_quota_date"])
+        return bool(consumed)
+
     def __str__(self):
         if self.id:
             return str(self.id)
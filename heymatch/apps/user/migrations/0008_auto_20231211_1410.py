@@ -0,0 +1,17 @@
+# Generated by Django 3.2.13 on 2023-12-11 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0007_auto_20231116_2305'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofileimage',
+            index=models.Index(condition=models.Q(('is_active', False), ('is_main', True), ('status', 'n')), fields=['expected_verification_datetime'], name='upi_pending_verification_idx'),
+        ),
+    ]
@@ -0,0 +1,14 @@
+# Generated by Django 3.2.13 on 2023-12-13 02:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Partial indexes on notified_* flags were planned here. The flags are replaced
+    # by notification.ScheduledNotification in 0010, so they are never built.
+
+    dependencies = [
+        ('user', '0008_auto_20231211_1410'),
+    ]
+
+    operations = []
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.13 on 2023-12-14 01:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0002_auto_20231214_1030'),
+        ('user', '0009_auto_20231213_1130'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='historicaluser',
+            name='notified_to_make_first_group_after_join_10min',
+        ),
+        migrations.RemoveField(
+            model_name='historicaluser',
+            name='notified_to_make_first_group_after_join_1day',
+        ),
+        migrations.RemoveField(
+            model_name='historicaluser',
+            name='notified_to_make_first_group_after_join_1hr',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='notified_to_make_first_group_after_join_10min',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='notified_to_make_first_group_after_join_1day',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='notified_to_make_first_group_after_join_1hr',
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.13 on 2023-12-15 05:20
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+DAILY_ADS_QUOTA = 3
+
+
+def carry_over_todays_usage(apps, schema_editor):
+    User = apps.get_model('user', 'User')
+    User.objects.filter(num_of_available_ads__lt=DAILY_ADS_QUOTA).update(
+        ads_used_today=DAILY_ADS_QUOTA - F('num_of_available_ads'),
+        ads_quota_date=django.utils.timezone.localdate(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0010_auto_20231214_1040'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicaluser',
+            name='ads_quota_date',
+            field=models.DateField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicaluser',
+            name='ads_used_today',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='ads_quota_date',
+            field=models.DateField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='ads_used_today',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(carry_over_todays_usage, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='historicaluser',
+            name='num_of_available_ads',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='num_of_available_ads',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.13 on 2023-12-15 07:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0011_auto_20231215_1420'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletescheduleduser',
+            name='progress',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('GROUPS_DEACTIVATED', 'Groups Deactivated'), ('CHATS_DELETED', 'Chats Deleted')], default='PENDING', max_length=24),
+        ),
+    ]
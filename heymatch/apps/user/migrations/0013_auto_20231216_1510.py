@@ -0,0 +1,54 @@
+# Generated by Django 3.2.13 on 2023-12-16 06:10
+
+from django.db import migrations, models
+import heymatch.apps.user.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0012_auto_20231215_1630'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicaluserprofileimage',
+            name='variants_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='userprofileimage',
+            name='variants_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='historicaluserprofileimage',
+            name='image_blurred',
+            field=models.TextField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='historicaluserprofileimage',
+            name='thumbnail',
+            field=models.TextField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='historicaluserprofileimage',
+            name='thumbnail_blurred',
+            field=models.TextField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='userprofileimage',
+            name='image_blurred',
+            field=models.ImageField(blank=True, upload_to=heymatch.apps.user.models.upload_to),
+        ),
+        migrations.AlterField(
+            model_name='userprofileimage',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to=heymatch.apps.user.models.upload_to),
+        ),
+        migrations.AlterField(
+            model_name='userprofileimage',
+            name='thumbnail_blurred',
+            field=models.ImageField(blank=True, upload_to=heymatch.apps.user.models.upload_to),
+        ),
+    ]
@@ -2,21 +2,27 @@ import os.path
 import random
 import string
 import uuid
-from io import BytesIO
 from uuid import uuid4
 
 from birthday import BirthdayField
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.gis.db import models
-from django.core.files.base import ContentFile
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.utils import timezone
 from ordered_model.models import OrderedModel, OrderedModelManager
 from phonenumber_field.modelfields import PhoneNumberField
-from PIL import Image, ImageFilter, ImageOps
 from simple_history.models import HistoricalRecords
 
+from heymatch.shared.image_variants import (
+    IMAGE_MAX_SIZE,
+    IMAGE_WIDTHS,
+    THUMBNAIL_MAX_SIZE,
+    THUMBNAIL_WIDTHS,
+    ImageVariantsMixin,
+    Variant,
+)
+
 from .managers import (
     ActiveEmailVerificationCodeManager,
     ActiveUserManager,
@@ -149,21 +155,9 @@ class User(AbstractUser):
     # Guideline
     has_finished_guide = models.BooleanField(default=False)
 
-    # Reward Ads
-    num_of_available_ads = models.IntegerField(default=3)
-
-    # Notification Center
-    # [첫번째 그룹 생성 유도 알림]
-    notified_to_make_first_group_after_join_10min = models.BooleanField(
-        default=False
-    )  # 가입 후 그룹 생성 안한 유저에게 생성 유도 알림 (10분)
-    notified_to_make_first_group_after_join_1hr = models.BooleanField(
-        default=False
-    )  # 가입 후 그룹 생성 안한 유저에게 생성 유도 알림 (1시간)
-    notified_to_make_first_group_after_join_1day = models.BooleanField(
-        default=False
-    )  # 가입 후 그룹 생성 안한 유저에게 생성 유도 알림 (하루)
-    # []
+    # Reward Ads (quota is lazily reset on first use of the day)
+    ads_used_today = models.IntegerField(default=0)
+    ads_quota_date = models.DateField(blank=True, null=True, default=None)
 
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["phone_number"]
@@ -171,6 +165,12 @@ class User(AbstractUser):
     objects = UserManager()
     active_objects = ActiveUserManager()
 
+    @property
+    def num_of_available_ads(self) -> int:
+        if self.ads_quota_date != timezone.localdate():
+            return settings.DAILY_ADS_QUOTA
+        return max(settings.DAILY_ADS_QUOTA - self.ads_used_today, 0)
+
 
 def upload_to(instance, filename):
     _, extension = filename.split(".")
@@ -184,11 +184,15 @@ def auto_expected_verification_datetime():
     return timezone.now() + timezone.timedelta(seconds=random.randrange(0, 10))
 
 
-class UserProfileImage(OrderedModel):
-    class StatusChoices(models.TextChoices):
-        NOT_VERIFIED = "n"
-        ACCEPTED = "a"
-        REJECTED = "r"
+class UserProfileImageStatusChoices(models.TextChoices):
+    NOT_VERIFIED = "n"
+    ACCEPTED = "a"
+    REJECTED = "r"
+
+
+class UserProfileImage(ImageVariantsMixin, OrderedModel):
+    # module level, to be visible in Meta
+    StatusChoices = UserProfileImageStatusChoices
 
     user = models.ForeignKey(
         "user.User",
@@ -205,9 +209,13 @@ class UserProfileImage(OrderedModel):
         max_length=1,
     )
     image = models.ImageField(upload_to=upload_to)
-    image_blurred = models.ImageField(upload_to=upload_to)
-    thumbnail = models.ImageField(upload_to=upload_to)
-    thumbnail_blurred = models.ImageField(upload_to=upload_to)
+    image_blurred = models.ImageField(upload_to=upload_to, blank=True)
+    thumbnail = models.ImageField(upload_to=upload_to, blank=True)
+    thumbnail_blurred = models.ImageField(upload_to=upload_to, blank=True)
+    # True until variants above are generated from uploaded original (celery)
+    variants_pending = models.BooleanField(default=False)
+    # WebP/AVIF renditions of variants: {field: {format: {width: name}}}
+    renditions = models.JSONField(default=dict, blank=True)
 
     # History
     created_at = models.DateTimeField(default=timezone.now)
@@ -221,25 +229,55 @@ class UserProfileImage(OrderedModel):
 
     order_with_respect_to = ("user", "is_active", "is_main")
 
+    VARIANTS = [
+        Variant("image", "image_4x3", "4x3", IMAGE_MAX_SIZE, widths=IMAGE_WIDTHS),
+        Variant(
+            "image_blurred",
+            "image_4x3_blurred",
+            "4x3",
+            IMAGE_MAX_SIZE,
+            blur_radius=25,
+            widths=IMAGE_WIDTHS,
+        ),
+        Variant(
+            "thumbnail",
+            "thumbnail_1x1",
+            "1x1",
+            THUMBNAIL_MAX_SIZE,
+            widths=THUMBNAIL_WIDTHS,
+        ),
+        Variant(
+            "thumbnail_blurred",
+            "thumbnail_1x1_blurred",
+            "1x1",
+            THUMBNAIL_MAX_SIZE,
+            blur_radius=25,
+            widths=THUMBNAIL_WIDTHS,
+        ),
+    ]
+
     all_objects = OrderedModelManager()
     objects = ActiveUserProfileManager()
 
+    class Meta(OrderedModel.Meta):
+        indexes = [
+            # pending main images for verification sweeper
+            models.Index(
+                fields=["expected_verification_datetime"],
+                name="upi_pending_verification_idx",
+                condition=models.Q(
+                    is_main=True,
+                    status=UserProfileImageStatusChoices.NOT_VERIFIED,
+                    is_active=False,
+                ),
+            ),
+        ]
+
     def save(self, *args, **kwargs):
-        image = Image.open(self.image).convert("RGB")
-        image = ImageOps.exif_transpose(image)  # fix ios image rotation bug
-        blurred_image = image.filter(ImageFilter.BoxBlur(25))
-
-        # crop
-        image_4x3 = self.crop_by_4x3(image)
-        image_1x1 = self.crop_by_1x1(image)
-        image_blurred_4x3 = self.crop_by_4x3(blurred_image)
-        image_blurred_1x1 = self.crop_by_1x1(blurred_image)
-
-        # process
-        self.process_image(image_4x3)
-        self.process_image_blurred(image_blurred_4x3)
-        self.process_thumbnail(image_1x1)
-        self.process_thumbnail_blurred(image_blurred_1x1)
+        if self.image and not self.image._committed:
+            # New upload. Only the original is stored here,
+            # variants are generated by `generate_*_profile_image_variants` task
+            self.reset_variants()
         super(UserProfileImage, self).save(*args, **kwargs)
 
     def check_file_type(self):
@@ -255,91 +293,6 @@ class UserProfileImage(OrderedModel):
         else:
             return False  # Unrecognized file type
 
-    @staticmethod
-    def crop_by_4x3(image):
-        """
-        We always make sure that height is greater than width
-        """
-        width, height = image.size
-        expected_height = width * (4 / 3)
-        if height > expected_height:
-            offset = int(abs((height - expected_height) / 2))
-            image = image.crop([0, offset, width, height - offset])
-
-        return image
-
-    @staticmethod
-    def crop_by_1x1(image):
-        width, height = image.size
-        if width == height:
-            return image
-        offset = int(abs(height - width) / 2)
-        if width > height:
-            image = image.crop(
-                [offset, 0, width - offset, height]
-            )  # left, upper, right, and lower
-        else:
-            image = image.crop([0, offset, width, height - offset])
-        return image
-
-    def process_image(self, image, filetype: str = "JPEG"):
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.image.save(
-            f"image_4x3.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
-    def process_image_blurred(self, image, filetype: str = "JPEG"):
-        """
-        Blurs image and save
-        :return:
-        """
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.image_blurred.save(
-            f"image_4x3_blurred.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
-    def process_thumbnail(self, image, filetype: str = "JPEG"):
-        """
-        Creates thumbnail and blurred_thumbnail.
-        """
-        image.thumbnail((350, 350), Image.Resampling.LANCZOS)
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.thumbnail.save(
-            f"thumbnail_1x1.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
-    def process_thumbnail_blurred(self, image, filetype: str = "JPEG"):
-        image.thumbnail((350, 350), Image.Resampling.LANCZOS)
-        # Save thumbnail to in-memory file as StringIO
-        temp_image = BytesIO()
-        image.save(temp_image, filetype)
-        temp_image.seek(0)
-        # set save=False, otherwise it will run in an infinite loop
-        self.thumbnail_blurred.save(
-            f"thumbnail_1x1_blurred.{filetype.lower()}",
-            ContentFile(temp_image.read()),
-            save=False,
-        )
-        temp_image.close()
-
 
 def email_verification_code_valid_until():
     return timezone.now() + timezone.timedelta(minutes=5)
@@ -384,6 +337,12 @@ class DeleteScheduledUser(models.Model):
         COMPLETED = "COMPLETED"
         CANCELED = "CANCELED"
 
+    class DeleteProgressChoices(models.TextChoices):
+        # steps done so far while WAITING. Retried deletion resumes from here
+        PENDING = "PENDING"
+        GROUPS_DEACTIVATED = "GROUPS_DEACTIVATED"
+        CHATS_DELETED = "CHATS_DELETED"
+
     user = models.ForeignKey(
         "user.User",
         blank=False,
@@ -400,6 +359,11 @@ class DeleteScheduledUser(models.Model):
         choices=DeleteStatusChoices.choices,
         default=DeleteStatusChoices.WAITING,
     )
+    progress = models.CharField(
+        max_length=24,
+        choices=DeleteProgressChoices.choices,
+        default=DeleteProgressChoices.PENDING,
+    )
 
 
 class UserOnBoarding(models.Model):
@@ -1,6 +1,10 @@
 from admob_ssv.signals import valid_admob_ssv
+from django.db import transaction
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from heymatch.apps.user.models import UserProfileImage
+
 
 @receiver(valid_admob_ssv)
 def reward_user(sender, query, **kwargs):
@@ -8,3 +12,14 @@ def reward_user(sender, query, **kwargs):
     ad_unit = query.get("ad_unit")
     custom_data = query.get("custom_data")
     print(ad_network, ad_unit, custom_data)
+
+
+@receiver(post_save, sender=UserProfileImage)
+def schedule_profile_image_variants(sender, instance, **kwargs):
+    if not instance.variants_pending:
+        return
+    from heymatch.apps.celery.tasks import generate_user_profile_image_variants
+
+    transaction.on_commit(
+        lambda: generate_user_profile_image_variants.delay(instance.id)
+    )
@@ -228,6 +228,15 @@ class UserProfileImageFactory(DjangoModelFactory):
     is_main = True
     is_active = True
 
+    @post_generation
+    def variants(self, create: bool, extracted: Sequence[Any], **kwargs):
+        # celery task is enqueued on commit, which never happens in tests
+        if create:
+            from heymatch.apps.celery.tasks import generate_user_profile_image_variants
+
+            generate_user_profile_image_variants(self.id)
+            self.refresh_from_db()
+
 
 class InactiveUserFactory(ActiveUserFactory):
     is_active = False
@@ -1,7 +1,15 @@
+from io import BytesIO
+
 import pytest
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
 from django.shortcuts import reverse
+from PIL import Image
 from rest_framework.test import APIClient
 
+from heymatch.apps.user.api import views as user_views
+from heymatch.apps.user.models import UserProfileImage
 from heymatch.apps.user.tests.factories import ActiveUserFactory
 
 pytestmark = pytest.mark.django_db
@@ -49,3 +57,143 @@ class TestPhoneVerificationEndpoints:
         #     },
         # )
         # assert res.status_code == 200
+
+
+def _image(fmt="JPEG") -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size=(300, 500), color=(155, 0, 0)).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class TestProfilePhotoUploadEndpoints:
+    PRESIGNED_URL = "https://s3.test/"
+
+    @pytest.fixture
+    def storage(self, tmpdir, mocker):
+        # local stand-in of S3 bucket
+        storage = FileSystemStorage(location=tmpdir.strpath)
+        for variant in UserProfileImage.VARIANTS:
+            field = UserProfileImage._meta.get_field(variant.field)
+            mocker.patch.object(field, "storage", storage)
+
+        def presigned_post(storage, name, content_type, **kwargs):
+            return {
+                "url": self.PRESIGNED_URL,
+                "fields": {"key": name, "Content-Type": content_type},
+            }
+
+        mocker.patch(
+            "heymatch.apps.user.api.views.presigned_post",
+            side_effect=presigned_post,
+        )
+        return storage
+
+    @pytest.fixture
+    def user(self):
+        return ActiveUserFactory()
+
+    @pytest.fixture
+    def user_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def _upload(
+        self, client, storage, slot="other_profile_image_1", content=None
+    ) -> dict:
+        res = client.post(
+            reverse("api:user:user-my-profile-photo-upload-intent"),
+            data={"slots": [slot]},
+            format="json",
+        )
+        assert res.status_code == 200
+        upload = res.data["uploads"][0]
+        assert upload["url"] == self.PRESIGNED_URL
+        assert upload["fields"]["Content-Type"] == "image/jpeg"
+        # client POSTs to presigned url
+        storage.save(upload["fields"]["key"], ContentFile(content or _image()))
+        return upload
+
+    def _confirm(self, client, upload_token: str):
+        return client.post(
+            reverse("api:user:user-my-profile-photo-upload-confirm"),
+            data={"upload_tokens": [upload_token]},
+            format="json",
+        )
+
+    def test_upload_and_confirm(
+        self, user, user_client, storage, mocker, django_capture_on_commit_callbacks
+    ):
+        delay = mocker.patch(
+            "heymatch.apps.celery.tasks.generate_user_profile_image_variants.delay"
+        )
+        upload = self._upload(user_client, storage)
+        with django_capture_on_commit_callbacks(execute=True):
+            res = self._confirm(user_client, upload["upload_token"])
+
+        assert res.status_code == 200
+        assert res.data[0]["variants_pending"] is True
+        upi = UserProfileImage.objects.get(user=user)
+        # moved out of pending folder
+        assert upi.image.name.startswith(
+            f"{settings.AWS_S3_USER_PROFILE_PHOTO_FOLDER}/"
+        )
+        assert storage.exists(upi.image.name)
+        assert not storage.exists(upload["fields"]["key"])
+        assert upi.variants_pending is True
+        delay.assert_called_once_with(upi.id)
+        # token is single use
+        assert self._confirm(user_client, upload["upload_token"]).status_code == 400
+
+    def test_confirm_not_uploaded(self, user_client, storage):
+        res = user_client.post(
+            reverse("api:user:user-my-profile-photo-upload-intent"),
+            data={"slots": ["other_profile_image_1"]},
+            format="json",
+        )
+        upload_token = res.data["uploads"][0]["upload_token"]
+        assert self._confirm(user_client, upload_token).status_code == 400
+        assert not UserProfileImage.objects.exists()
+
+    def test_failed_confirm_can_be_retried(self, user, user_client, storage, mocker):
+        upload = self._upload(user_client, storage)
+        save_profile_images = user_views._save_profile_images
+        calls = []
+
+        def fail_once(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("DB is down")
+            return save_profile_images(*args)
+
+        mocker.patch.object(user_views, "_save_profile_images", side_effect=fail_once)
+        with pytest.raises(RuntimeError):
+            self._confirm(user_client, upload["upload_token"])
+        # moved back to pending folder, token is not consumed
+        assert storage.exists(upload["fields"]["key"])
+        assert storage.listdir(settings.AWS_S3_USER_PROFILE_PHOTO_FOLDER)[1] == []
+
+        assert self._confirm(user_client, upload["upload_token"]).status_code == 200
+        assert UserProfileImage.objects.filter(user=user).count() == 1
+
+    def test_confirm_token_of_other_user(self, user_client, storage):
+        upload = self._upload(user_client, storage)
+        other_client = APIClient()
+        other_client.force_authenticate(user=ActiveUserFactory())
+        res = self._confirm(other_client, upload["upload_token"])
+        assert res.status_code == 400
+        assert self._confirm(user_client, "forged").status_code == 400
+
+    @pytest.mark.parametrize(
+        "content",
+        [b"not an image", _image("PNG")],  # token is for image/jpeg
+        ids=["not_image", "format_mismatch"],
+    )
+    def test_confirm_invalid_image(self, user_client, storage, content):
+        upload = self._upload(user_client, storage, content=content)
+
+        res = self._confirm(user_client, upload["upload_token"])
+
+        assert res.status_code == 400
+        assert not UserProfileImage.objects.exists()
+        assert not storage.exists(upload["fields"]["key"])
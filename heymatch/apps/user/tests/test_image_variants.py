@@ -0,0 +1,113 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from PIL import Image, ImageStat
+
+from heymatch.apps.group.models import GroupProfileImage
+from heymatch.apps.user.models import UserProfileImage
+from heymatch.shared.image_variants import decode, render_variants, srcset
+from heymatch.shared.uploads import save_all
+
+EXIF_ORIENTATION = 0x0112
+
+
+def _jpeg(size, orientation=None) -> BytesIO:
+    image = Image.new("RGB", size=size, color=(155, 0, 0))
+    # stripes, so that blur is visible
+    for x in range(0, size[0], 20):
+        image.paste((0, 0, 255), (x, 0, x + 10, size[1]))
+    exif = Image.Exif()
+    if orientation:
+        exif[EXIF_ORIENTATION] = orientation
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif)
+    buffer.seek(0)
+    return buffer
+
+
+def _open(content) -> Image.Image:
+    return Image.open(BytesIO(content.read()))
+
+
+class TestImageVariants:
+    def test_draft_decode(self):
+        image, scale = decode(_jpeg((2400, 3200)), UserProfileImage.VARIANTS)
+        assert image.size == (1200, 1600)
+        assert scale == 0.5
+
+    def test_render_variants(self):
+        files = render_variants(_jpeg((2400, 3300)), UserProfileImage.VARIANTS).files
+        assert files["image"].name == "image_4x3.jpeg"
+        sizes = {field: _open(content).size for field, content in files.items()}
+        assert sizes == {
+            "image": (1080, 1440),
+            "image_blurred": (360, 480),
+            "thumbnail": (350, 350),
+            "thumbnail_blurred": (350, 350),
+        }
+
+    def test_blurred(self):
+        files = render_variants(_jpeg((600, 800)), GroupProfileImage.VARIANTS).files
+        for field in ["image", "thumbnail"]:
+            original = ImageStat.Stat(_open(files[field])).stddev[2]
+            blurred = ImageStat.Stat(_open(files[f"{field}_blurred"])).stddev[2]
+            assert blurred < original / 2
+
+    def test_exif_rotation(self):
+        # landscape pixels, rotated to portrait by exif
+        files = render_variants(
+            _jpeg((400, 300), orientation=6), GroupProfileImage.VARIANTS
+        ).files
+        assert _open(files["image"]).size == (300, 400)
+
+    def test_renditions(self):
+        rendered = render_variants(
+            _jpeg((2400, 3300)), UserProfileImage.VARIANTS, formats=["webp"]
+        )
+        webp = rendered.renditions["image"]["webp"]
+        assert list(webp) == ["360", "720", "1080"]
+        assert webp["720"].name == "image_4x3_720w.webp"
+        assert _open(webp["720"]).size == (720, 960)
+        # blurred renditions are capped at the (blur working) variant width
+        assert list(rendered.renditions["image_blurred"]["webp"]) == ["360"]
+        assert list(rendered.renditions["thumbnail"]["webp"]) == ["175", "350"]
+        # JPEG fallbacks are rendered as before
+        assert rendered.files["image"].name == "image_4x3.jpeg"
+
+    def test_srcset(self):
+        class Storage:
+            def url(self, name):
+                return f"https://cdn/{name}"
+
+        names = {"webp": {"360": "a_360w.webp", "720": "a_720w.webp"}}
+        assert srcset(Storage(), names) == {
+            "webp": {"360": "https://cdn/a_360w.webp", "720": "https://cdn/a_720w.webp"}
+        }
+        assert srcset(Storage(), None) == {}
+
+
+class TestSaveAll:
+    @pytest.fixture
+    def storage(self, tmpdir):
+        class Storage(FileSystemStorage):
+            def _save(self, name, content):
+                if name.startswith("fail"):
+                    raise OSError("upload failed")
+                return super()._save(name, content)
+
+        return Storage(location=tmpdir.strpath)
+
+    def test_save_all(self, storage):
+        files = {i: (f"{i}.txt", ContentFile(b"x")) for i in range(10)}
+        saved = save_all(storage, files)
+        assert saved == {i: f"{i}.txt" for i in range(10)}
+        assert all(storage.exists(name) for name in saved.values())
+
+    def test_partial_uploads_are_deleted(self, storage):
+        files = {i: (f"{i}.txt", ContentFile(b"x")) for i in range(10)}
+        files["fail"] = ("fail.txt", ContentFile(b"x"))
+        with pytest.raises(OSError):
+            save_all(storage, files)
+        assert storage.listdir("")[1] == []
@@ -1,7 +1,9 @@
+from datetime import timedelta
 from statistics import mean
 from typing import Sequence
 
 import pytest
+from django.utils import timezone
 
 from heymatch.apps.group.models import Group
 from heymatch.apps.group.tests.factories import ActiveGroupFactory
@@ -39,3 +41,25 @@ def test_active_user_manager_methods(active_users: Sequence[User]):
     assert manager.count_group_members_avg_age(group=group) == int(
         mean([user.age for user in active_users])
     )
+
+
+class TestUserAdsQuota:
+    def test_consume_until_exhausted(self, active_user: User, settings):
+        assert active_user.num_of_available_ads == settings.DAILY_ADS_QUOTA
+        for remaining in reversed(range(settings.DAILY_ADS_QUOTA)):
+            assert User.objects.consume_ads_quota(active_user) is True
+            assert active_user.num_of_available_ads == remaining
+        assert User.objects.consume_ads_quota(active_user) is False
+        assert active_user.num_of_available_ads == 0
+
+    def test_reset_on_new_day(self, active_user: User, settings):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        User.objects.filter(id=active_user.id).update(
+            ads_used_today=settings.DAILY_ADS_QUOTA, ads_quota_date=yesterday
+        )
+        active_user.refresh_from_db()
+        assert active_user.num_of_available_ads == settings.DAILY_ADS_QUOTA
+
+        assert User.objects.consume_ads_quota(active_user) is True
+        assert active_user.ads_quota_date == timezone.localdate()
+        assert active_user.num_of_available_ads == settings.DAILY_ADS_QUOTA - 1
@@ -1,4 +1,35 @@
+from datetime import timedelta
+from io import BytesIO
+
 import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from PIL import Image
+
+from heymatch.apps.celery import tasks
+from heymatch.apps.celery.tasks import (
+    generate_user_profile_image_variants,
+    schedule_main_profile_image_verification,
+    verify_main_profile_image,
+    verify_main_profile_images,
+)
+from heymatch.apps.group import exclusions
+from heymatch.apps.group.models import GroupAddressHourlyCount
+from heymatch.apps.group.tests.factories import GroupMemberFactory, GroupV2Factory
+from heymatch.apps.match.models import MatchRequest
+from heymatch.apps.notification.models import PushNotification, ScheduledNotification
+from heymatch.apps.user.api.serializers import UserProfileImageSerializer
+from heymatch.apps.user.models import (
+    DeleteScheduledUser,
+    UserOnBoarding,
+    UserProfileImage,
+)
+from heymatch.apps.user.tests.factories import (
+    ActiveUserFactory,
+    UserProfileImageFactory,
+)
+from heymatch.utils.util import StubFaceDetector
 
 pytestmark = pytest.mark.django_db
 
@@ -11,3 +42,364 @@ def test_user_count(settings):
     # assert isinstance(task_result, EagerResult)
     # assert task_result.result == 3
     pass
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+class TestVerifyMainProfileImages:
+    @staticmethod
+    def _create_pending_main_image(user):
+        return UserProfileImageFactory(
+            user=user,
+            status=UserProfileImage.StatusChoices.NOT_VERIFIED,
+            is_active=False,
+            expected_verification_datetime=timezone.now() - timedelta(minutes=5),
+        )
+
+    def test_accepted(self):
+        users = ActiveUserFactory.create_batch(3)
+        pending = []
+        for user in users:
+            UserOnBoarding.objects.create(
+                user=user, profile_photo_under_verification=True
+            )
+            UserProfileImageFactory(user=user)  # previous main image
+            pending.append(self._create_pending_main_image(user))
+
+        verify_main_profile_images()
+
+        for user, upi in zip(users, pending):
+            main_images = UserProfileImage.all_objects.filter(user=user, is_main=True)
+            assert list(main_images.values_list("id", flat=True)) == [upi.id]
+            upi.refresh_from_db()
+            assert upi.status == UserProfileImage.StatusChoices.ACCEPTED
+            assert upi.is_active is True
+            uob = UserOnBoarding.objects.get(user=user)
+            assert uob.onboarding_completed is True
+            assert uob.profile_photo_under_verification is False
+        assert PushNotification.objects.count() == 3
+        # [첫 그룹 생성 유도 알림] x 3
+        assert ScheduledNotification.objects.filter(
+            subject__in=[str(user.id) for user in users]
+        ).count() == 3 * len(users)
+
+    def test_newest_accepted_per_user(self):
+        user = ActiveUserFactory()
+        UserOnBoarding.objects.create(user=user, profile_photo_under_verification=True)
+        older = self._create_pending_main_image(user)
+        newer = self._create_pending_main_image(user)
+
+        verify_main_profile_images()
+
+        main_images = UserProfileImage.all_objects.filter(user=user, is_main=True)
+        assert list(main_images.values_list("id", flat=True)) == [newer.id]
+        assert not UserProfileImage.all_objects.filter(id=older.id).exists()
+        assert PushNotification.objects.count() == 1
+
+    def test_rejected_when_enforced(self, settings, mocker):
+        settings.PROFILE_IMAGE_FACE_DETECTION_ENFORCED = True
+        mocker.patch.object(StubFaceDetector, "detect_faces", return_value=[])
+        user = ActiveUserFactory()
+        UserOnBoarding.objects.create(user=user, profile_photo_under_verification=True)
+        upi = self._create_pending_main_image(user)
+
+        verify_main_profile_images()
+
+        assert not UserProfileImage.all_objects.filter(id=upi.id).exists()
+        uob = UserOnBoarding.objects.get(user=user)
+        assert uob.profile_photo_rejected is True
+        assert uob.profile_photo_rejected_reason == "얼굴이 나온 사진을 업로드 해주세요!"
+
+    def test_detection_failure_is_retried_later(self, mocker):
+        mocker.patch.object(
+            StubFaceDetector, "detect_faces", side_effect=RuntimeError("timeout")
+        )
+        user = ActiveUserFactory()
+        UserOnBoarding.objects.create(user=user, profile_photo_under_verification=True)
+        upi = self._create_pending_main_image(user)
+
+        verify_main_profile_images()
+
+        upi.refresh_from_db()
+        assert upi.status == UserProfileImage.StatusChoices.NOT_VERIFIED
+
+    def test_sweeper_skips_images_within_grace_period(self):
+        user = ActiveUserFactory()
+        UserOnBoarding.objects.create(user=user, profile_photo_under_verification=True)
+        upi = UserProfileImageFactory(
+            user=user,
+            status=UserProfileImage.StatusChoices.NOT_VERIFIED,
+            is_active=False,
+            expected_verification_datetime=timezone.now(),
+        )
+
+        verify_main_profile_images()
+
+        upi.refresh_from_db()
+        assert upi.status == UserProfileImage.StatusChoices.NOT_VERIFIED
+
+
+class TestVerifyMainProfileImage:
+    def test_schedule_is_deduplicated(self, mocker):
+        apply_async = mocker.patch(
+            "heymatch.apps.celery.tasks.verify_main_profile_image.apply_async"
+        )
+        upi = UserProfileImageFactory(
+            status=UserProfileImage.StatusChoices.NOT_VERIFIED, is_active=False
+        )
+
+        schedule_main_profile_image_verification(upi)
+        schedule_main_profile_image_verification(upi)
+
+        apply_async.assert_called_once_with(
+            args=(upi.id,), eta=upi.expected_verification_datetime
+        )
+
+    def test_idempotent(self):
+        user = ActiveUserFactory()
+        UserOnBoarding.objects.create(user=user, profile_photo_under_verification=True)
+        upi = UserProfileImageFactory(
+            user=user,
+            status=UserProfileImage.StatusChoices.NOT_VERIFIED,
+            is_active=False,
+        )
+
+        verify_main_profile_image(upi.id)
+        verify_main_profile_image(upi.id)
+        verify_main_profile_images()
+
+        upi.refresh_from_db()
+        assert upi.status == UserProfileImage.StatusChoices.ACCEPTED
+        assert PushNotification.objects.count() == 1
+
+
+def _uploaded_image(size=(300, 500)) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", size=size, color=(155, 0, 0)).save(buffer, "JPEG")
+    return SimpleUploadedFile("upload.jpg", buffer.getvalue(), "image/jpeg")
+
+
+class TestGenerateProfileImageVariants:
+    def test_upload_stores_original_only(
+        self, mocker, django_capture_on_commit_callbacks
+    ):
+        delay = mocker.patch(
+            "heymatch.apps.celery.tasks.generate_user_profile_image_variants.delay"
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            upi = UserProfileImage.objects.create(
+                user=ActiveUserFactory(), image=_uploaded_image()
+            )
+
+        delay.assert_called_once_with(upi.id)
+        upi.refresh_from_db()
+        assert upi.variants_pending is True
+        assert not upi.image_blurred and not upi.thumbnail
+        data = UserProfileImageSerializer(upi).data
+        assert data["variants_pending"] is True
+        assert data["thumbnail"] is None
+
+    def test_generate(self):
+        upi = UserProfileImage.objects.create(
+            user=ActiveUserFactory(), image=_uploaded_image()
+        )
+        original = upi.image.name
+
+        generate_user_profile_image_variants(upi.id)
+
+        upi.refresh_from_db()
+        assert upi.variants_pending is False
+        assert upi.image.name != original
+        assert (upi.image.width, upi.image.height) == (300, 400)  # 4x3
+        assert (upi.thumbnail.width, upi.thumbnail.height) == (300, 300)
+        assert upi.image_blurred and upi.thumbnail_blurred
+        # idempotent
+        generate_user_profile_image_variants(upi.id)
+        assert UserProfileImage.objects.get(id=upi.id).image.name == upi.image.name
+
+    def test_original_of_not_verified_image_is_deleted_later(
+        self, settings, mocker, django_capture_on_commit_callbacks
+    ):
+        apply_async = mocker.patch.object(
+            tasks.delete_profile_image_original, "apply_async"
+        )
+        upi = UserProfileImage.objects.create(
+            user=ActiveUserFactory(),
+            image=_uploaded_image(),
+            status=UserProfileImage.StatusChoices.NOT_VERIFIED,
+        )
+        original = upi.image.name
+        delete = mocker.spy(upi.image.storage, "delete")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            generate_user_profile_image_variants(upi.id)
+
+        # verification may still be detecting faces on the original
+        delete.assert_not_called()
+        apply_async.assert_called_once_with(
+            args=(original,),
+            countdown=settings.PROFILE_IMAGE_VERIFICATION_LOCK_TIMEOUT,
+        )
+
+    def test_original_of_accepted_image_is_deleted_on_commit(
+        self, mocker, django_capture_on_commit_callbacks
+    ):
+        upi = UserProfileImage.objects.create(
+            user=ActiveUserFactory(),
+            image=_uploaded_image(),
+            status=UserProfileImage.StatusChoices.ACCEPTED,
+        )
+        original = upi.image.name
+        delete = mocker.spy(upi.image.storage, "delete")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            generate_user_profile_image_variants(upi.id)
+
+        delete.assert_called_once_with(original)
+
+    def test_generate_renditions(self, settings):
+        settings.PROFILE_IMAGE_RENDITION_FORMATS = ["webp"]
+        upi = UserProfileImage.objects.create(
+            user=ActiveUserFactory(), image=_uploaded_image()
+        )
+
+        generate_user_profile_image_variants(upi.id)
+
+        upi.refresh_from_db()
+        # ladder never upscales: 300px wide 4x3 image has single rendition
+        assert list(upi.renditions["image"]["webp"]) == ["300"]
+        assert list(upi.renditions["thumbnail"]["webp"]) == ["175", "300"]
+        data = UserProfileImageSerializer(upi).data
+        assert data["thumbnail_srcset"]["webp"]["175"].endswith(".webp")
+        assert data["image_srcset"]["webp"]["300"] == upi.image.storage.url(
+            upi.renditions["image"]["webp"]["300"]
+        )
+
+    def test_replaced_meanwhile_is_discarded(self, mocker):
+        upi = UserProfileImage.objects.create(
+            user=ActiveUserFactory(), image=_uploaded_image()
+        )
+        generate_variants = UserProfileImage.generate_variants
+
+        def replace_original_then_generate(obj):
+            UserProfileImage.objects.filter(id=obj.id).update(image="replaced.jpg")
+            generate_variants(obj)
+
+        mocker.patch.object(
+            UserProfileImage,
+            "generate_variants",
+            autospec=True,
+            side_effect=replace_original_then_generate,
+        )
+        generate_user_profile_image_variants(upi.id)
+
+        upi.refresh_from_db()
+        assert upi.image.name == "replaced.jpg"
+        assert upi.variants_pending is True
+        assert not upi.thumbnail
+
+
+class TestDeleteScheduledUsers:
+    @pytest.fixture
+    def stream(self, mocker):
+        stream = mocker.patch.object(tasks, "stream")
+        stream.query_channels.return_value = {
+            "channels": [{"channel": {"cid": f"messaging:{i}"}} for i in range(5)]
+        }
+        return stream
+
+    def test_coordinator_and_subtask(self, stream, settings, mocker):
+        settings.STREAM_DELETE_CHANNELS_BATCH_SIZE = 2
+        delay = mocker.patch.object(tasks.delete_scheduled_user, "delay")
+        gm = GroupMemberFactory()
+        mr = MatchRequest.objects.create(
+            sender_group=gm.group, receiver_group=GroupV2Factory()
+        )
+        dsu = DeleteScheduledUser.objects.create(
+            user=gm.user, delete_schedule_at=timezone.now() - timedelta(minutes=1)
+        )
+        not_due = DeleteScheduledUser.objects.create(user=ActiveUserFactory())
+
+        tasks.delete_scheduled_users()
+        delay.assert_called_once_with(dsu.id)
+        dsu.refresh_from_db()
+        assert (
+            dsu.progress == DeleteScheduledUser.DeleteProgressChoices.GROUPS_DEACTIVATED
+        )
+        gm.refresh_from_db()
+        gm.group.refresh_from_db()
+        mr.refresh_from_db()
+        assert not gm.is_active and not gm.group.is_active and not mr.is_active
+
+        tasks.delete_scheduled_user(dsu.id)
+        assert stream.delete_channels.call_count == 3  # 5 cids / 2
+        dsu.refresh_from_db()
+        assert dsu.status == DeleteScheduledUser.DeleteStatusChoices.COMPLETED
+        dsu.user.refresh_from_db()
+        assert dsu.user.is_deleted is True
+        not_due.refresh_from_db()
+        assert not_due.progress == DeleteScheduledUser.DeleteProgressChoices.PENDING
+
+    def test_deactivated_groups_leave_counts_and_exclusions(
+        self, mocker, django_capture_on_commit_callbacks
+    ):
+        mocker.patch.object(tasks.delete_scheduled_user, "delay")
+        gm = GroupMemberFactory(group__gps_address="서울특별시 강남구 신사동")
+        GroupV2Factory(gps_address="서울특별시 강남구 신사동")
+        DeleteScheduledUser.objects.create(
+            user=gm.user, delete_schedule_at=timezone.now() - timedelta(minutes=1)
+        )
+        assert GroupAddressHourlyCount.objects.top_addresses() == {"서울특별시 강남구 신사동": 2}
+        assert exclusions.get_excluded_group_ids(gm.user) == {gm.group_id}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            tasks.delete_scheduled_users()
+
+        assert GroupAddressHourlyCount.objects.top_addresses() == {"서울특별시 강남구 신사동": 1}
+        assert exclusions.get_excluded_group_ids(gm.user) == set()
+
+    def test_all_channel_pages_are_deleted(self, stream, settings):
+        settings.STREAM_QUERY_CHANNELS_PAGE_SIZE = 2
+        stream.query_channels.side_effect = lambda offset, **kwargs: {
+            "channels": [
+                {"channel": {"cid": f"messaging:{i}"}}
+                for i in range(offset, min(offset + 2, 5))
+            ]
+        }
+        dsu = DeleteScheduledUser.objects.create(
+            user=ActiveUserFactory(),
+            delete_schedule_at=timezone.now() - timedelta(minutes=1),
+            progress=DeleteScheduledUser.DeleteProgressChoices.GROUPS_DEACTIVATED,
+        )
+
+        tasks.delete_scheduled_user(dsu.id)
+
+        assert stream.query_channels.call_count == 3
+        stream.delete_channels.assert_called_once_with(
+            cids=[f"messaging:{i}" for i in range(5)]
+        )
+
+    def test_retry_resumes_after_chats_deleted(self, stream):
+        dsu = DeleteScheduledUser.objects.create(
+            user=ActiveUserFactory(),
+            delete_schedule_at=timezone.now() - timedelta(minutes=1),
+            progress=DeleteScheduledUser.DeleteProgressChoices.CHATS_DELETED,
+        )
+        tasks.delete_scheduled_user(dsu.id)
+        stream.query_channels.assert_not_called()
+        dsu.refresh_from_db()
+        assert dsu.status == DeleteScheduledUser.DeleteStatusChoices.COMPLETED
+
+    def test_canceled_is_skipped(self, stream):
+        dsu = DeleteScheduledUser.objects.create(
+            user=ActiveUserFactory(),
+            status=DeleteScheduledUser.DeleteStatusChoices.CANCELED,
+            progress=DeleteScheduledUser.DeleteProgressChoices.GROUPS_DEACTIVATED,
+        )
+        tasks.delete_scheduled_user(dsu.id)
+        stream.query_channels.assert_not_called()
+        dsu.user.refresh_from_db()
+        assert dsu.user.is_deleted is False
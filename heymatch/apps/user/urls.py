@@ -5,6 +5,7 @@ from .api.views import (
     UserInvitationCodeViewSet,
     UsernameUniquenessCheckViewSet,
     UserOnboardingViewSet,
+    UserProfilePhotoUploadViewSet,
     UsersAdmobSSVViewSet,
     UserWithGroupFullInfoViewSet,
     UserWithGroupProfilePhotoViewSet,
@@ -24,6 +25,12 @@ users_my_profile_photo_view = UserWithGroupProfilePhotoViewSet.as_view(
         "delete": "delete_profile_photo",
     }
 )
+users_my_profile_photo_upload_intent_view = UserProfilePhotoUploadViewSet.as_view(
+    {"post": "upload_intent"}
+)
+users_my_profile_photo_upload_confirm_view = UserProfilePhotoUploadViewSet.as_view(
+    {"post": "upload_confirm"}
+)
 users_my_onboarding_view = UserOnboardingViewSet.as_view({"get": "retrieve"})
 users_my_onboarding_in_progress_extra_info_view = UserOnboardingViewSet.as_view(
     {"post": "in_progress_extra_info"}
@@ -43,6 +50,16 @@ urlpatterns = [
         users_my_profile_photo_view,
         name="user-my-profile-photo-delete",
     ),
+    path(
+        "my/profile/photo/upload/",
+        users_my_profile_photo_upload_intent_view,
+        name="user-my-profile-photo-upload-intent",
+    ),
+    path(
+        "my/profile/photo/upload/confirm/",
+        users_my_profile_photo_upload_confirm_view,
+        name="user-my-profile-photo-upload-confirm",
+    ),
     path(
         "my/onboarding/",
         users_my_onboarding_view,
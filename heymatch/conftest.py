@@ -1,11 +1,18 @@
+import json
+import os
+from pathlib import Path
 from random import randint
 from typing import Sequence
 
 import pytest
 from rest_framework.test import APIClient
 
-from heymatch.apps.group.models import Group
-from heymatch.apps.group.tests.factories import ActiveGroupFactory, InactiveGroupFactory
+from heymatch.apps.group.models import Group, GroupV2
+from heymatch.apps.group.tests.factories import (
+    ActiveGroupFactory,
+    GroupMemberFactory,
+    InactiveGroupFactory,
+)
 from heymatch.apps.hotplace.models import HotPlace
 from heymatch.apps.hotplace.tests.factories import (
     RANDOM_HOTPLACE_INFO,
@@ -16,10 +23,13 @@ from heymatch.apps.match.models import MatchRequest
 from heymatch.apps.match.tests.factories import MatchRequestFactory
 from heymatch.apps.user.models import User
 from heymatch.apps.user.tests.factories import (
+    ActiveEmployeeMaleUserFactory,
     ActiveUserFactory,
     AdminUserFactory,
     InactiveUserFactory,
+    UserProfileImageFactory,
 )
+from heymatch.shared.middleware import QueryStats
 from heymatch.utils.util import generate_rand_geoopt_within_boundary
 
 
@@ -202,6 +212,62 @@ def api_client() -> APIClient:
     return APIClient()
 
 
+@pytest.fixture
+def create_male_groups():
+    """Groups of one male member with profile images, as listed in the group feed"""
+
+    def create(num: int) -> Sequence[GroupV2]:
+        groups = []
+        for _ in range(num):
+            user = ActiveEmployeeMaleUserFactory.create()
+            UserProfileImageFactory.create_batch(3, user=user)
+            groups.append(GroupMemberFactory.create(user=user).group)
+        return groups
+
+    return create
+
+
+@pytest.fixture
+def query_stats() -> QueryStats:
+    return QueryStats()
+
+
+QUERY_BUDGET_MARGIN = 1
+
+
+@pytest.fixture
+def query_budget(request):
+    """
+    Check recorded QueryStats against `<test dir>/query_budgets/<name>.json`.
+
+        with query_stats:
+            api_client.get(...)
+        query_budget("group_feed_list", query_stats)
+
+    Budget file keys: max_queries, max_db_time_ms (optional)
+    QUERY_BUDGETS_UPDATE=1 rewrites max_queries to measured count + QUERY_BUDGET_MARGIN
+    """
+    budget_dir = Path(request.node.fspath).parent / "query_budgets"
+
+    def check(name: str, stats: QueryStats):
+        path = budget_dir / f"{name}.json"
+        budget = json.loads(path.read_text())
+        if os.environ.get("QUERY_BUDGETS_UPDATE"):
+            budget["max_queries"] = stats.count + QUERY_BUDGET_MARGIN
+            path.write_text(json.dumps(budget, indent=2, ensure_ascii=False) + "\n")
+        report = json.dumps(stats.as_dict(budget=name), indent=2, ensure_ascii=False)
+        assert (
+            stats.count <= budget["max_queries"]
+        ), f"Query budget exceeded: {stats.count} > {budget['max_queries']}\n{report}"
+        max_db_time_ms = budget.get("max_db_time_ms")
+        if max_db_time_ms is not None:
+            assert (
+                stats.total_ms <= max_db_time_ms
+            ), f"DB time budget exceeded: {stats.total_ms:.2f}ms > {max_db_time_ms}ms\n{report}"
+
+    return check
+
+
 # ========================
 #  DEPRECATED
 # ========================
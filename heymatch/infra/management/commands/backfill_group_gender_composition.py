@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from heymatch.apps.group.models import GroupMember, GroupV2
+from heymatch.apps.user.models import User
+
+
+class Command(BaseCommand):
+    help = "Backfill GroupV2.gender_composition from active group members"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=1000,
+            help="Number of groups to update per UPDATE statement",
+        )
+        parser.add_argument(
+            "--only_missing",
+            action="store_true",
+            help="Only fill groups whose gender_composition is empty",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        groups = GroupV2.objects.all()
+        if options["only_missing"]:
+            groups = groups.filter(gender_composition__isnull=True)
+
+        # One aggregation over all active members instead of per-group queries
+        counts = (
+            GroupMember.objects.filter(is_active=True, group_id__in=groups.values("id"))
+            .values("group_id")
+            .annotate(
+                males=Count("id", filter=Q(user__gender=User.GenderChoices.MALE)),
+                females=Count("id", filter=Q(user__gender=User.GenderChoices.FEMALE)),
+            )
+        )
+
+        buckets = {choice: [] for choice in GroupV2.GenderCompositionChoices.values}
+        for row in counts.iterator():
+            if row["males"] == 0 and row["females"] == 0:
+                continue
+            if row["females"] == 0:
+                buckets[GroupV2.GenderCompositionChoices.MALE_ONLY].append(
+                    row["group_id"]
+                )
+            elif row["males"] == 0:
+                buckets[GroupV2.GenderCompositionChoices.FEMALE_ONLY].append(
+                    row["group_id"]
+                )
+            else:
+                buckets[GroupV2.GenderCompositionChoices.MIXED].append(row["group_id"])
+
+        total = 0
+        for composition, group_ids in buckets.items():
+            for offset in range(0, len(group_ids), batch_size):
+                end = offset + batch_size
+                batch = group_ids[offset:end]
+                total += GroupV2.objects.filter(id__in=batch).update(
+                    gender_composition=composition
+                )
+            self.stdout.write(f"{composition}: {len(group_ids)}")
+
+        # Groups without any active member have no composition
+        cleared = (
+            groups.exclude(gender_composition__isnull=True)
+            .exclude(group_member_group__is_active=True)
+            .update(gender_composition=None)
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully backfilled gender composition! (updated: {total}, cleared: {cleared})"
+            )
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Cast, Floor
+
+from heymatch.apps.group.models import GroupMember, GroupV2
+
+
+class Command(BaseCommand):
+    help = "Backfill GroupV2.member_avg_height from active group members"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only_missing",
+            action="store_true",
+            help="Only fill groups whose member_avg_height is empty",
+        )
+
+    def handle(self, *args, **options):
+        groups = GroupV2.objects.all()
+        if options["only_missing"]:
+            groups = groups.filter(member_avg_height__isnull=True)
+
+        # Single UPDATE .. SET = (subquery). Floor keeps int(mean()) semantic.
+        avg_height = (
+            GroupMember.objects.filter(group_id=OuterRef("id"), is_active=True)
+            .values("group_id")
+            .annotate(avg_height=Avg("user__height_cm"))
+            .values("avg_height")[:1]
+        )
+        updated = groups.update(
+            member_avg_height=Cast(Floor(Subquery(avg_height)), IntegerField())
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully backfilled member avg height! (updated: {updated})"
+            )
+        )
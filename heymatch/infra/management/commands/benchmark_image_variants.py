@@ -0,0 +1,145 @@
+import multiprocessing
+import resource
+import time
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageFilter, ImageOps
+
+from heymatch.apps.group.models import GroupProfileImage
+from heymatch.apps.user.models import UserProfileImage
+from heymatch.shared import image_variants
+from heymatch.shared.image_variants import crop_by_1x1, crop_by_4x3
+
+DEFAULT_PATH = Path(settings.APPS_DIR) / "data" / "profile"
+
+
+def _encode(image: Image.Image) -> int:
+    buffer = BytesIO()
+    image.save(buffer, "JPEG")
+    return buffer.tell()
+
+
+def legacy_user_profile_image(fp) -> int:
+    """UserProfileImage.save before image_variants"""
+    image = Image.open(fp).convert("RGB")
+    image = ImageOps.exif_transpose(image)
+    blurred_image = image.filter(ImageFilter.BoxBlur(25))
+    image_1x1 = crop_by_1x1(image)
+    image_blurred_1x1 = crop_by_1x1(blurred_image)
+    image_1x1.thumbnail((350, 350), Image.Resampling.LANCZOS)
+    image_blurred_1x1.thumbnail((350, 350), Image.Resampling.LANCZOS)
+    return (
+        _encode(crop_by_4x3(image))
+        + _encode(crop_by_4x3(blurred_image))
+        + _encode(image_1x1)
+        + _encode(image_blurred_1x1)
+    )
+
+
+def legacy_group_profile_image(fp) -> int:
+    """GroupProfileImage.save before image_variants"""
+    image = ImageOps.exif_transpose(Image.open(fp)).convert("RGB")
+    image_4x3 = crop_by_4x3(image)
+    image_1x1 = crop_by_1x1(image)
+    image_1x1.thumbnail((350, 350), Image.Resampling.LANCZOS)
+    return (
+        _encode(image_4x3)
+        + _encode(image_4x3.filter(ImageFilter.BoxBlur(10)))
+        + _encode(image_1x1)
+        + _encode(image_1x1.filter(ImageFilter.BoxBlur(5)))
+    )
+
+
+def _variants_of(model):
+    def render(fp) -> int:
+        files = image_variants.render_variants(fp, model.VARIANTS).files
+        return sum(content.size for content in files.values())
+
+    return render
+
+
+PIPELINES = {
+    "user/legacy": legacy_user_profile_image,
+    "user/image_variants": _variants_of(UserProfileImage),
+    "group/legacy": legacy_group_profile_image,
+    "group/image_variants": _variants_of(GroupProfileImage),
+}
+
+
+def _load_samples(paths: list, width: int or None) -> list:
+    """JPEG bytes of sample images, optionally scaled to `width` (e.g. phone photos)"""
+    samples = []
+    for path in paths:
+        with open(path, "rb") as fp:
+            data = fp.read()
+        if width:
+            image = Image.open(BytesIO(data)).convert("RGB")
+            height = round(image.height * width / image.width)
+            buffer = BytesIO()
+            image.resize((width, height), Image.Resampling.BICUBIC).save(
+                buffer, "JPEG", quality=90
+            )
+            data = buffer.getvalue()
+        samples.append(data)
+    return samples
+
+
+def _run(name: str, samples: list, repeat: int, queue) -> None:
+    # runs in a forked process, so that peak RSS belongs to the pipeline only
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started_at = time.process_time()
+    num_bytes = 0
+    for _ in range(repeat):
+        for data in samples:
+            num_bytes += PIPELINES[name](BytesIO(data))
+    cpu_ms = (time.process_time() - started_at) * 1000
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb
+    queue.put((cpu_ms, peak_kb, num_bytes))
+
+
+class Command(BaseCommand):
+    help = "Compare CPU time & peak memory of profile image variant pipelines"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            type=str,
+            default=str(DEFAULT_PATH),
+            help="Directory of sample images (default: heymatch/data/profile)",
+        )
+        parser.add_argument(
+            "--width",
+            type=int,
+            default=None,
+            help="Scale samples to this width first (e.g. 3024 for 12MP photos)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Process every image N times (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        paths = sorted(Path(options["path"]).glob("*.jp*g"))
+        samples = _load_samples(paths, options["width"])
+        repeat = options["repeat"]
+        context = multiprocessing.get_context("fork")
+        self.stdout.write(f"{len(samples)} images x {repeat}")
+        for name in PIPELINES:
+            queue = context.Queue()
+            process = context.Process(target=_run, args=(name, samples, repeat, queue))
+            process.start()
+            cpu_ms, peak_kb, num_bytes = queue.get()
+            process.join()
+            num_images = max(len(samples) * repeat, 1)
+            self.stdout.write(
+                f"{name}: "
+                f"cpu_ms/image={cpu_ms / num_images:.1f} "
+                f"peak_rss_mb={peak_kb / 1024:.1f} "
+                f"output_kb/image={num_bytes / 1024 / num_images:.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS("Successfully benchmarked!"))
@@ -0,0 +1,76 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from heymatch.apps.celery.models import TaskRunHourlyStat
+from heymatch.apps.celery.telemetry import beat_intervals, running_count
+
+
+class Command(BaseCommand):
+    help = "Show celery task telemetry (heymatch.apps.celery.telemetry) of recent hours"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=24,
+            help="Aggregate stats of recent N hours (default: 24)",
+        )
+        parser.add_argument(
+            "--prune_days",
+            type=int,
+            default=None,
+            help="Delete stats older than N days",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        if options["prune_days"] is not None:
+            deleted = TaskRunHourlyStat.objects.prune(
+                before=now - datetime.timedelta(days=options["prune_days"])
+            )
+            self.stdout.write(f"Pruned {deleted} hourly stats")
+
+        since = TaskRunHourlyStat.objects.bucket_of(
+            now - datetime.timedelta(hours=options["hours"])
+        )
+        stats = (
+            TaskRunHourlyStat.objects.filter(bucket__gte=since)
+            .values("task_name")
+            .annotate(
+                total_runs=Sum("runs"),
+                total_failures=Sum("failures"),
+                total_soft_time_limit_hits=Sum("soft_time_limit_hits"),
+                total_overlaps=Sum("overlaps"),
+                sum_ms=Sum("total_ms"),
+                peak_ms=Max("max_ms"),
+                total_queries=Sum("query_count"),
+                total_rows=Sum("rows"),
+                peak_lag_ms=Max("max_lag_ms"),
+            )
+            .order_by(F("sum_ms").desc())
+        )
+        intervals = beat_intervals()
+
+        self.stdout.write(f"Celery task stats since {timezone.localtime(since)}")
+        for stat in stats:
+            name = stat["task_name"]
+            runs = stat["total_runs"] or 1
+            interval = intervals.get(name)
+            self.stdout.write(
+                f"{name.rsplit('.', 1)[-1]}: "
+                f"runs={stat['total_runs']} "
+                f"failures={stat['total_failures']} "
+                f"avg_ms={stat['sum_ms'] // runs} "
+                f"max_ms={stat['peak_ms']} "
+                f"{f'interval_ms={int(interval * 1000)} ' if interval else ''}"
+                f"avg_queries={stat['total_queries'] // runs} "
+                f"rows={stat['total_rows']} "
+                f"max_lag_ms={stat['peak_lag_ms']} "
+                f"soft_time_limit_hits={stat['total_soft_time_limit_hits']} "
+                f"overlaps={stat['total_overlaps']} "
+                f"running={running_count(name)}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(stats)} tasks"))
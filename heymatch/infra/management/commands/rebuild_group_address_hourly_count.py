@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from heymatch.apps.group.models import GroupAddressHourlyCount, GroupV2
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild GroupAddressHourlyCount buckets of recent 24 hours from active groups"
+    )
+
+    def handle(self, *args, **options):
+        GroupAddressHourlyCount.objects.rebuild(GroupV2.objects.filter(is_active=True))
+        GroupAddressHourlyCount.objects.prune()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Successfully rebuilt group address hourly count! "
+                f"(top: {GroupAddressHourlyCount.objects.top_addresses()})"
+            )
+        )
@@ -2,6 +2,9 @@ from io import StringIO
 
 from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from heymatch.apps.celery.models import TaskRunHourlyStat
 
 
 class CustomCommandsTest(TestCase):
@@ -10,3 +13,24 @@ class CustomCommandsTest(TestCase):
         call_command("datasetup", "--migrate_all", stdout=out)
         output = out.getvalue()
         self.assertIn("Successfully set up all mocking data!", output)
+
+    def test_celery_task_stats_command_output(self):
+        name = "heymatch.apps.celery.tasks.verify_main_profile_images"
+        for duration_ms in [100, 300]:
+            TaskRunHourlyStat.objects.record(
+                task_name=name,
+                started_at=timezone.now(),
+                duration_ms=duration_ms,
+                query_count=4,
+                rows=2,
+                lag_ms=50,
+                overlapped=duration_ms > 200,
+            )
+        out = StringIO()
+        call_command("celery_task_stats", "--hours=1", stdout=out)
+        output = out.getvalue()
+        self.assertIn(
+            "verify_main_profile_images: runs=2 failures=0 avg_ms=200 max_ms=300",
+            output,
+        )
+        self.assertIn("rows=4 max_lag_ms=50 soft_time_limit_hits=0 overlaps=1", output)
@@ -1,6 +1,9 @@
+from collections import deque
 from typing import List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class OneSignalClient:
@@ -8,14 +11,44 @@ class OneSignalClient:
     Refer:
      - API: https://documentation.onesignal.com/reference/create-notification
      - Push Notification message: https://documentation.onesignal.com/reference/push-channel-properties
+
+    Do not call this from request/response path.
+    Use `heymatch.apps.notification.outbox.enqueue_push_notification` instead.
     """
 
     endpoint = "https://onesignal.com/api/v1/notifications"
+    # Max number of `include_external_user_ids` per API call
+    max_external_user_ids = 2000
+    timeout = (3, 10)  # (connect, read) seconds
 
     def __init__(self, app_id: str, rest_api_key: str, is_local: bool = False):
         self.app_id = app_id
         self.rest_api_key = rest_api_key
         self.is_local = is_local
+        self.local_sent = deque(maxlen=100)  # recent payloads "sent" when is_local
+        self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        # keep-alive + retry with backoff. POST is safe to retry with idempotency key
+        if self._session is None:
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"],
+                respect_retry_after_header=True,
+            )
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(max_retries=retry))
+            self._session.headers.update(
+                {
+                    "accept": "application/json",
+                    "Authorization": f"Basic {self.rest_api_key}",
+                    "content-type": "application/json",
+                }
+            )
+        return self._session
 
     def send_notification_to_specific_users(
         self,
@@ -23,15 +56,8 @@ class OneSignalClient:
         content: str,
         user_ids: List[str],
         data: dict or None = None,
+        idempotency_key: str or None = None,
     ) -> dict:
-        if self.is_local:
-            return self.local_response()
-
-        headers = {
-            "accept": "application/json",
-            "Authorization": f"Basic {self.rest_api_key}",
-            "content-type": "application/json",
-        }
         payload = {
             "title": {"en": title, "ko": title},
             "contents": {"en": content, "ko": content},  # en: is required
@@ -42,7 +68,14 @@ class OneSignalClient:
             "ios_badgeType": "Increase",
             "ios_badgeCount": 1,
         }
-        res = requests.post(self.endpoint, json=payload, headers=headers)
+        if idempotency_key:
+            payload["external_id"] = idempotency_key
+        if self.is_local:
+            self.local_sent.append(payload)
+            return self.local_response()
+
+        res = self.session.post(self.endpoint, json=payload, timeout=self.timeout)
+        res.raise_for_status()
         return res.json()
 
     @staticmethod
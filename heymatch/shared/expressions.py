@@ -0,0 +1,25 @@
+from django.contrib.gis.db.models import PointField
+from django.db.models import F, FloatField, Func, Value
+
+
+class KNNDistance(Func):
+    """
+    PostGIS `<->` (KNN) distance operator between a geography column and a point.
+
+    `ORDER BY gps_point <-> point LIMIT n` is answered by walking the GiST index,
+    while `ORDER BY ST_Distance(..)` has to compute distance of every row and sort.
+    For geography columns the result is in meters.
+    """
+
+    arg_joiner = " <-> "
+    template = "(%(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, field_name: str, point, srid: int = 4326, **extra):
+        if point.srid is None:
+            point.srid = srid
+        super().__init__(
+            F(field_name),
+            Value(point, output_field=PointField(geography=True, srid=srid)),
+            **extra,
+        )
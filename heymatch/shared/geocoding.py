@@ -0,0 +1,138 @@
+"""
+Reverse geocoding (coordinate -> 행정동 address) with caching.
+
+    coordinate -> grid cell -> in-process LRU -> django cache(Redis) -> backend(Naver)
+
+Groups are mostly created around a handful of neighborhoods,
+so most requests are answered without calling Naver.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP, Decimal
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# GroupV2.gps_address placeholder until it is resolved by `resolve_group_gps_address` task
+GPS_ADDRESS_PENDING = ""
+# GroupV2.gps_address which could not be resolved (no result from backend, or gave up)
+GPS_ADDRESS_UNRESOLVED = "unresolved"
+# Not an address, never counted in GroupAddressHourlyCount
+GPS_ADDRESS_PLACEHOLDERS = (GPS_ADDRESS_PENDING, GPS_ADDRESS_UNRESOLVED)
+
+
+class FakeGeoAPI:
+    """
+    Local/test backend. Never calls Naver.
+    """
+
+    default_address = "서울특별시 강남구 신사동"
+
+    def reverse_geocode(self, long: str, lat: str) -> str:
+        return self.default_address
+
+
+class LRUCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_cache = LRUCache(maxsize=settings.GEOCODING_LOCAL_CACHE_SIZE)
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.GEOCODING_BACKEND)()
+    return _backend
+
+
+def snap_to_grid(long, lat) -> (str, str):
+    """
+    Snap coordinate to a grid cell of GEOCODING_GRID_PRECISION decimal places.
+    (3 => ~100m, small enough compared to 행정동 boundaries)
+    """
+    exp = Decimal(1).scaleb(-settings.GEOCODING_GRID_PRECISION)
+    return (
+        str(Decimal(str(long)).quantize(exp, rounding=ROUND_HALF_UP)),
+        str(Decimal(str(lat)).quantize(exp, rounding=ROUND_HALF_UP)),
+    )
+
+
+def _cache_key(cell) -> str:
+    return f"geocoding:admcode:{cell[0]},{cell[1]}"
+
+
+def get_cached_address(long, lat) -> str or None:
+    """Address from local/shared cache only. Backend is never called."""
+    cell = snap_to_grid(long, lat)
+    address = _local_cache.get(cell)
+    if address is None:
+        address = cache.get(_cache_key(cell))
+        if address is not None:
+            _local_cache.set(cell, address)
+    return address
+
+
+def reverse_geocode(long, lat) -> str:
+    """Cached address, or call backend. Backend errors are raised."""
+    address = get_cached_address(long, lat)
+    if address is not None:
+        return address
+
+    cell = snap_to_grid(long, lat)
+    address = get_backend().reverse_geocode(long=cell[0], lat=cell[1])
+    cache.set(_cache_key(cell), address, timeout=settings.GEOCODING_CACHE_TIMEOUT)
+    _local_cache.set(cell, address)
+    return address
+
+
+def resolve_gps_address(long, lat) -> str:
+    """
+    For request/response path.
+    Returns GPS_ADDRESS_PENDING instead of waiting for(or failing with) Naver when
+        - not cached and GEOCODING_DEFERRED is on
+        - backend fails
+    """
+    address = get_cached_address(long, lat)
+    if address is not None:
+        return address
+    if settings.GEOCODING_DEFERRED:
+        return GPS_ADDRESS_PENDING
+    try:
+        return reverse_geocode(long, lat)
+    except (requests.RequestException, LookupError, ValueError) as e:
+        logger.warning(f"Reverse geocoding failed, deferred: ({long}, {lat}) {e}")
+        return GPS_ADDRESS_PENDING
+
+
+def clear_local_cache():
+    global _backend
+    _local_cache.clear()
+    _backend = None
@@ -0,0 +1,296 @@
+"""
+Profile image variants (UserProfileImage, GroupProfileImage), rendered from one decode.
+
+    original -> draft decode (JPEG DCT scaling, near the largest variant size)
+             -> exif transpose -> 4x3 / 1x1 crops -> variants
+
+Blurred variants are rendered at most BLUR_WORKING_WIDTH wide, with the blur radius
+scaled down with them. Box blur of equal visual strength costs a fraction of the
+full resolution one, and a blurred image looks the same when the client scales it up.
+
+Each variant (JPEG, kept as fallback) also gets renditions in modern formats (WebP,
+optionally AVIF) at a ladder of widths, exposed to clients as a srcset-style map
+    {"webp": {"360": url, "720": url, "1080": url}}
+"""
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageFilter, ImageOps
+
+from heymatch.shared.uploads import save_all
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MAX_SIZE = (1080, 1440)  # 4x3
+THUMBNAIL_MAX_SIZE = (350, 350)  # 1x1
+IMAGE_WIDTHS = (360, 720, 1080)  # renditions
+THUMBNAIL_WIDTHS = (175, 350)
+BLUR_WORKING_WIDTH = 360
+JPEG_QUALITY = 75  # PIL default
+# format: Image.save options
+RENDITION_OPTIONS = {
+    "webp": {"quality": 75, "method": 4},
+    "avif": {"quality": 60, "speed": 8},
+}
+
+
+@dataclass(frozen=True)
+class Variant:
+    field: str  # model ImageField
+    name: str  # file name without extension
+    aspect: str  # "4x3" or "1x1"
+    max_size: tuple  # (width, height), never upscaled
+    blur_radius: float = 0  # BoxBlur radius in pixels of the original
+    blur_on_output: bool = False  # blur_radius is in pixels of the variant instead
+    widths: tuple = ()  # rendition ladder, capped at the variant width
+
+
+@dataclass
+class RenderedVariants:
+    files: dict = field(default_factory=dict)  # {field: ContentFile(JPEG)}
+    renditions: dict = field(default_factory=dict)  # {field: {format: {width: file}}}
+
+
+def crop_by_4x3(image: Image.Image) -> Image.Image:
+    """
+    We always make sure that height is greater than width
+    """
+    width, height = image.size
+    expected_height = width * (4 / 3)
+    if height > expected_height:
+        offset = int(abs((height - expected_height) / 2))
+        image = image.crop([0, offset, width, height - offset])
+    return image
+
+
+def crop_by_1x1(image: Image.Image) -> Image.Image:
+    width, height = image.size
+    if width == height:
+        return image
+    offset = int(abs(height - width) / 2)
+    if width > height:
+        return image.crop([offset, 0, width - offset, height])
+    return image.crop([0, offset, width, height - offset])
+
+
+CROPS = {"4x3": crop_by_4x3, "1x1": crop_by_1x1}
+
+
+def decode(fp, variants: list) -> tuple:
+    """
+    (RGB image, scale of decoded image to original).
+    Crops are never taller than 4x3, so variants are limited by their width and
+    the shorter side of `max_size` is enough. Draft request is square, so it holds
+    for either orientation (exif rotation is applied after decoding).
+    """
+    image = Image.open(fp)
+    original_width = image.width
+    side = max(min(variant.max_size) for variant in variants)
+    image.draft("RGB", (side, side))  # no-op for non JPEG
+    scale = image.width / original_width
+    image = ImageOps.exif_transpose(image)  # fix ios image rotation bug
+    return image.convert("RGB"), scale
+
+
+def _fitted_size(size: tuple, max_size: tuple) -> tuple:
+    factor = min(max_size[0] / size[0], max_size[1] / size[1], 1)
+    return max(round(size[0] * factor), 1), max(round(size[1] * factor), 1)
+
+
+class _Renderer:
+    """Crops and resized crops are shared between variants"""
+
+    def __init__(self, image: Image.Image, scale: float):
+        self.image = image
+        self.scale = scale
+        self._crops = {}
+        self._resized = {}
+
+    def crop(self, aspect: str) -> Image.Image:
+        if aspect not in self._crops:
+            self._crops[aspect] = CROPS[aspect](self.image)
+        return self._crops[aspect]
+
+    def resized(
+        self, aspect: str, size: tuple, resample, reducing_gap: float
+    ) -> Image.Image:
+        crop = self.crop(aspect)
+        if crop.size == size:
+            return crop
+        key = (aspect, size, resample)
+        if key not in self._resized:
+            self._resized[key] = crop.resize(size, resample, reducing_gap=reducing_gap)
+        return self._resized[key]
+
+    def render(self, variant: Variant) -> Image.Image:
+        crop = self.crop(variant.aspect)
+        size = _fitted_size(crop.size, variant.max_size)
+        if not variant.blur_radius:
+            return self.resized(variant.aspect, size, Image.Resampling.LANCZOS, 2.0)
+
+        # radius in pixels of `crop`
+        if variant.blur_on_output:
+            radius = variant.blur_radius * crop.width / size[0]
+        else:
+            radius = variant.blur_radius * self.scale
+        # Cheapest downscale (integer reduce + BOX), quality is lost to blur anyway
+        working = self.resized(
+            variant.aspect,
+            _fitted_size(crop.size, (min(BLUR_WORKING_WIDTH, size[0]), size[1])),
+            Image.Resampling.BOX,
+            1.0,
+        )
+        return working.filter(ImageFilter.BoxBlur(radius * working.width / crop.width))
+
+
+def encode(image: Image.Image, fmt: str = "jpeg") -> bytes:
+    buffer = BytesIO()
+    if fmt == "jpeg":
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY)
+    else:
+        image.save(buffer, fmt.upper(), **RENDITION_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def available_formats(formats: tuple) -> tuple:
+    """Rendition formats which can be encoded by installed Pillow (and plugins)"""
+    if "avif" in formats:
+        try:
+            import pillow_avif  # noqa F401 (registers AVIF plugin)
+        except ImportError:
+            pass
+    Image.init()
+    available = tuple(fmt for fmt in formats if fmt.upper() in Image.SAVE)
+    if len(available) < len(formats):
+        logger.warning(
+            f"Unsupported rendition formats are skipped: "
+            f"{sorted(set(formats) - set(available))}"
+        )
+    return available
+
+
+def _ladder(image: Image.Image, widths: tuple) -> dict:
+    """{width: image} of the ladder, downscaled from rendered variant"""
+    ladder = {image.width: image}
+    for width in widths:
+        if width < image.width:
+            height = max(round(image.height * width / image.width), 1)
+            ladder[width] = image.resize(
+                (width, height), Image.Resampling.LANCZOS, reducing_gap=2.0
+            )
+    return ladder
+
+
+def render_variants(fp, variants: list, formats: list = ()) -> RenderedVariants:
+    """Every variant and its renditions in `formats`, from one decode"""
+    renderer = _Renderer(*decode(fp, variants))
+    formats = available_formats(tuple(formats))
+    rendered = RenderedVariants()
+    for variant in variants:
+        image = renderer.render(variant)
+        rendered.files[variant.field] = ContentFile(
+            encode(image), name=f"{variant.name}.jpeg"
+        )
+        if not formats or not variant.widths:
+            continue
+        ladder = _ladder(image, variant.widths)
+        rendered.renditions[variant.field] = {
+            fmt: {
+                str(width): ContentFile(
+                    encode(resized, fmt), name=f"{variant.name}_{width}w.{fmt}"
+                )
+                for width, resized in sorted(ladder.items())
+            }
+            for fmt in formats
+        }
+    return rendered
+
+
+def srcset(storage, renditions: dict) -> dict:
+    """{format: {width: url}} of renditions of a variant ({format: {width: name}})"""
+    return {
+        fmt: {width: storage.url(name) for width, name in names.items()}
+        for fmt, names in (renditions or {}).items()
+    }
+
+
+def save_rendered(instance, rendered: RenderedVariants) -> None:
+    """
+    Upload variants and renditions of `instance` concurrently (not saved to DB).
+    Fields and `renditions` are assigned only after every upload succeeded.
+    """
+    files = {}
+    for field_name, content in rendered.files.items():
+        model_field = instance._meta.get_field(field_name)
+        files[(field_name,)] = (
+            model_field.generate_filename(instance, content.name),
+            content,
+        )
+    for field_name, by_format in rendered.renditions.items():
+        model_field = instance._meta.get_field(field_name)
+        for fmt, by_width in by_format.items():
+            for width, content in by_width.items():
+                files[(field_name, fmt, width)] = (
+                    model_field.generate_filename(instance, content.name),
+                    content,
+                )
+
+    # every variant field shares storage of original
+    saved = save_all(instance._meta.get_field("image").storage, files)
+
+    renditions = {}
+    for key, name in saved.items():
+        if len(key) == 1:
+            setattr(instance, key[0], name)
+        else:
+            field_name, fmt, width = key
+            renditions.setdefault(field_name, {}).setdefault(fmt, {})[width] = name
+    instance.renditions = renditions
+
+
+class ImageVariantsMixin:
+    """
+    Variants of a profile image model with `image`, variant ImageFields listed in
+    `VARIANTS`, `variants_pending` and `renditions` fields
+    """
+
+    VARIANTS = []
+
+    def reset_variants(self):
+        """
+        Mark variants to be generated from current original. Called by `save` for
+        new uploads, or explicitly when `image` is set to a file already in storage
+        (uploaded directly with presigned url)
+        """
+        for variant in self.VARIANTS:
+            if variant.field != "image":
+                setattr(self, variant.field, "")
+        self.renditions = {}
+        self.variants_pending = True
+
+    def generate_variants(self):
+        """
+        Render variants of original and upload them (not saved to DB)
+        """
+        rendered = render_variants(
+            self.image, self.VARIANTS, settings.PROFILE_IMAGE_RENDITION_FORMATS
+        )
+        save_rendered(self, rendered)
+
+    def rendition_names(self) -> list:
+        return [
+            name
+            for by_format in self.renditions.values()
+            for by_width in by_format.values()
+            for name in by_width.values()
+        ]
+
+    def srcset(self, field: str) -> dict:
+        """{format: {width: url}} of renditions of `field`"""
+        storage = self._meta.get_field(field).storage
+        return srcset(storage, self.renditions.get(field))
@@ -0,0 +1,110 @@
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Records SQL statements executed on the default database while active.
+    Works without DEBUG=True since it hooks `connection.execute_wrapper`.
+
+        with QueryStats() as stats:
+            ...
+        stats.count, stats.total_ms, stats.slowest()
+    """
+
+    SQL_MAX_LENGTH = 500
+
+    def __init__(self):
+        self.statements = []  # [(sql, duration_ms), ...]
+        self._wrapper = None
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            self.statements.append((sql, duration_ms))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(duration_ms for _, duration_ms in self.statements)
+
+    def slowest(self, num: int = 3) -> list:
+        statements = sorted(self.statements, key=lambda s: s[1], reverse=True)
+        return [
+            {"sql": sql[: self.SQL_MAX_LENGTH], "ms": round(duration_ms, 2)}
+            for sql, duration_ms in statements[:num]
+        ]
+
+    def as_dict(self, **extra) -> dict:
+        return {
+            **extra,
+            "query_count": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "slowest": self.slowest(),
+        }
+
+
+class QueryStatsMiddleware:
+    """
+    Query count / DB time per request.
+        - QUERY_STATS_RESPONSE_HEADERS: add X-Query-Count, X-Query-Time-Ms (non-production)
+        - QUERY_STATS_LOGGING: structured(JSON) log when request exceeds
+          QUERY_STATS_LOG_MIN_QUERIES or QUERY_STATS_LOG_MIN_DB_TIME_MS (production)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.response_headers = getattr(settings, "QUERY_STATS_RESPONSE_HEADERS", False)
+        self.logging = getattr(settings, "QUERY_STATS_LOGGING", False)
+        self.log_min_queries = getattr(settings, "QUERY_STATS_LOG_MIN_QUERIES", 0)
+        self.log_min_db_time_ms = getattr(settings, "QUERY_STATS_LOG_MIN_DB_TIME_MS", 0)
+
+    def __call__(self, request):
+        if not self.response_headers and not self.logging:
+            return self.get_response(request)
+
+        with QueryStats() as stats:
+            response = self.get_response(request)
+
+        if self.response_headers:
+            response["X-Query-Count"] = str(stats.count)
+            response["X-Query-Time-Ms"] = f"{stats.total_ms:.2f}"
+        if self.logging and (
+            stats.count >= self.log_min_queries
+            or stats.total_ms >= self.log_min_db_time_ms
+        ):
+            route = getattr(request.resolver_match, "route", None)
+            logger.info(
+                json.dumps(
+                    stats.as_dict(
+                        event="query_stats",
+                        method=request.method,
+                        path=request.path,
+                        route=route,
+                        status=response.status_code,
+                    ),
+                    ensure_ascii=False,
+                )
+            )
+        return response
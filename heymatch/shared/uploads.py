@@ -0,0 +1,116 @@
+"""
+Concurrent uploads of many small files that belong to one write
+(e.g. profile image variants and their renditions), and presigned POSTs for
+clients to upload directly to storage.
+
+S3Boto3Storage caches its bucket on the storage instance, so the threads share
+one boto3 client (thread safe) and its connection pool. STORAGE_UPLOAD_WORKERS is
+kept below botocore `max_pool_connections` (10) to never wait for a connection.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # threads do not survive fork (celery prefork workers), one pool per process
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.STORAGE_UPLOAD_WORKERS,
+                thread_name_prefix="storage-upload",
+            )
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def save_all(storage, files: dict) -> dict:
+    """
+    Save {key: (name, content)} concurrently, returns {key: saved name}.
+    All or nothing: if any upload fails, the uploaded ones are deleted and
+    the first error is raised.
+    """
+    if not files:
+        return {}
+    getattr(storage, "bucket", None)  # create shared client once, before fan out
+    executor = _get_executor()
+    futures = {
+        key: executor.submit(storage.save, name, content)
+        for key, (name, content) in files.items()
+    }
+    saved, error = {}, None
+    for key, future in futures.items():
+        try:
+            saved[key] = future.result()
+        except Exception as e:
+            error = error or e
+    if error is None:
+        return saved
+
+    for name in saved.values():
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.exception(f"Failed to delete partial upload {name}: {e}")
+    raise error
+
+
+def _s3_key(storage, name: str) -> str:
+    from storages.utils import clean_name
+
+    return storage._normalize_name(clean_name(name))
+
+
+def presigned_post(
+    storage, name: str, content_type: str, max_size: int, expires_in: int
+) -> dict:
+    """
+    {"url", "fields"} to upload `name` directly to S3 storage with a multipart
+    form POST: `fields` first, then the file as "file". S3 rejects other
+    Content-Type or a file larger than `max_size` bytes.
+    """
+    if not hasattr(storage, "bucket"):
+        raise ImproperlyConfigured(f"{type(storage).__name__} can not presign urls")
+    return storage.bucket.meta.client.generate_presigned_post(
+        Bucket=storage.bucket_name,
+        Key=_s3_key(storage, name),
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_size],
+        ],
+        ExpiresIn=expires_in,
+    )
+
+
+def read_head(storage, name: str, size: int) -> bytes:
+    """First `size` bytes of `name`, without downloading the whole object from S3"""
+    if hasattr(storage, "bucket"):
+        obj = storage.bucket.Object(_s3_key(storage, name))
+        return obj.get(Range=f"bytes=0-{size - 1}")["Body"].read()
+    with storage.open(name) as f:
+        return f.read(size)
+
+
+def move(storage, name: str, new_name: str) -> str:
+    """Move `name` to `new_name` (server side copy on S3), returns saved name"""
+    if hasattr(storage, "bucket"):
+        storage.bucket.Object(_s3_key(storage, new_name)).copy_from(
+            CopySource={"Bucket": storage.bucket_name, "Key": _s3_key(storage, name)}
+        )
+    else:
+        with storage.open(name) as f:
+            new_name = storage.save(new_name, f)
+    storage.delete(name)
+    return new_name
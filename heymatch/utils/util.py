@@ -1,7 +1,9 @@
 import csv
 import decimal
 import json
+import posixpath
 import random
+import time
 import urllib
 from datetime import datetime
 from random import randint, uniform
@@ -12,16 +14,17 @@ import cv2
 import numpy as np
 import pandas as pd
 import requests
+from botocore.config import Config as BotoConfig
 from django.conf import settings
 from django.contrib.gis.geos import Point as GisPoint
+from django.utils.module_loading import import_string
 from django_google_maps.fields import GeoPt
 from factory import random as f_random
 from factory.fuzzy import BaseFuzzyAttribute
 from psycopg2._range import Range
+from requests.adapters import HTTPAdapter
 from shapely.geometry import Point, Polygon
 
-client = boto3.client("rekognition")
-
 
 class FuzzyPointGangnam(BaseFuzzyAttribute):
     """
@@ -175,12 +178,66 @@ def detect_face_with_haar_cascade_ml(s3_url: str) -> int:
     return len(faces)
 
 
-def detect_faces_with_aws_rekognition(s3_image_url: str):
-    image = url_to_image_bytes(s3_image_url)
-    res = client.detect_faces(Image={"Bytes": image})
+class RekognitionFaceDetector:
+    """
+    Rekognition DetectFaces reading the object directly from S3 (`S3Object`),
+    so image bytes never go through the public URL.
+    boto3 clients are thread-safe. Connection pool is sized for concurrent callers.
+    """
+
+    def __init__(self, bucket: str or None = None, max_pool_connections: int = 10):
+        self.bucket = bucket or settings.AWS_STORAGE_BUCKET_NAME
+        self.client = boto3.client(
+            "rekognition",
+            region_name=settings.AWS_S3_REGION_NAME,
+            config=BotoConfig(max_pool_connections=max_pool_connections),
+        )
+
+    def detect_faces(self, s3_key: str) -> list:
+        res = self.client.detect_faces(
+            Image={"S3Object": {"Bucket": self.bucket, "Name": s3_key}}
+        )
+        return res["FaceDetails"]
+
+
+class StubFaceDetector:
+    """
+    Offline backend for tests/load tests. Every image has exactly one good face.
+    """
+
+    face_detail = {"Confidence": 99.9, "BoundingBox": {"Width": 0.3}}
+
+    def __init__(self, latency_seconds: float = 0, **kwargs):
+        self.latency_seconds = latency_seconds
+
+    def detect_faces(self, s3_key: str) -> list:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return [self.face_detail]
+
+
+_face_detector = None
+
+
+def get_face_detector():
+    global _face_detector
+    if _face_detector is None:
+        _face_detector = import_string(settings.FACE_DETECTION_BACKEND)(
+            max_pool_connections=settings.PROFILE_IMAGE_VERIFICATION_MAX_WORKERS
+        )
+    return _face_detector
+
+
+def get_s3_key(field_file) -> str:
+    """Object key of django-storages FieldFile (`location` prefix included)"""
+    location = getattr(field_file.storage, "location", "")
+    return posixpath.join(location, field_file.name) if location else field_file.name
+
+
+def evaluate_face_details(face_details: list) -> (bool, str or None):
     good_results = []
     small_size_results = []
-    for face in res["FaceDetails"]:
+    for face in face_details:
         if face["Confidence"] < 99:
             continue
         if face["BoundingBox"]["Width"] < 0.05:
@@ -201,6 +258,15 @@ def detect_faces_with_aws_rekognition(s3_image_url: str):
         return False, "단체 사진은 올릴 수 없어요!"
 
 
+def detect_faces_with_aws_rekognition(s3_key: str, backend=None):
+    """
+    :param s3_key: object key in AWS_STORAGE_BUCKET_NAME (see `get_s3_key`)
+    :param backend: RekognitionFaceDetector / StubFaceDetector. FACE_DETECTION_BACKEND by default
+    """
+    backend = backend or get_face_detector()
+    return evaluate_face_details(backend.detect_faces(s3_key))
+
+
 def load_company_domain_file():
     f = open(f"{settings.APPS_DIR}/data/domains/company.json")
     return json.load(f)
@@ -254,24 +320,35 @@ def load_school_domain_json():
 
 
 class NaverGeoAPI:
+    endpoint = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
+
     def __init__(self):
         # NCP 콘솔에서 복사한 클라이언트ID와 클라이언트Secret 값
         self._client_id = settings.NAVER_CLIENT_ID
         self._client_secret = settings.NAVER_CLIENT_SECRET
+        self._timeout = settings.NAVER_GEO_API_TIMEOUT
+        # keep-alive connection pool
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=10)
+        )
+        self._session.headers.update(
+            {
+                "X-NCP-APIGW-API-KEY-ID": self._client_id,
+                "X-NCP-APIGW-API-KEY": self._client_secret,
+            }
+        )
 
     def reverse_geocode(self, long: str, lat: str):
         # 좌표 (경도, 위도)
-        output = "json"
-        orders = "admcode"  # 행정동
-        endpoint = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
-        url = f"{endpoint}?coords={long},{lat}&output={output}&orders={orders}"
-        # 헤더
-        headers = {
-            "X-NCP-APIGW-API-KEY-ID": self._client_id,
-            "X-NCP-APIGW-API-KEY": self._client_secret,
+        params = {
+            "coords": f"{long},{lat}",
+            "output": "json",
+            "orders": "admcode",  # 행정동
         }
         # 요청
-        res = requests.get(url, headers=headers)
+        res = self._session.get(self.endpoint, params=params, timeout=self._timeout)
+        res.raise_for_status()
         res_json = res.json()
         info = res_json["results"][0]["region"]
         return (